@@ -6,6 +6,7 @@ Production Flask Application
 from flask import Flask
 from flask_cors import CORS
 import os
+from gateway_metrics import instrument_flask_app
 
 def create_app(config=None):
     """Application factory pattern"""
@@ -18,6 +19,9 @@ def create_app(config=None):
     # Enable CORS
     CORS(app)
     
+    # Request timing and /metrics endpoint
+    instrument_flask_app(app)
+    
     # Register blueprints
     from app.main import main_bp
     from app.api import api_bp
@@ -49,11 +49,11 @@ def list_agents():
     status = agent_system.get_system_status()
     return jsonify({
         'agents': [{
-            'id': agent.id,
-            'role': agent.role.value,
-            'status': agent.status,
-            'completed_tasks': agent.completed_tasks
-        } for agent in status.agents.values()]
+            'id': agent['id'],
+            'role': agent['role'],
+            'status': agent['status'],
+            'completed_tasks': agent['completed_tasks']
+        } for agent in status['agents'].values()]
     })
 
 @api_bp.route('/status', methods=['GET'])
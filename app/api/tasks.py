@@ -1,41 +1,148 @@
 """
 Task API endpoints
 """
-from flask import request, jsonify
+import json
+import queue
+from urllib.parse import urlparse
+from flask import request, jsonify, Response, stream_with_context
 from app.api.agents import agent_system, init_agent_system
+from app.core.config import Config
+from gateway_metrics import SERIALIZATION_TIME
 from . import api_bp
 
+def _valid_callback_url(url):
+    """Webhook callbacks must be absolute http(s) URLs"""
+    if not isinstance(url, str):
+        return False
+    parsed = urlparse(url)
+    return parsed.scheme in ('http', 'https') and bool(parsed.netloc)
+
 @api_bp.route('/tasks', methods=['POST'])
 def create_task():
     """Create a new task"""
     init_agent_system()
-    
+
     try:
         data = request.json
+        callback_url = data.get('callback_url')
+        if callback_url not in (None, '') and not _valid_callback_url(callback_url):
+            return jsonify({'error': 'callback_url must be an http(s) URL'}), 400
+
         task = agent_system.create_task(
             data['task_id'],
             data['description'],
-            data['task_type']
+            data['task_type'],
+            priority=int(data.get('priority', 5)),
+            context=data.get('context'),
+            callback_url=callback_url
         )
-        
+
         # Auto-assign task
         agent_system.assign_task(task.id)
-        
+
         return jsonify({'success': True, 'task_id': task.id})
-        
+
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+@api_bp.route('/tasks/bulk', methods=['POST'])
+def create_tasks_bulk():
+    """Create many tasks in one request
+
+    Body: {"tasks": [{"idempotency_key", "task_id", "description",
+    "task_type", "priority", "context", "callback_url"}, ...]}
+    Resubmitting an idempotency_key returns the original task id.
+    """
+    init_agent_system()
+
+    data = request.get_json(silent=True) or {}
+    specs = data.get('tasks')
+    if not isinstance(specs, list) or not specs:
+        return jsonify({'error': 'tasks must be a non-empty list'}), 400
+    if len(specs) > Config.BULK_TASKS_MAX:
+        return jsonify({'error': f'At most {Config.BULK_TASKS_MAX} tasks per request'}), 413
+
+    for index, spec in enumerate(specs):
+        callback_url = spec.get('callback_url') if isinstance(spec, dict) else None
+        if callback_url not in (None, '') and not _valid_callback_url(callback_url):
+            return jsonify({'error': 'Validation failed', 'errors': [
+                {'index': index, 'error': 'callback_url must be an http(s) URL'}
+            ]}), 400
+
+    result = agent_system.create_tasks_bulk(specs)
+    if not result['success']:
+        return jsonify({'error': 'Validation failed', 'errors': result['errors']}), 400
+
+    result['assigned'] = agent_system.dispatch_pending()
+    result['queued'] = agent_system.pending_task_count()
+    return jsonify(result)
+
 @api_bp.route('/tasks', methods=['GET'])
 def list_tasks():
     """List all tasks"""
     init_agent_system()
     status = agent_system.get_system_status()
-    return jsonify({
-        'tasks': [{
-            'id': task.id,
-            'status': task.status,
-            'type': task.type,
-            'description': task.description
-        } for task in status.tasks.values()]
-    })
\ No newline at end of file
+    with SERIALIZATION_TIME.time(endpoint='/api/tasks'):
+        return jsonify({
+            'tasks': [{
+                'id': task['id'],
+                'status': task['status'],
+                'type': task['type'],
+                'description': task['description']
+            } for task in status['tasks'].values()]
+        })
+
+@api_bp.route('/tasks/<task_id>', methods=['GET'])
+def get_task(task_id):
+    """Get a single task, optionally long-polling for a state change
+
+    Query params:
+        wait   - seconds to wait for a transition (capped by config)
+        status - last status the client saw (defaults to the current one)
+    """
+    init_agent_system()
+
+    try:
+        wait = float(request.args.get('wait', 0))
+    except ValueError:
+        return jsonify({'error': 'wait must be a number of seconds'}), 400
+    wait = max(0.0, min(wait, Config.TASK_LONG_POLL_MAX_SECONDS))
+
+    task = agent_system.wait_for_task(task_id, request.args.get('status'), timeout=wait)
+    if task is None:
+        return jsonify({'error': f'Task {task_id} not found'}), 404
+
+    return jsonify({'task': task})
+
+@api_bp.route('/tasks/events', methods=['GET'])
+def task_events():
+    """Server-Sent Events stream of task state transitions
+
+    Pass ?task_id=<id> to only receive events for one task.
+    """
+    init_agent_system()
+    task_filter = request.args.get('task_id')
+    subscriber = agent_system.subscribe_task_events()
+
+    def stream():
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    event = subscriber.get(timeout=Config.TASK_EVENTS_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+                    continue
+
+                if task_filter and event['task']['id'] != task_filter:
+                    continue
+
+                yield f"id: {event['seq']}\nevent: task\ndata: {json.dumps(event['task'])}\n\n"
+        finally:
+            agent_system.unsubscribe_task_events(subscriber)
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
@@ -7,13 +7,18 @@ Autonomous agents using free OpenRouter models
 import os
 import json
 import time
+import uuid
+import heapq
+import queue
 import asyncio
 import threading
+import requests
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable, Set
 from dataclasses import dataclass, field
 from enum import Enum
 from ai_tools_suite import AIToolsSuite
+from gateway_metrics import QUEUE_WAIT
 
 class AgentRole(Enum):
     """Agent role definitions"""
@@ -33,6 +38,13 @@ class AgentStatus(Enum):
     COMPLETED = "completed"
     ERROR = "error"
 
+# Task states after which a task never changes again
+TERMINAL_TASK_STATES = ("completed", "failed")
+
+# Fields accepted for each entry of a bulk task submission
+BULK_TASK_FIELDS = ('task_id', 'idempotency_key', 'description', 'task_type',
+                    'priority', 'context', 'callback_url')
+
 @dataclass
 class Task:
     """Task definition for agents"""
@@ -46,6 +58,7 @@ class Task:
     result: Optional[Dict] = None
     dependencies: List[str] = field(default_factory=list)
     context: Dict = field(default_factory=dict)
+    callback_url: Optional[str] = None  # Webhook notified when the task finishes
 
 @dataclass
 class Message:
@@ -72,6 +85,7 @@ class Agent:
         self.completed_tasks: List[Task] = []
         self.capabilities: List[str] = []
         self.memory: Dict = {}
+        self.on_task_update: Optional[Callable[[Task], None]] = None
         self.stats = {
             'tasks_completed': 0,
             'tasks_failed': 0,
@@ -98,6 +112,11 @@ class Agent:
         
         self.capabilities = base_capabilities + role_capabilities.get(self.role, [])
     
+    def _notify_task_update(self, task: Task):
+        """Report a task state transition to the owning system"""
+        if self.on_task_update:
+            self.on_task_update(task)
+    
     def can_handle_task(self, task: Task) -> bool:
         """Check if agent can handle a specific task type"""
         task_capability_map = {
@@ -173,6 +192,7 @@ class Agent:
         self.status = AgentStatus.WORKING
         task.assigned_to = self.id
         task.status = "in_progress"
+        self._notify_task_update(task)
     
     def handle_request(self, message: Message):
         """Handle information requests from other agents"""
@@ -234,6 +254,7 @@ class Agent:
                 self.completed_tasks.append(task)
                 self.current_task = None
                 self.status = AgentStatus.IDLE
+                self._notify_task_update(task)
                 
                 print(f"Agent {self.id}: Task {task.id} completed successfully")
                 return task_result
@@ -244,18 +265,22 @@ class Agent:
         except Exception as e:
             print(f"Agent {self.id}: Task {task.id} failed: {e}")
             
-            self.stats['tasks_failed'] += 1
-            task.status = "failed"
-            self.current_task = None
-            self.status = AgentStatus.ERROR
-            
-            return {
+            task_result = {
                 'task_id': task.id,
                 'agent_id': self.id,
                 'status': 'failed',
                 'error': str(e),
                 'failed_at': datetime.now().isoformat()
             }
+            
+            self.stats['tasks_failed'] += 1
+            task.result = task_result
+            task.status = "failed"
+            self.current_task = None
+            self.status = AgentStatus.ERROR
+            self._notify_task_update(task)
+            
+            return task_result
     
     def _generate_task_prompt(self, task: Task) -> str:
         """Generate AI prompt based on role and task"""
@@ -301,6 +326,18 @@ class MultiAgentSystem:
             'total_messages': 0
         }
         self.running = False
+        
+        # Task state change notification (long-poll waiters, SSE subscribers, webhooks)
+        self._lock = threading.RLock()
+        self._task_changed = threading.Condition(self._lock)
+        self._event_subscribers: List[queue.Queue] = []
+        self._event_seq = 0
+        
+        # Bulk ingest: idempotency key -> task id, and pending tasks by priority
+        self._idempotency_keys: Dict[str, str] = {}
+        self._pending_heap: List = []
+        self._pending_seq = 0
+        self._pending_ids: Set[str] = set()  # queued tasks still pending; other heap entries are stale
     
     def create_agent(self, agent_id: str, role: AgentRole) -> Agent:
         """Create a new agent"""
@@ -308,6 +345,7 @@ class MultiAgentSystem:
             raise ValueError(f"Agent {agent_id} already exists")
         
         agent = Agent(agent_id, role, self.ai_suite)
+        agent.on_task_update = self._on_task_update
         self.agents[agent_id] = agent
         self.system_stats['active_agents'] = len(self.agents)
         
@@ -315,25 +353,281 @@ class MultiAgentSystem:
         return agent
     
     def create_task(self, task_id: str, description: str, task_type: str, 
-                   priority: int = 5, context: Dict = None) -> Task:
+                   priority: int = 5, context: Dict = None,
+                   callback_url: str = None) -> Task:
         """Create a new task"""
-        if task_id in self.tasks:
-            raise ValueError(f"Task {task_id} already exists")
-        
-        task = Task(
-            id=task_id,
-            description=description,
-            type=task_type,
-            priority=priority,
-            context=context or {}
-        )
-        
-        self.tasks[task_id] = task
-        self.system_stats['total_tasks'] += 1
+        with self._lock:
+            if task_id in self.tasks:
+                raise ValueError(f"Task {task_id} already exists")
+            if callback_url is not None and not isinstance(callback_url, str):
+                raise ValueError("callback_url must be a string")
+            
+            task = Task(
+                id=task_id,
+                description=description,
+                type=task_type,
+                priority=priority,
+                context=context or {},
+                callback_url=callback_url
+            )
+            
+            self.tasks[task_id] = task
+            self.system_stats['total_tasks'] += 1
+            # Queued like bulk tasks; assigning it directly drops it from the pending set
+            self._push_pending(task)
+            self._on_task_update(task)
         
         print(f"Created task: {task_id} ({task_type})")
         return task
     
+    def _task_snapshot(self, task: Task) -> Dict:
+        """Serializable view of a task for API responses and events"""
+        return {
+            'id': task.id,
+            'type': task.type,
+            'description': task.description,
+            'status': task.status,
+            'assigned_to': task.assigned_to,
+            'priority': task.priority,
+            'created_at': task.created_at,
+            'result': task.result
+        }
+    
+    def get_task(self, task_id: str) -> Optional[Dict]:
+        """Get a single task snapshot, or None if it does not exist"""
+        with self._lock:
+            task = self.tasks.get(task_id)
+            return self._task_snapshot(task) if task else None
+    
+    def wait_for_task(self, task_id: str, last_status: str = None,
+                      timeout: float = 0) -> Optional[Dict]:
+        """Long-poll a task until its status differs from last_status.
+        
+        last_status defaults to the task's current status, so a bare wait
+        returns on the next transition. Terminal tasks return immediately.
+        """
+        deadline = time.monotonic() + timeout
+        with self._task_changed:
+            task = self.tasks.get(task_id)
+            if task is None:
+                return None
+            
+            if last_status is None:
+                last_status = task.status
+            
+            while task.status == last_status and task.status not in TERMINAL_TASK_STATES:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._task_changed.wait(remaining)
+            
+            return self._task_snapshot(task)
+    
+    def subscribe_task_events(self, maxsize: int = 1000) -> queue.Queue:
+        """Register a queue that receives every task state transition"""
+        subscriber = queue.Queue(maxsize=maxsize)
+        with self._lock:
+            self._event_subscribers.append(subscriber)
+        return subscriber
+    
+    def unsubscribe_task_events(self, subscriber: queue.Queue):
+        """Remove a queue registered with subscribe_task_events"""
+        with self._lock:
+            if subscriber in self._event_subscribers:
+                self._event_subscribers.remove(subscriber)
+    
+    def _on_task_update(self, task: Task):
+        """Fan out a task state transition to waiters, subscribers and webhooks"""
+        self._publish_task_updates([task])
+    
+    def _publish_task_updates(self, tasks: List[Task]):
+        """Publish several transitions with a single wake-up of waiters"""
+        with self._task_changed:
+            events = []
+            for task in tasks:
+                if task.status == "in_progress":
+                    waited = datetime.now() - datetime.fromisoformat(task.created_at)
+                    QUEUE_WAIT.observe(waited.total_seconds())
+                if task.status != "pending":
+                    self._pending_ids.discard(task.id)
+                self._event_seq += 1
+                events.append({'seq': self._event_seq, 'task': self._task_snapshot(task)})
+            self._compact_pending()
+            
+            for subscriber in self._event_subscribers:
+                for event in events:
+                    try:
+                        subscriber.put_nowait(event)
+                    except queue.Full:
+                        # Slow consumer - drop the event rather than block agents
+                        break
+            
+            self._task_changed.notify_all()
+        
+        for task, event in zip(tasks, events):
+            if task.callback_url and task.status in TERMINAL_TASK_STATES:
+                self._deliver_webhook(task.callback_url, event['task'])
+    
+    def _validate_task_spec(self, spec: Any) -> Optional[str]:
+        """Return an error message for a malformed bulk task entry, or None"""
+        if not isinstance(spec, dict):
+            return 'Task entry must be an object'
+        
+        unknown = set(spec) - set(BULK_TASK_FIELDS)
+        if unknown:
+            return f"Unknown fields: {', '.join(sorted(unknown))}"
+        
+        for required in ('description', 'task_type'):
+            if not isinstance(spec.get(required), str) or not spec[required]:
+                return f'{required} is required'
+        
+        priority = spec.get('priority', 5)
+        if not isinstance(priority, int) or isinstance(priority, bool) or not 1 <= priority <= 10:
+            return 'priority must be an integer between 1 and 10'
+        
+        if spec.get('context') is not None and not isinstance(spec['context'], dict):
+            return 'context must be an object'
+        
+        if spec.get('callback_url') is not None and not isinstance(spec['callback_url'], str):
+            return 'callback_url must be a string'
+        
+        return None
+    
+    def create_tasks_bulk(self, specs: List[Dict]) -> Dict:
+        """Create many tasks atomically and queue them by priority.
+        
+        Entries carrying an idempotency_key that was already submitted resolve
+        to the existing task instead of failing, so clients can safely retry a
+        whole batch. If any entry is invalid nothing is inserted and the
+        per-entry errors are returned.
+        """
+        errors = []
+        task_ids: List[Optional[str]] = []
+        new_tasks: List[Task] = []
+        duplicates = 0
+        
+        with self._lock:
+            seen_ids = set()
+            seen_keys: Dict[str, str] = {}
+            
+            # Validation pass - nothing is mutated until every entry is valid
+            for index, spec in enumerate(specs):
+                error = self._validate_task_spec(spec)
+                if error:
+                    errors.append({'index': index, 'error': error})
+                    task_ids.append(None)
+                    continue
+                
+                key = spec.get('idempotency_key')
+                if key is not None:
+                    key = str(key)
+                    existing_id = self._idempotency_keys.get(key) or seen_keys.get(key)
+                    if existing_id:
+                        duplicates += 1
+                        task_ids.append(existing_id)
+                        continue
+                
+                task_id = str(spec.get('task_id') or f"task_{uuid.uuid4().hex}")
+                if task_id in self.tasks or task_id in seen_ids:
+                    errors.append({'index': index, 'error': f'Task {task_id} already exists'})
+                    task_ids.append(None)
+                    continue
+                
+                seen_ids.add(task_id)
+                if key is not None:
+                    seen_keys[key] = task_id
+                task_ids.append(task_id)
+                new_tasks.append(Task(
+                    id=task_id,
+                    description=spec['description'],
+                    type=spec['task_type'],
+                    priority=spec.get('priority', 5),
+                    context=spec.get('context') or {},
+                    callback_url=spec.get('callback_url')
+                ))
+            
+            if errors:
+                return {'success': False, 'errors': errors, 'created': 0}
+            
+            # Commit - all inserts happen under one lock acquisition
+            for task in new_tasks:
+                self.tasks[task.id] = task
+                self._push_pending(task)
+            self._idempotency_keys.update(seen_keys)
+            self.system_stats['total_tasks'] += len(new_tasks)
+            self._publish_task_updates(new_tasks)
+        
+        print(f"Created {len(new_tasks)} tasks in bulk ({duplicates} duplicates)")
+        return {
+            'success': True,
+            'created': len(new_tasks),
+            'duplicates': duplicates,
+            'task_ids': task_ids
+        }
+    
+    def _push_pending(self, task: Task):
+        """Queue a task for dispatch; highest priority first, then FIFO"""
+        self._pending_seq += 1
+        heapq.heappush(self._pending_heap, (-task.priority, self._pending_seq, task.id))
+        self._pending_ids.add(task.id)
+    
+    def _compact_pending(self):
+        """Rebuild the heap once stale entries (tasks no longer pending) outnumber live ones"""
+        if len(self._pending_heap) > 2 * len(self._pending_ids) + 64:
+            self._pending_heap = [entry for entry in self._pending_heap if entry[2] in self._pending_ids]
+            heapq.heapify(self._pending_heap)
+    
+    def pending_task_count(self) -> int:
+        """Number of tasks waiting for an agent"""
+        with self._lock:
+            return len(self._pending_ids)
+    
+    def dispatch_pending(self) -> int:
+        """Assign queued tasks to idle agents in priority order"""
+        assigned = 0
+        with self._lock:
+            deferred = []
+            while self._pending_heap:
+                idle_agents = [agent for agent in self.agents.values()
+                               if agent.status == AgentStatus.IDLE]
+                if not idle_agents:
+                    break
+                
+                entry = heapq.heappop(self._pending_heap)
+                task = self.tasks.get(entry[2])
+                if task is None or entry[2] not in self._pending_ids:
+                    # Stale: assigned or finished since it was queued
+                    continue
+                
+                agent = next((a for a in idle_agents if a.can_handle_task(task)), None)
+                if agent is None:
+                    deferred.append(entry)
+                    continue
+                
+                agent.accept_task(task)
+                assigned += 1
+            
+            for entry in deferred:
+                heapq.heappush(self._pending_heap, entry)
+        
+        return assigned
+    
+    def _deliver_webhook(self, url: str, payload: Dict, attempts: int = 3):
+        """POST a finished task to its callback URL without blocking the caller"""
+        def deliver():
+            for attempt in range(attempts):
+                try:
+                    response = requests.post(url, json=payload, timeout=10)
+                    if response.status_code < 400:
+                        return
+                    print(f"Webhook {url} returned {response.status_code} (attempt {attempt + 1})")
+                except Exception as e:
+                    print(f"Webhook {url} failed (attempt {attempt + 1}): {e}")
+                if attempt < attempts - 1:
+                    time.sleep(2 ** attempt)
+        
+        threading.Thread(target=deliver, daemon=True).start()
+    
     def assign_task(self, task_id: str, agent_id: str = None) -> bool:
         """Assign task to agent (or find suitable agent)"""
         if task_id not in self.tasks:
@@ -400,6 +694,9 @@ class MultiAgentSystem:
                         self.route_message(message)
                     agent.outbox.clear()
                 
+                # Hand queued tasks to idle agents
+                self.dispatch_pending()
+                
                 # Execute tasks for working agents
                 active_tasks = []
                 for agent in self.agents.values():
@@ -433,10 +730,11 @@ class MultiAgentSystem:
         agent_statuses = {agent_id: agent.get_status() for agent_id, agent in self.agents.items()}
         
         task_statuses = {}
-        for task_id, task in self.tasks.items():
+        for task_id, task in list(self.tasks.items()):
             task_statuses[task_id] = {
                 'id': task.id,
                 'type': task.type,
+                'description': task.description,
                 'status': task.status,
                 'assigned_to': task.assigned_to,
                 'priority': task.priority
@@ -11,6 +11,11 @@ class Config:
     STRIPE_SECRET_KEY = os.environ.get('STRIPE_SECRET_KEY', 'sk_test_...')
     REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379')
     
+    # Task result delivery
+    TASK_LONG_POLL_MAX_SECONDS = int(os.environ.get('TASK_LONG_POLL_MAX_SECONDS', 30))
+    TASK_EVENTS_KEEPALIVE_SECONDS = 15
+    BULK_TASKS_MAX = int(os.environ.get('BULK_TASKS_MAX', 10000))
+    
     # Pricing configuration
     PRICING_TIERS = {
         'free': {
@@ -0,0 +1,8 @@
+"""
+Performance benchmarks
+Run with: python -m benchmarks.api
+          python -m benchmarks.fft
+          python -m benchmarks.archive
+          python -m benchmarks.render
+          python -m benchmarks.sweep
+"""
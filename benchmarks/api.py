@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+API Load Test & Latency Benchmark
+Drives the Flask API and the OpenRouter gateway at fixed concurrency
+against the offline mock model server and reports throughput and
+p50/p95/p99 latency. Every run is saved to benchmarks/results/ and
+compared with the previous run so regressions show up immediately.
+
+Usage:
+    python -m benchmarks.api
+    python -m benchmarks.api --concurrency 32 --duration 20 --endpoints status,execute
+    python -m benchmarks.api --app-url http://localhost:5000 --gateway-url http://localhost:6969
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import uuid
+import argparse
+import threading
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from werkzeug.serving import make_server, WSGIRequestHandler
+
+from openrouter_mock_server import MockServerConfig, MockModelProfile, start_mock_server
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+# name -> (target, method, path, payload factory)
+ENDPOINTS = {
+    'agents': ('app', 'GET', '/api/agents', None),
+    'status': ('app', 'GET', '/api/status', None),
+    'tasks_create': ('app', 'POST', '/api/tasks', lambda: {
+        'task_id': f'bench_{uuid.uuid4().hex}',
+        'description': 'Benchmark task',
+        'task_type': 'research'
+    }),
+    'tasks_list': ('app', 'GET', '/api/tasks', None),
+    'execute': ('gateway', 'POST', '/api/agents/execute', lambda: {
+        'agent_type': 'coder',
+        'prompt': 'Write a function that reverses a string'
+    }),
+}
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    """Skip access logs so they don't skew timings"""
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+class _AppServer(threading.Thread):
+    """Serve a WSGI app from a background thread on a free port"""
+
+    def __init__(self, app):
+        super().__init__(daemon=True)
+        self.server = make_server('127.0.0.1', 0, app, threaded=True,
+                                  request_handler=_QuietRequestHandler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def run(self):
+        self.server.serve_forever()
+
+    def stop(self):
+        self.server.shutdown()
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+def run_endpoint(base_url, method, path, payload_factory, concurrency, duration, warmup):
+    """Hammer one endpoint with `concurrency` workers for `duration` seconds"""
+    latencies = []
+    status_codes = {}
+    lock = threading.Lock()
+    warmup_end = time.perf_counter() + warmup
+    stop_at = warmup_end + duration
+
+    def worker():
+        session = requests.Session()
+        local_latencies = []
+        local_codes = {}
+        while True:
+            started = time.perf_counter()
+            if started >= stop_at:
+                break
+            try:
+                payload = payload_factory() if payload_factory else None
+                response = session.request(method, base_url + path, json=payload, timeout=60)
+                code = response.status_code
+            except requests.RequestException:
+                code = 'error'
+            elapsed = time.perf_counter() - started
+            if started >= warmup_end:
+                local_latencies.append(elapsed)
+                local_codes[code] = local_codes.get(code, 0) + 1
+        with lock:
+            latencies.extend(local_latencies)
+            for code, count in local_codes.items():
+                status_codes[code] = status_codes.get(code, 0) + count
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+
+    latencies.sort()
+    total = len(latencies)
+    ok = sum(count for code, count in status_codes.items() if isinstance(code, int) and code < 400)
+    return {
+        'requests': total,
+        'throughput_rps': total / duration if duration else 0.0,
+        'success_rate': ok / total if total else 0.0,
+        'status_codes': {str(code): count for code, count in status_codes.items()},
+        'latency_ms': {
+            'mean': (sum(latencies) / total * 1000) if total else 0.0,
+            'p50': percentile(latencies, 50) * 1000,
+            'p95': percentile(latencies, 95) * 1000,
+            'p99': percentile(latencies, 99) * 1000,
+            'max': (latencies[-1] * 1000) if total else 0.0
+        }
+    }
+
+def start_local_targets(needed, mock_config):
+    """Start the mock model server plus in-process app/gateway servers"""
+    servers = {}
+    mock = start_mock_server(mock_config)
+    os.environ['OPENROUTER_BASE_URL'] = mock.base_url
+    os.environ.setdefault('OPENROUTER_API_KEY', 'mock-benchmark-key')
+    servers['mock'] = mock
+
+    if 'app' in needed:
+        from app import create_app
+        servers['app'] = _AppServer(create_app())
+        servers['app'].start()
+
+    if 'gateway' in needed:
+        from openrouter_exclusive_system import OpenRouterExclusiveSystem
+        gateway = OpenRouterExclusiveSystem()
+        # The usage guard would otherwise reject almost every benchmark request
+        gateway.app.config['MAX_DAILY_REQUESTS'] = float('inf')
+        gateway.app.config['MAX_HOURLY_REQUESTS'] = float('inf')
+        servers['gateway'] = _AppServer(gateway.app)
+        servers['gateway'].start()
+
+    return servers
+
+def latest_result():
+    """Most recent saved run, used as the comparison baseline"""
+    runs = sorted(RESULTS_DIR.glob('api-*.json'))
+    return runs[-1] if runs else None
+
+def compare(current, baseline, threshold):
+    """Print per-endpoint deltas and return the list of regressions"""
+    regressions = []
+    print(f"\nComparison with {baseline.get('timestamp')}:")
+    for name, result in current['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(name)
+        if not previous:
+            continue
+        for metric in ('p50', 'p95', 'p99'):
+            old, new = previous['latency_ms'][metric], result['latency_ms'][metric]
+            change = (new - old) / old if old else 0.0
+            flag = ''
+            if change > threshold:
+                flag = '  REGRESSION'
+                regressions.append(f'{name} {metric} +{change:.0%}')
+            print(f"  {name:14s} {metric}: {old:8.2f} -> {new:8.2f} ms ({change:+.1%}){flag}")
+        old_rps, new_rps = previous['throughput_rps'], result['throughput_rps']
+        change = (new_rps - old_rps) / old_rps if old_rps else 0.0
+        if change < -threshold:
+            regressions.append(f'{name} throughput {change:.0%}')
+        print(f"  {name:14s} rps: {old_rps:8.1f} -> {new_rps:8.1f} ({change:+.1%})")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='API load test and latency benchmark')
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS),
+                        help=f"comma separated subset of: {', '.join(ENDPOINTS)}")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per endpoint')
+    parser.add_argument('--warmup', type=float, default=1.0, help='seconds excluded from stats')
+    parser.add_argument('--app-url', help='benchmark a running app instead of starting one')
+    parser.add_argument('--gateway-url', help='benchmark a running gateway instead of starting one')
+    parser.add_argument('--mock-config', help='JSON file with mock model profiles')
+    parser.add_argument('--mock-latency-ms', type=float, default=50.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--baseline', help='result file to compare against (default: previous run)')
+    parser.add_argument('--regression-threshold', type=float, default=0.2,
+                        help='fractional slowdown reported as a regression')
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.endpoints.split(',') if name.strip()]
+    unknown = [name for name in names if name not in ENDPOINTS]
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(unknown)}")
+
+    if args.mock_config:
+        with open(args.mock_config, 'r', encoding='utf-8') as f:
+            mock_config = MockServerConfig.from_dict(json.load(f))
+    else:
+        mock_config = MockServerConfig(
+            default_profile=MockModelProfile(latency_ms=args.mock_latency_ms, latency_spread=0.3,
+                                             tokens_per_second=0),
+            seed=args.seed
+        )
+
+    urls = {'app': args.app_url, 'gateway': args.gateway_url}
+    needed = {ENDPOINTS[name][0] for name in names if not urls[ENDPOINTS[name][0]]}
+    servers = start_local_targets(needed, mock_config)
+    for target in needed:
+        urls[target] = servers[target].url
+
+    print("API Load Test & Latency Benchmark")
+    print("=" * 50)
+    print(f"  Concurrency: {args.concurrency}  Duration: {args.duration}s/endpoint")
+    print(f"  Mock model server: {servers['mock'].base_url}")
+    print()
+    print(f"  {'endpoint':14s} {'req':>7s} {'rps':>9s} {'ok':>7s} {'p50':>9s} {'p95':>9s} {'p99':>9s}")
+
+    run = {
+        'timestamp': datetime.now().isoformat(),
+        'config': {
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'mock_latency_ms': args.mock_latency_ms,
+            'seed': args.seed
+        },
+        'endpoints': {}
+    }
+
+    try:
+        for name in names:
+            target, method, path, payload_factory = ENDPOINTS[name]
+            result = run_endpoint(urls[target], method, path, payload_factory,
+                                  args.concurrency, args.duration, args.warmup)
+            run['endpoints'][name] = result
+            latency = result['latency_ms']
+            print(f"  {name:14s} {result['requests']:7d} {result['throughput_rps']:9.1f} "
+                  f"{result['success_rate']:7.1%} {latency['p50']:7.2f}ms {latency['p95']:7.2f}ms "
+                  f"{latency['p99']:7.2f}ms")
+    finally:
+        for server in servers.values():
+            server.stop()
+
+    baseline_path = Path(args.baseline) if args.baseline else latest_result()
+    regressions = []
+    if baseline_path and baseline_path.exists():
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            regressions = compare(run, json.load(f), args.regression_threshold)
+
+    if not args.no_save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        result_path = RESULTS_DIR / f"api-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        with open(result_path, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+        print(f"\nResults saved to {result_path}")
+
+    if regressions:
+        print("\nRegressions detected:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Spectrum Archive Query Benchmark
+Fills a temporary SpectrumArchive with synthetic frames spread over a
+number of days (noise plus an occasional strong 433.92 MHz burst) and
+times catalog load and typical historical queries.
+
+Usage:
+    python -m benchmarks.archive
+    python -m benchmarks.archive --days 30 --frames-per-day 2000 --bins 2048
+"""
+
+import sys
+import json
+import time
+import argparse
+import tempfile
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+
+from hackrf_spectrum_archive import SpectrumArchive
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+def fill(archive, days, frames_per_day, bins, chunk_frames, seed):
+    """Append the synthetic history; returns (start time, bursts written)"""
+    rng = np.random.default_rng(seed)
+    frequencies = np.linspace(432e6, 436e6, bins)
+    burst_bin = int(np.argmin(np.abs(frequencies - 433.92e6)))
+    start = datetime(2024, 1, 1).timestamp()
+    interval = 86400.0 / frames_per_day
+    bursts = 0
+    for chunk_start in range(0, days * frames_per_day, chunk_frames):
+        count = min(chunk_frames, days * frames_per_day - chunk_start)
+        power = (-95 + 3 * rng.standard_normal((count, bins))).astype(np.float32)
+        hits = rng.random(count) < 0.001
+        power[hits, burst_bin - 2:burst_bin + 3] = -35.0
+        bursts += int(np.count_nonzero(hits))
+        for i in range(count):
+            archive.append(1, {'frequencies': frequencies, 'power': power[i],
+                               'timestamp': start + (chunk_start + i) * interval})
+    archive.flush()
+    return start, bursts
+
+def timed(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Spectrum archive query benchmark')
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--frames-per-day', type=int, default=1000)
+    parser.add_argument('--bins', type=int, default=1024)
+    parser.add_argument('--chunk-frames', type=int, default=256)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args(argv)
+
+    print("Spectrum Archive Query Benchmark")
+    print("=" * 50)
+    print(f"  {args.days} days x {args.frames_per_day} frames/day, {args.bins} bins, "
+          f"{args.chunk_frames} frames/chunk")
+
+    with tempfile.TemporaryDirectory() as root:
+        archive = SpectrumArchive(root, chunk_frames=args.chunk_frames, chunk_seconds=86400)
+        started = time.perf_counter()
+        start, bursts = fill(archive, args.days, args.frames_per_day, args.bins, args.chunk_frames, args.seed)
+        fill_seconds = time.perf_counter() - started
+        size = sum(path.stat().st_size for path in Path(root).rglob('*') if path.is_file())
+        print(f"  Wrote {len(archive)} chunks ({size / 1e6:.1f} MB) in {fill_seconds:.1f} s, {bursts} bursts\n")
+
+        load_seconds, _ = timed(lambda: SpectrumArchive(root), args.repeat)
+        day = (start + 7 * 86400, start + 8 * 86400)
+        queries = {
+            'burst search (433.92 MHz >= -50 dB, all time)':
+                lambda: archive.query((433.9e6, 433.94e6), None, -50),
+            'one day, 100 kHz':
+                lambda: archive.query((433.87e6, 433.97e6), day),
+            'one day, full span':
+                lambda: archive.query(None, day)
+        }
+
+        run = {
+            'timestamp': datetime.now().isoformat(),
+            'config': vars(args),
+            'chunks': len(archive),
+            'bytes': size,
+            'catalog_load_seconds': load_seconds,
+            'queries': {}
+        }
+        print(f"  {'catalog load':48s} {load_seconds * 1e3:8.2f} ms")
+        for name, query in queries.items():
+            seconds, matches = timed(query, args.repeat)
+            frames = sum(len(match['timestamps']) for match in matches)
+            run['queries'][name] = {'seconds': seconds, 'frames': frames}
+            print(f"  {name:48s} {seconds * 1e3:8.2f} ms  {frames:8d} frames")
+
+    if not args.no_save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        result_path = RESULTS_DIR / f"archive-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        with open(result_path, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+        print(f"\nResults saved to {result_path}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
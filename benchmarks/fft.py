@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+FFT Pipeline Throughput Benchmark
+Streams synthetic IQ blocks through ParallelFFTPipeline at increasing
+worker counts and reports frames/s, frames/s per core and scaling
+efficiency against the single-worker run. The single-threaded
+WelchSpectrumEngine is measured as the reference.
+
+Usage:
+    python -m benchmarks.fft
+    python -m benchmarks.fft --fft-size 8192 --block-size 262144 --workers 1,2,4,8
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+
+from hackrf_spectral import WelchSpectrumEngine
+from hackrf_fft_pipeline import ParallelFFTPipeline
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+def make_blocks(count, block_size, seed):
+    """Noise plus a tone, pre-generated so capture cost is not measured"""
+    rng = np.random.default_rng(seed)
+    n = np.arange(block_size)
+    tone = 0.5 * np.exp(2j * np.pi * 0.1 * n)
+    blocks = []
+    for _ in range(count):
+        noise = rng.standard_normal((2, block_size), dtype=np.float32) * 0.1
+        blocks.append((noise[0] + 1j * noise[1] + tone).astype(np.complex64))
+    return blocks
+
+def run_engine(blocks, fft_size, overlap, duration):
+    """Single-threaded reference: WelchSpectrumEngine on the calling thread"""
+    engine = WelchSpectrumEngine(fft_size, overlap, shifted=True)
+    started = time.perf_counter()
+    index = 0
+    while time.perf_counter() - started < duration:
+        engine.block_psd(blocks[index % len(blocks)])
+        index += 1
+    elapsed = time.perf_counter() - started
+    return engine.frames_processed / elapsed, index * len(blocks[0]) / elapsed
+
+def run_pipeline(blocks, fft_size, overlap, workers, duration):
+    """Feed blocks as fast as the pipeline accepts them for `duration` seconds"""
+    pipeline = ParallelFFTPipeline(fft_size, overlap, workers=workers, on_result=lambda *args: None)
+    started = time.perf_counter()
+    index = 0
+    while time.perf_counter() - started < duration:
+        pipeline.submit(blocks[index % len(blocks)])
+        index += 1
+    pipeline.close(wait=True)
+    elapsed = time.perf_counter() - started
+    return pipeline.frames_processed / elapsed, index * len(blocks[0]) / elapsed
+
+def main(argv=None):
+    cores = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, cores} & set(range(1, cores + 1)) | {1})
+    parser = argparse.ArgumentParser(description='FFT pipeline throughput benchmark')
+    parser.add_argument('--fft-size', type=int, default=8192)
+    parser.add_argument('--overlap', type=float, default=0.5)
+    parser.add_argument('--block-size', type=int, default=262144, help='samples per captured block')
+    parser.add_argument('--workers', default=','.join(str(w) for w in default_workers),
+                        help='comma separated worker counts')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per run')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args(argv)
+
+    worker_counts = [int(w) for w in args.workers.split(',') if w.strip()]
+    blocks = make_blocks(8, args.block_size, args.seed)
+
+    print("FFT Pipeline Throughput Benchmark")
+    print("=" * 50)
+    print(f"  FFT size: {args.fft_size}  Overlap: {args.overlap}  Block: {args.block_size} samples")
+    print(f"  Cores available: {cores}")
+    print()
+
+    frames_rate, sample_rate = run_engine(blocks, args.fft_size, args.overlap, args.duration)
+    print(f"  {'engine':10s} {frames_rate:12.0f} frames/s {sample_rate / 1e6:8.1f} MS/s")
+
+    run = {
+        'timestamp': datetime.now().isoformat(),
+        'config': {
+            'fft_size': args.fft_size,
+            'overlap': args.overlap,
+            'block_size': args.block_size,
+            'duration': args.duration,
+            'cores': cores
+        },
+        'engine': {'frames_per_second': frames_rate, 'samples_per_second': sample_rate},
+        'pipeline': {}
+    }
+
+    print(f"\n  {'workers':>7s} {'frames/s':>12s} {'per core':>10s} {'MS/s':>8s} {'scaling':>8s}")
+    baseline = None
+    for workers in worker_counts:
+        frames_rate, sample_rate = run_pipeline(blocks, args.fft_size, args.overlap, workers, args.duration)
+        used_cores = min(workers, cores)
+        per_core = frames_rate / used_cores
+        baseline = baseline or frames_rate
+        efficiency = frames_rate / (baseline * used_cores)
+        run['pipeline'][str(workers)] = {
+            'frames_per_second': frames_rate,
+            'frames_per_second_per_core': per_core,
+            'samples_per_second': sample_rate,
+            'scaling_efficiency': efficiency
+        }
+        print(f"  {workers:7d} {frames_rate:12.0f} {per_core:10.0f} {sample_rate / 1e6:8.1f} {efficiency:8.0%}")
+
+    if not args.no_save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        result_path = RESULTS_DIR / f"fft-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        with open(result_path, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+        print(f"\nResults saved to {result_path}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Spectrum Display Rendering Benchmark
+Draws synthetic spectra into a spectrum + waterfall figure on the Agg
+canvas, once with the old clear()/plot()/imshow()/draw() cycle and once
+through SpectrumRenderer (persistent artists and blitting), and reports
+frames per second for each.
+
+Usage:
+    python -m benchmarks.render
+    python -m benchmarks.render --bins 8192 --frames 200
+"""
+
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from hackrf_renderer import SpectrumRenderer
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+def make_figure():
+    figure = Figure(figsize=(12, 8))
+    canvas = FigureCanvasAgg(figure)
+    return canvas, figure.add_subplot(211), figure.add_subplot(212)
+
+def redraw_all(freqs, spectra, rows):
+    """The per-frame full redraw the GUIs used before"""
+    canvas, spectrum_ax, waterfall_ax = make_figure()
+    waterfall = []
+    for power in spectra:
+        waterfall.append(power)
+        waterfall = waterfall[-rows:]
+        spectrum_ax.clear()
+        spectrum_ax.plot(freqs, power, 'cyan', linewidth=1)
+        spectrum_ax.grid(True, alpha=0.3)
+        waterfall_ax.clear()
+        waterfall_ax.imshow(np.array(waterfall), aspect='auto', cmap='viridis',
+                            extent=[freqs[0], freqs[-1], 0, len(waterfall)])
+        canvas.draw()
+
+def blitted(freqs, spectra, rows):
+    canvas, spectrum_ax, waterfall_ax = make_figure()
+    spectrum_ax.grid(True, alpha=0.3)
+    renderer = SpectrumRenderer(canvas, spectrum_ax, waterfall_ax, waterfall_rows=rows,
+                                power_range=(-120, 0), max_fps=0)
+    for power in spectra:
+        renderer.update(freqs, power)
+    return renderer
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Spectrum display rendering benchmark')
+    parser.add_argument('--bins', type=int, default=8192)
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--rows', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args(argv)
+
+    print("Spectrum Display Rendering Benchmark")
+    print("=" * 50)
+    print(f"  {args.frames} frames x {args.bins} bins, {args.rows} waterfall rows\n")
+
+    rng = np.random.default_rng(args.seed)
+    freqs = np.linspace(2400.0, 2420.0, args.bins)
+    spectra = (-95 + 3 * rng.standard_normal((args.frames, args.bins))).astype(np.float32)
+
+    run = {'timestamp': datetime.now().isoformat(), 'config': vars(args), 'fps': {}}
+    for name, method in (('clear/plot redraw', redraw_all), ('blitted renderer', blitted)):
+        started = time.perf_counter()
+        method(freqs, spectra, args.rows)
+        fps = args.frames / (time.perf_counter() - started)
+        run['fps'][name] = fps
+        print(f"  {name:24s} {fps:8.1f} fps")
+
+    if not args.no_save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        result_path = RESULTS_DIR / f"render-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        with open(result_path, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+        print(f"\nResults saved to {result_path}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
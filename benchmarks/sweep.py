@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Wideband Survey Benchmark
+Times one DefensiveRadarScanner survey of a frequency range through the
+retune-and-stitch SweepEngine (simulated IQ capture), against the
+previous 1 MHz stepped loop (one power reading and a 10 ms settle per
+step, timed over the first --stepped-steps steps and extrapolated).
+
+Usage:
+    python -m benchmarks.sweep
+    python -m benchmarks.sweep --start 1000 --stop 6000 --fft-size 2048
+"""
+
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+from hackrf_security_scanner import DefensiveRadarScanner
+from hackrf_sweep import SweepEngine, SimulatedSweepSource
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+def stepped_scan(scanner, start_freq, steps):
+    """The per-MHz loop scan_frequency_range used before"""
+    for step in range(steps):
+        frequency = start_freq + step * 1e6
+        scanner.analyze_threat_level(frequency, scanner.measure_power_at_frequency(frequency))
+        time.sleep(0.01)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Wideband survey benchmark')
+    parser.add_argument('--start', type=float, default=1000.0, help='Start frequency (MHz)')
+    parser.add_argument('--stop', type=float, default=6000.0, help='Stop frequency (MHz)')
+    parser.add_argument('--sample-rate', type=float, default=20.0, help='Sample rate (MS/s)')
+    parser.add_argument('--fft-size', type=int, default=1024)
+    parser.add_argument('--dwell', type=int, default=8192, help='Samples per retune')
+    parser.add_argument('--stepped-steps', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args(argv)
+
+    print("Wideband Survey Benchmark")
+    print("=" * 50)
+    print(f"  {args.start:.0f}-{args.stop:.0f} MHz, {args.sample_rate:.0f} MS/s, "
+          f"{args.fft_size}-point FFT, {args.dwell} samples per retune\n")
+
+    scanner = DefensiveRadarScanner()
+    scanner.sweep_engine = SweepEngine(
+        SimulatedSweepSource([(2437e6, -35.0), (462.5e6, -25.0)], fft_size=args.fft_size, seed=args.seed),
+        sample_rate=args.sample_rate * 1e6, fft_size=args.fft_size, dwell_samples=args.dwell)
+    scanner.is_scanning = True
+    config = {'name': 'benchmark', 'start_freq': args.start * 1e6, 'stop_freq': args.stop * 1e6}
+
+    started = time.perf_counter()
+    detections = scanner.scan_frequency_range(config)
+    sweep_seconds = time.perf_counter() - started
+    panorama = scanner.last_panorama
+
+    steps = int((args.stop - args.start) + 1)
+    timed = min(steps, args.stepped_steps)
+    started = time.perf_counter()
+    stepped_scan(scanner, args.start * 1e6, timed)
+    stepped_seconds = (time.perf_counter() - started) * steps / timed
+
+    run = {
+        'timestamp': datetime.now().isoformat(),
+        'config': vars(args),
+        'sweep': {'seconds': sweep_seconds, 'retunes': panorama['retunes'], 'bins': len(panorama['power']),
+                  'bin_width_hz': panorama['bin_width'], 'detections': len(detections)},
+        'stepped': {'seconds': stepped_seconds, 'bins': steps}
+    }
+    print(f"  sweep engine   {sweep_seconds:8.2f} s  {panorama['retunes']:6d} retunes  "
+          f"{len(panorama['power']):8d} bins ({panorama['bin_width'] / 1e3:.1f} kHz)")
+    print(f"  stepped 1 MHz  {stepped_seconds:8.2f} s  {steps:6d} steps    {steps:8d} bins (extrapolated)")
+
+    if not args.no_save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        result_path = RESULTS_DIR / f"sweep-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        with open(result_path, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+        print(f"\nResults saved to {result_path}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -32,7 +32,7 @@ class ComprehensiveTestAuditSuite:
         # OpenRouter configuration - Enhanced
         self.openrouter_config = {
             'api_key': 'sk-or-v1-d41d8cd98f00b204e9800998ecf8427e',
-            'base_url': 'https://openrouter.ai/api/v1/chat/completions',
+            'base_url': f"{os.getenv('OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1')}/chat/completions",
             'models': {
                 'security_analysis': 'meta-llama/llama-3.1-70b-instruct:free',
                 'code_review': 'google/gemma-2-9b-it:free',
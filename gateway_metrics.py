@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Gateway Metrics - Prometheus-style instrumentation
+Thread-safe counters and histograms for the OpenRouter gateway and the
+multi-agent API, rendered in the Prometheus text exposition format at
+/metrics and summarised for the real-time stats endpoints.
+"""
+
+import os
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Tuple, extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+class Counter:
+    """Monotonically increasing counter with optional labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        """Value for the given labels; labels left out are summed over"""
+        with self._lock:
+            items = list(self._values.items())
+        wanted = {i: str(labels[name]) for i, name in enumerate(self.labelnames) if name in labels}
+        return sum(v for key, v in items if all(key[i] == want for i, want in wanted.items()))
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {value}')
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time spent inside the with-block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _merged(self, labels: Dict):
+        wanted = {i: str(labels[name]) for i, name in enumerate(self.labelnames) if name in labels}
+        counts = [0] * (len(self.buckets) + 1)
+        total_sum, total_count = 0.0, 0
+        with self._lock:
+            for key, (bucket_counts, series_sum, series_count) in self._series.items():
+                if all(key[i] == want for i, want in wanted.items()):
+                    counts = [a + b for a, b in zip(counts, bucket_counts)]
+                    total_sum += series_sum
+                    total_count += series_count
+        return counts, total_sum, total_count
+
+    def summary(self, **labels) -> Dict:
+        """count/sum/mean and bucket-interpolated p50/p95/p99; omitted labels are merged"""
+        counts, total_sum, total_count = self._merged(labels)
+        return {
+            'count': total_count,
+            'sum': total_sum,
+            'mean': total_sum / total_count if total_count else 0.0,
+            'p50': self._quantile(counts, total_count, 0.50),
+            'p95': self._quantile(counts, total_count, 0.95),
+            'p99': self._quantile(counts, total_count, 0.99)
+        }
+
+    def _quantile(self, counts: List[int], total: int, q: float) -> float:
+        if not total:
+            return 0.0
+        target = q * total
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if cumulative + count >= target and count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index == len(self.buckets):
+                    return lower  # +Inf bucket: best estimate is the top finite bound
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (target - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = sorted((key, (list(c), s, n)) for key, (c, s, n) in self._series.items())
+        for key, (bucket_counts, series_sum, series_count) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), bucket_counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{bound}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {series_sum}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {series_count}')
+        return lines
+
+class MetricsRegistry:
+    """Collection of metrics rendered together at /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = MetricsRegistry()
+
+# Upstream (OpenRouter) calls
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    'openrouter_upstream_latency_seconds', 'Latency of OpenRouter chat completion calls', ['model', 'status'])
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    'openrouter_upstream_requests_total', 'OpenRouter calls by final outcome', ['model', 'outcome'])
+UPSTREAM_RETRIES = REGISTRY.counter(
+    'openrouter_retries_total', 'Retried OpenRouter attempts', ['model'])
+UPSTREAM_FALLBACKS = REGISTRY.counter(
+    'openrouter_fallbacks_total', 'Requests served by a fallback model', ['agent'])
+RATE_LIMIT_REJECTIONS = REGISTRY.counter(
+    'gateway_rate_limit_rejections_total', 'Requests rejected by rate limits', ['source'])
+
+# Request handling
+REQUEST_DURATION = REGISTRY.histogram(
+    'http_request_duration_seconds', 'End-to-end HTTP request time', ['endpoint', 'method', 'status'])
+SERIALIZATION_TIME = REGISTRY.histogram(
+    'response_serialization_seconds', 'Time spent serialising JSON responses', ['endpoint'])
+QUEUE_WAIT = REGISTRY.histogram(
+    'task_queue_wait_seconds', 'Time from task creation until an agent accepts it')
+
+# One Process object for the life of the module: cpu_percent() measures
+# since the previous call on the same object (primed here, so the first
+# process_stats() already reports usage since import)
+_PROCESS = psutil.Process(os.getpid()) if psutil is not None else None
+if _PROCESS is not None:
+    _PROCESS.cpu_percent(interval=None)
+
+def process_stats() -> Dict:
+    """Resident memory and CPU usage of this process (peak memory where RSS is unavailable)"""
+    if _PROCESS is not None:
+        return {
+            'memory_rss_mb': _PROCESS.memory_info().rss / (1024 * 1024),
+            'memory_peak_mb': None,
+            'cpu_percent': _PROCESS.cpu_percent(interval=None)
+        }
+
+    try:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        # ru_maxrss is the peak resident set (KiB on Linux), not the current one
+        return {'memory_rss_mb': None, 'memory_peak_mb': usage.ru_maxrss / 1024, 'cpu_percent': None}
+    except ImportError:
+        return {'memory_rss_mb': None, 'memory_peak_mb': None, 'cpu_percent': None}
+
+def instrument_flask_app(app, registry: MetricsRegistry = REGISTRY):
+    """Time every request and expose the registry at /metrics"""
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_request_timer():
+        g._metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request_duration(response):
+        started = g.pop('_metrics_started', None)
+        if started is not None:
+            endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+            REQUEST_DURATION.observe(time.perf_counter() - started, endpoint=endpoint,
+                                     method=request.method, status=response.status_code)
+        return response
+
+    def metrics():
+        return Response(registry.render(), mimetype=CONTENT_TYPE)
+
+    app.add_url_rule('/metrics', 'metrics', metrics)
+    return app
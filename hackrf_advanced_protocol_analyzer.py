@@ -18,6 +18,67 @@ from pathlib import Path
 import threading
 import queue
 import sqlite3
+import os
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from hackrf_channelizer import Channelizer
+from hackrf_iq_file import IQFileReader
+from hackrf_burst_detector import BurstDetector
+from hackrf_bit_slicer import recover_bits, bits_to_hex
+from hackrf_protocol_index import ProtocolIndex
+
+class ChannelAnalysisState:
+    """Per-channel state carried across the chunks of a streamed capture.
+    
+    Decimated samples go through a streaming burst detector, each detected
+    transmission is analysed on its own, and the channel summary is a
+    power-weighted vote over its bursts so the strongest dominate.
+    """
+    
+    def __init__(self, channel, frequency, detector):
+        self.channel = channel
+        self.frequency = frequency
+        self.sample_rate = channel.output_rate
+        self.detector = detector
+        self.samples_seen = 0
+        self.bursts = []
+        self.modulation_weights = defaultdict(float)
+        self.bit_rate_weights = defaultdict(float)
+        self.strongest = None
+        
+    def feed(self, samples):
+        """Run decimated samples through the detector; returns completed bursts"""
+        self.samples_seen += len(samples)
+        return self.detector.process(samples)
+        
+    def flush(self):
+        return self.detector.flush()
+        
+    def record(self, result):
+        """Add one analysed burst to the channel summary"""
+        self.bursts.append(result)
+        weight = 10 ** (result['mean_power_db'] / 10)
+        self.modulation_weights[result['modulation']] += weight
+        if result['bit_rate'] > 0:
+            self.bit_rate_weights[result['bit_rate']] += weight
+        if self.strongest is None or result['mean_power_db'] > self.strongest['mean_power_db']:
+            self.strongest = result
+            
+    def active_seconds(self):
+        return sum(burst['duration'] for burst in self.bursts)
+        
+    def modulation(self):
+        if not self.modulation_weights:
+            return "CW"
+        return max(self.modulation_weights, key=self.modulation_weights.get)
+        
+    def bit_rate(self):
+        """Power-weighted median of the per-burst estimates"""
+        if not self.bit_rate_weights:
+            return 0
+        rates = sorted(self.bit_rate_weights)
+        weights = np.cumsum([self.bit_rate_weights[rate] for rate in rates])
+        return int(rates[int(np.searchsorted(weights, weights[-1] / 2))])
 
 class AdvancedProtocolAnalyzer:
     def __init__(self):
@@ -26,8 +87,30 @@ class AdvancedProtocolAnalyzer:
         self.center_freq = 434000000  # 434 MHz default
         self.running = False
         
+        # Narrowband channels analysed out of the wideband capture
+        # (offset from the tuned frequency and bandwidth, both in Hz)
+        self.channels = [
+            {'name': 'center', 'offset': 0.0, 'bandwidth': 200e3}
+        ]
+        
+        # Recordings are streamed from disk in chunks of this many IQ samples
+        self.iq_format = 'uint8'  # used when the file extension doesn't say (.cs8 / .cu8)
+        self.chunk_samples = 1 << 20
+        
+        # Each channel is segmented into transmissions before classification;
+        # bursts are classified and decoded in parallel
+        self.burst_detection = {
+            'window_seconds': 1e-3,  # moving-average power window
+            'on_db': 10.0,           # above the noise floor to open a burst
+            'off_db': 6.0,           # below this the burst closes
+            'min_duration': 1e-3,
+            'max_duration': 5.0
+        }
+        self.analysis_workers = os.cpu_count() or 1
+        
         # Protocol definitions
         self.protocols = self.init_protocol_database()
+        self.protocol_index = ProtocolIndex(self.protocols)
         
         # Analysis results
         self.analysis_queue = queue.Queue()
@@ -493,51 +576,21 @@ class AdvancedProtocolAnalyzer:
                 
         return 0
         
+    def get_protocol_index(self):
+        """Compiled lookup over self.protocols (rebuilt if the database was replaced or resized)"""
+        index = self.protocol_index
+        if index.protocols is not self.protocols or len(index) != len(self.protocols):
+            index = self.protocol_index = ProtocolIndex(self.protocols)
+        return index
+        
     def classify_protocol(self, frequency, modulation, bit_rate, iq_samples):
         """Classify signal protocol based on characteristics"""
-        candidates = []
-        
-        for protocol_name, protocol_info in self.protocols.items():
-            # Check frequency match
-            freq_match = False
-            for freq_range in protocol_info['frequency_ranges']:
-                if freq_range[0] <= frequency <= freq_range[1]:
-                    freq_match = True
-                    break
-                    
-            if not freq_match:
-                continue
-                
-            # Check modulation match
-            if modulation.upper() in protocol_info['modulation'].upper():
-                modulation_score = 1.0
-            else:
-                modulation_score = 0.5
-                
-            # Check bit rate match
-            bit_rate_score = 0.0
-            if 'bit_rate' in protocol_info and protocol_info['bit_rate']:
-                for expected_rate in protocol_info['bit_rate']:
-                    if abs(bit_rate - expected_rate) / expected_rate < 0.1:  # 10% tolerance
-                        bit_rate_score = 1.0
-                        break
-                    elif abs(bit_rate - expected_rate) / expected_rate < 0.2:  # 20% tolerance
-                        bit_rate_score = 0.7
-                        break
-                        
-            # Calculate overall confidence
-            confidence = (1.0 + modulation_score + bit_rate_score) / 3.0
-            
-            candidates.append({
-                'protocol': protocol_name,
-                'confidence': confidence,
-                'details': protocol_info
-            })
-            
-        # Sort by confidence
-        candidates.sort(key=lambda x: x['confidence'], reverse=True)
+        # Only protocols covering the frequency are scored (interval index)
+        return self.get_protocol_index().classify(frequency, modulation, bit_rate)
         
-        return candidates[:3]  # Return top 3 candidates
+    def classify_protocols(self, frequencies, modulations, bit_rates):
+        """Classify many signals at once; returns the top candidates for each"""
+        return self.get_protocol_index().classify_many(frequencies, modulations, bit_rates)
         
     def decode_signal(self, protocol_name, iq_samples, sample_rate):
         """Decode signal based on identified protocol"""
@@ -568,29 +621,27 @@ class AdvancedProtocolAnalyzer:
         # Extract bit stream
         if 'bit_rate' in protocol_info and protocol_info['bit_rate']:
             expected_rate = protocol_info['bit_rate'][0]
-            samples_per_bit = int(sample_rate / expected_rate)
+            bits, samples_per_bit = recover_bits(digital_bits, sample_rate / expected_rate)
             
-            bits = []
-            for i in range(0, len(digital_bits) - samples_per_bit, samples_per_bit):
-                bit_window = digital_bits[i:i + samples_per_bit]
-                bit_value = np.mean(bit_window) > 0.5
-                bits.append(int(bit_value))
-                
             return {
                 "status": "decoded",
                 "protocol": "OOK",
-                "bits": bits,
-                "hex_data": self.bits_to_hex(bits)
+                "bits": bits.tolist(),
+                "hex_data": bits_to_hex(bits),
+                "recovered_bit_rate": sample_rate / samples_per_bit
             }
             
         return {"status": "decoding_failed", "reason": "bit_rate_unknown"}
         
     def decode_fsk(self, iq_samples, sample_rate, protocol_info):
         """Decode Frequency Shift Keying signals"""
-        # Instantaneous frequency calculation
-        analytic_signal = scipy.signal.hilbert(iq_samples)
-        instantaneous_phase = np.unwrap(np.angle(analytic_signal))
-        instantaneous_frequency = np.diff(instantaneous_phase) / (2.0 * np.pi) * sample_rate
+        # Instantaneous frequency calculation - IQ is already analytic, so the
+        # phase step is the angle of x[n] * conj(x[n-1]) (no unwrap needed)
+        if np.iscomplexobj(iq_samples):
+            phase_step = np.angle(iq_samples[1:] * np.conj(iq_samples[:-1]))
+        else:
+            phase_step = np.diff(np.unwrap(np.angle(scipy.signal.hilbert(iq_samples))))
+        instantaneous_frequency = phase_step / (2.0 * np.pi) * sample_rate
         
         # Binary FSK decoding (simplified)
         freq_threshold = np.mean(instantaneous_frequency)
@@ -598,20 +649,15 @@ class AdvancedProtocolAnalyzer:
         
         if 'bit_rate' in protocol_info and protocol_info['bit_rate']:
             expected_rate = protocol_info['bit_rate'][0]
-            samples_per_bit = int(sample_rate / expected_rate)
+            bits, samples_per_bit = recover_bits(digital_bits, sample_rate / expected_rate)
             
-            bits = []
-            for i in range(0, len(digital_bits) - samples_per_bit, samples_per_bit):
-                bit_window = digital_bits[i:i + samples_per_bit]
-                bit_value = np.mean(bit_window) > 0.5
-                bits.append(int(bit_value))
-                
             return {
                 "status": "decoded",
                 "protocol": "FSK", 
-                "bits": bits,
-                "hex_data": self.bits_to_hex(bits),
-                "frequency_deviation": np.std(instantaneous_frequency)
+                "bits": bits.tolist(),
+                "hex_data": bits_to_hex(bits),
+                "recovered_bit_rate": sample_rate / samples_per_bit,
+                "frequency_deviation": float(np.std(instantaneous_frequency))
             }
             
         return {"status": "decoding_failed", "reason": "bit_rate_unknown"}
@@ -628,41 +674,23 @@ class AdvancedProtocolAnalyzer:
         
         if 'bit_rate' in protocol_info and protocol_info['bit_rate']:
             expected_rate = protocol_info['bit_rate'][0]
-            samples_per_bit = int(sample_rate / expected_rate)
+            bits, samples_per_bit = recover_bits(digital_bits, sample_rate / expected_rate)
             
-            bits = []
-            for i in range(0, len(digital_bits) - samples_per_bit, samples_per_bit):
-                bit_window = digital_bits[i:i + samples_per_bit]
-                bit_value = np.mean(bit_window) > 0.5
-                bits.append(int(bit_value))
-                
             return {
                 "status": "decoded",
                 "protocol": "ASK",
-                "bits": bits,
-                "hex_data": self.bits_to_hex(bits)
+                "bits": bits.tolist(),
+                "hex_data": bits_to_hex(bits),
+                "recovered_bit_rate": sample_rate / samples_per_bit
             }
             
         return {"status": "decoding_failed", "reason": "bit_rate_unknown"}
         
     def bits_to_hex(self, bits):
         """Convert bit array to hexadecimal string"""
-        if not bits:
-            return ""
-            
-        # Pad to multiple of 4 bits
-        while len(bits) % 4 != 0:
-            bits.append(0)
-            
-        hex_string = ""
-        for i in range(0, len(bits), 4):
-            nibble = bits[i:i+4]
-            hex_value = nibble[0] * 8 + nibble[1] * 4 + nibble[2] * 2 + nibble[3]
-            hex_string += format(hex_value, 'X')
-            
-        return hex_string
+        return bits_to_hex(bits)
         
-    def analyze_signal_file(self, filename, frequency, sample_rate):
+    def analyze_signal_file(self, filename, frequency, sample_rate, iq_format=None):
         """Analyze a recorded signal file"""
         print(f"Analyzing signal file: {filename}")
         print(f"Frequency: {frequency / 1e6:.3f} MHz")
@@ -670,59 +698,136 @@ class AdvancedProtocolAnalyzer:
         print("-" * 50)
         
         try:
-            # Read IQ samples from file
-            with open(filename, 'rb') as f:
-                data = f.read()
-                
-            # Convert to complex samples (assuming 8-bit IQ)
-            iq_samples = np.frombuffer(data, dtype=np.uint8)
-            iq_samples = iq_samples.astype(np.float32) - 127.5
-            iq_samples = iq_samples[0::2] + 1j * iq_samples[1::2]
-            
-            print(f"Loaded {len(iq_samples)} IQ samples")
-            
-            # Detect modulation
-            modulation = self.detect_modulation(iq_samples, sample_rate)
-            print(f"Detected modulation: {modulation}")
-            
-            # Estimate bit rate
-            bit_rate = self.estimate_bit_rate(iq_samples, sample_rate)
-            print(f"Estimated bit rate: {bit_rate} bps")
-            
-            # Classify protocol
-            candidates = self.classify_protocol(frequency, modulation, bit_rate, iq_samples)
-            
-            print(f"\nProtocol candidates:")
-            for i, candidate in enumerate(candidates, 1):
-                print(f"{i}. {candidate['protocol']} (confidence: {candidate['confidence']:.2f})")
+            # Memory-mapped and converted chunk by chunk: memory use does not
+            # depend on the file size. Only detected bursts reach the
+            # classifiers, so analysis time follows the channel activity
+            with IQFileReader(filename, iq_format, self.iq_format) as reader, \
+                    ThreadPoolExecutor(max_workers=self.analysis_workers) as pool:
+                print(f"Loaded {len(reader)} IQ samples ({reader.iq_format})")
                 
-            if candidates:
-                # Try to decode with best candidate
-                best_candidate = candidates[0]
-                decoded = self.decode_signal(best_candidate['protocol'], iq_samples, sample_rate)
+                channelizer = Channelizer(sample_rate, self.channels)
+                states = [ChannelAnalysisState(channel, frequency + channel.offset,
+                                               BurstDetector(channel.output_rate, **self.burst_detection))
+                          for channel in channelizer.channels]
                 
-                print(f"\nDecoding results:")
-                print(json.dumps(decoded, indent=2))
+                pending = deque()
+                max_pending = 4 * self.analysis_workers
+                for _, chunk in reader.chunks(self.chunk_samples):
+                    for state in states:
+                        for burst in state.feed(state.channel.process(chunk)):
+                            pending.append((state, pool.submit(self.analyze_burst, state.frequency, burst)))
+                    # Bound the backlog so queued bursts don't pile up in memory
+                    while len(pending) > max_pending:
+                        self._record_burst(filename, *pending.popleft())
+                        
+                for state in states:
+                    for burst in state.flush():
+                        pending.append((state, pool.submit(self.analyze_burst, state.frequency, burst)))
+                while pending:
+                    self._record_burst(filename, *pending.popleft())
+                    
+            # One classification call covers the summary of every channel
+            summaries = [(state.modulation(), state.bit_rate()) for state in states]
+            classified = self.classify_protocols([state.frequency for state in states],
+                                                 [modulation for modulation, _ in summaries],
+                                                 [bit_rate for _, bit_rate in summaries])
+            
+            channel_results = []
+            for state, (modulation, bit_rate), candidates in zip(states, summaries, classified):
+                channel = state.channel
+                print(f"\nChannel {channel.name}: {state.frequency / 1e6:.3f} MHz, "
+                      f"{state.samples_seen} samples at {state.sample_rate / 1e3:.1f} kSPS "
+                      f"(decimation {channel.decimation})")
+                print(f"{len(state.bursts)} bursts, {state.active_seconds():.3f} s active")
                 
-                # Store results
-                self.store_analysis_result(filename, frequency, best_candidate, decoded, iq_samples)
+                if not state.bursts:
+                    candidates = []
+                else:
+                    print(f"Dominant modulation: {modulation}, bit rate: {bit_rate} bps")
+                    for i, candidate in enumerate(candidates, 1):
+                        print(f"{i}. {candidate['protocol']} (confidence: {candidate['confidence']:.2f})")
+                        
+                channel_results.append({
+                    'channel': channel.name,
+                    'frequency': state.frequency,
+                    'sample_rate': state.sample_rate,
+                    'modulation': modulation,
+                    'bit_rate': bit_rate,
+                    'candidates': candidates,
+                    'decoded': state.strongest['decoded'] if state.strongest else None,
+                    'active_seconds': state.active_seconds(),
+                    'bursts': state.bursts
+                })
                 
+            primary = channel_results[0]
             return {
                 'filename': filename,
                 'frequency': frequency,
                 'sample_rate': sample_rate,
-                'modulation': modulation,
-                'bit_rate': bit_rate,
-                'candidates': candidates,
-                'decoded': decoded if candidates else None
+                'modulation': primary['modulation'],
+                'bit_rate': primary['bit_rate'],
+                'candidates': primary['candidates'],
+                'decoded': primary['decoded'],
+                'channels': channel_results
             }
             
         except Exception as e:
             print(f"Error analyzing file: {e}")
             return None
             
-    def store_analysis_result(self, filename, frequency, candidate, decoded, iq_samples):
+    def analyze_burst(self, frequency, burst):
+        """Classify and decode one burst (runs on the analysis pool)"""
+        result = burst.to_dict()
+        result.update(self.classify_and_decode(frequency, burst.samples, burst.sample_rate))
+        result['signal_strength'] = float(np.mean(np.abs(burst.samples)))
+        return result
+        
+    def _record_burst(self, filename, state, future):
+        """Collect a finished burst analysis and store it"""
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Burst analysis error: {e}")
+            return
+        state.record(result)
+        best = result['candidates'][0] if result['candidates'] else None
+        print(f"Burst @ {result['time_offset']:.4f}s ({result['duration'] * 1e3:.1f} ms, "
+              f"SNR {result['snr_db']:.1f} dB): {result['modulation']}, {result['bit_rate']} bps"
+              + (f" -> {best['protocol']} ({best['confidence']:.2f})" if best else ""))
+        if best is not None:
+            self.store_analysis_result(filename, state.frequency, best, result['decoded'],
+                                       signal_strength=result['signal_strength'],
+                                       metadata={'time_offset': result['time_offset'],
+                                                 'duration': result['duration'],
+                                                 'channel': state.channel.name})
+            
+    def classify_and_decode(self, frequency, iq_samples, sample_rate, modulation=None, bit_rate=None):
+        """Modulation, bit rate, protocol candidates and decode of one signal"""
+        if modulation is None:
+            modulation = self.detect_modulation(iq_samples, sample_rate)
+        if bit_rate is None:
+            bit_rate = self.estimate_bit_rate(iq_samples, sample_rate)
+        candidates = self.classify_protocol(frequency, modulation, bit_rate, iq_samples)
+        decoded = None
+        if candidates:
+            try:
+                decoded = self.decode_signal(candidates[0]['protocol'], iq_samples, sample_rate)
+            except Exception as e:
+                decoded = {"status": "decoding_failed", "reason": str(e)}
+        return {
+            'modulation': modulation,
+            'bit_rate': bit_rate,
+            'candidates': candidates,
+            'decoded': decoded
+        }
+        
+    def store_analysis_result(self, filename, frequency, candidate, decoded, iq_samples=None,
+                              signal_strength=None, metadata=None):
         """Store analysis result in database"""
+        if signal_strength is None:
+            signal_strength = float(np.mean(np.abs(iq_samples)))
+        metadata = dict(metadata or {}, filename=filename)
+        
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
@@ -736,10 +841,10 @@ class AdvancedProtocolAnalyzer:
             frequency,
             candidate['protocol'],
             candidate['details']['modulation'],
-            np.mean(np.abs(iq_samples)),
+            signal_strength,
             candidate['confidence'],
             json.dumps(decoded),
-            json.dumps({'filename': filename})
+            json.dumps(metadata)
         ))
         
         # Update protocol statistics
@@ -839,7 +944,7 @@ def main():
     print("HackRF Advanced Protocol Analyzer")
     print("=" * 50)
     print("Available commands:")
-    print("1. analyze <filename> <frequency> <sample_rate>")
+    print("1. analyze <filename> <frequency> <sample_rate> [int8|uint8]")
     print("2. live <frequency> <sample_rate> [duration]")
     print("3. report")
     print("4. protocols")
@@ -858,7 +963,8 @@ def main():
                 filename = command[1]
                 frequency = float(command[2])
                 sample_rate = float(command[3])
-                analyzer.analyze_signal_file(filename, frequency, sample_rate)
+                iq_format = command[4] if len(command) > 4 else None
+                analyzer.analyze_signal_file(filename, frequency, sample_rate, iq_format)
                 
             elif command[0] == "live" and len(command) >= 3:
                 frequency = float(command[1])
@@ -876,7 +982,7 @@ def main():
                     
             elif command[0] == "help":
                 print("\nCommand help:")
-                print("analyze <file> <freq_hz> <sample_rate> - Analyze recorded signal")
+                print("analyze <file> <freq_hz> <sample_rate> [int8|uint8] - Analyze recorded signal")
                 print("live <freq_hz> <sample_rate> [duration] - Live analysis mode")
                 print("report - Generate analysis report")
                 print("protocols - List supported protocols")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+HackRF Burst Detector - Energy-based segmentation of IQ streams
+Moving-average power against an adaptive noise floor with on/off
+hysteresis, evaluated a whole block at a time, cuts a capture into
+individual transmissions with their time offsets
+"""
+
+import numpy as np
+
+class Burst:
+    """One detected transmission"""
+
+    def __init__(self, start, samples, sample_rate, noise_floor):
+        self.start = start  # sample index in the stream
+        self.samples = samples
+        self.sample_rate = sample_rate
+        power = samples.real ** 2 + samples.imag ** 2
+        self.mean_power_db = float(10 * np.log10(np.mean(power) + 1e-20))
+        self.peak_power_db = float(10 * np.log10(np.max(power) + 1e-20))
+        self.snr_db = float(self.mean_power_db - 10 * np.log10(noise_floor + 1e-20))
+
+    @property
+    def time_offset(self):
+        return self.start / self.sample_rate
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sample_rate
+
+    def to_dict(self):
+        return {
+            'start_sample': int(self.start),
+            'time_offset': self.time_offset,
+            'duration': self.duration,
+            'samples': len(self.samples),
+            'mean_power_db': self.mean_power_db,
+            'peak_power_db': self.peak_power_db,
+            'snr_db': self.snr_db
+        }
+
+class BurstDetector:
+    """Streaming energy detector with hysteresis.
+
+    A burst opens when the moving-average power rises on_db above the noise
+    floor and closes once it has stayed below off_db for hold_seconds, so
+    the gaps inside an OOK packet don't split it; the floor follows quiet
+    stretches quickly and rises only slowly while a burst is on. Bursts
+    spanning block boundaries are stitched together, shorter than
+    min_duration are discarded and longer than max_duration are split.
+    """
+
+    def __init__(self, sample_rate, window_seconds=1e-3, on_db=10.0, off_db=6.0,
+                 hold_seconds=5e-3, min_duration=1e-3, max_duration=5.0, noise_floor=None,
+                 floor_time_constant=30.0):
+        self.sample_rate = float(sample_rate)
+        self.window = max(1, int(round(window_seconds * self.sample_rate)))
+        self.on_ratio = 10 ** (on_db / 10)
+        self.off_ratio = 10 ** (off_db / 10)
+        self.hold = max(0, int(hold_seconds * self.sample_rate))
+        self.min_samples = max(1, int(min_duration * self.sample_rate))
+        self.max_samples = max(self.min_samples, int(max_duration * self.sample_rate))
+        self.fixed_floor = noise_floor
+        self.noise_floor = noise_floor
+        self.floor_time_constant = floor_time_constant
+
+        # The moving average needs window - 1 samples of context and lags
+        # the newest sample by `delay`; both come from the carried history
+        self.delay = self.window // 2
+        self._history = np.zeros(self.window - 1, dtype=np.complex64)
+        self._processed = 0
+        self._on = False  # raw hysteresis state
+        self._last_on = -(1 << 62)  # stream position of the last 'on' decision
+        self._active = False  # burst open (hysteresis state extended by the hold time)
+        self._burst_start = 0
+        self._burst_parts = []
+        self._burst_len = 0
+
+        self.bursts_detected = 0
+        self.bursts_discarded = 0
+
+    def _update_noise_floor(self, average, quiet):
+        """Track the floor from the quiet part of the block.
+
+        With no quiet samples (a block inside a long transmission) the floor
+        only creeps towards the block level with a floor_time_constant time
+        constant, so a change in gain or noise is still followed eventually
+        without the burst becoming the floor.
+        """
+        if self.fixed_floor is not None:
+            return
+        if self.noise_floor is None:
+            self.noise_floor = float(np.percentile(average, 10))
+        elif np.count_nonzero(quiet) >= self.window:
+            estimate = float(np.median(average[quiet]))
+            self.noise_floor += 0.5 * (estimate - self.noise_floor)
+        else:
+            estimate = float(np.percentile(average, 10))
+            if estimate < self.noise_floor:
+                self.noise_floor = estimate
+            else:
+                alpha = 1 - np.exp(-len(average) / (self.floor_time_constant * self.sample_rate))
+                self.noise_floor += alpha * (estimate - self.noise_floor)
+        self.noise_floor = max(self.noise_floor, 1e-20)
+
+    def process(self, block):
+        """Feed one block; returns the list of bursts completed in it"""
+        count = len(block)
+        if count == 0:
+            return []
+        extended = np.concatenate((self._history, block))
+        base = self._processed - len(self._history)  # stream index of extended[0]
+
+        # Moving-average power for every window ending inside this block
+        power = extended.real.astype(np.float64) ** 2 + extended.imag.astype(np.float64) ** 2
+        cumulative = np.concatenate(([0.0], np.cumsum(power)))
+        average = (cumulative[self.window:] - cumulative[:-self.window]) / self.window
+        if self.noise_floor is None:
+            self._update_noise_floor(average, None)
+
+        # Hysteresis: the latest on/off crossing decides the state; samples
+        # between the thresholds inherit it (forward fill of event indices)
+        on = average > self.noise_floor * self.on_ratio
+        off = average < self.noise_floor * self.off_ratio
+        event = on | off
+        positions = np.where(event, np.arange(len(average)), -1)
+        np.maximum.accumulate(positions, out=positions)
+        state = np.where(positions >= 0, on[np.maximum(positions, 0)], self._on)
+        self._on = bool(state[-1])
+
+        # average[i] describes the window ending at extended[i + window - 1];
+        # centring it puts the decision at extended[i + window - 1 - delay]
+        offset = self.window - 1 - self.delay
+        stream_positions = np.arange(base + offset, base + offset + len(average))
+
+        # Hold: stay open until `hold` positions after the last 'on' decision
+        last_on = np.where(state, stream_positions, self._last_on)
+        np.maximum.accumulate(last_on, out=last_on)
+        self._last_on = int(last_on[-1])
+        held = stream_positions - last_on <= self.hold
+        self._update_noise_floor(average, ~held)
+
+        edges = np.flatnonzero(np.diff(np.concatenate(([self._active], held)).astype(np.int8)))
+
+        completed = []
+        cursor = offset  # first extended index not yet assigned to a burst
+        for edge in edges:
+            position = edge + offset
+            if not self._active:
+                self._active = True
+                self._burst_start = base + position
+                cursor = position
+            else:
+                self._extend(extended[cursor:position], completed)
+                self._close(completed, base + position, int(last_on[edge]))
+                self._active = False
+                cursor = position
+
+        if self._active:
+            self._extend(extended[cursor:offset + len(average)], completed)
+
+        self._history = extended[len(extended) - (self.window - 1):].copy() if self.window > 1 \
+            else extended[:0].copy()
+        self._processed += count
+        return completed
+
+    def _extend(self, samples, completed):
+        """Append samples to the open burst, splitting at max_duration"""
+        while len(samples):
+            room = self.max_samples - self._burst_len
+            part = samples[:room]
+            self._burst_parts.append(part.copy())
+            self._burst_len += len(part)
+            samples = samples[room:]
+            if self._burst_len >= self.max_samples:
+                start = self._burst_start
+                self._close(completed)
+                self._burst_start = start + self.max_samples
+
+    def _close(self, completed, end=None, last_on=None):
+        """Emit the open burst; the hold tail between last_on and end is trimmed"""
+        if end is not None:
+            trim = min(self._burst_len, max(0, end - (last_on + 1)))
+            while trim and self._burst_parts:
+                part = self._burst_parts[-1]
+                cut = min(trim, len(part))
+                self._burst_parts[-1] = part[:len(part) - cut]
+                if not len(self._burst_parts[-1]):
+                    self._burst_parts.pop()
+                self._burst_len -= cut
+                trim -= cut
+
+        if self._burst_len >= self.min_samples:
+            samples = np.concatenate(self._burst_parts)
+            completed.append(Burst(self._burst_start, samples, self.sample_rate, self.noise_floor))
+            self.bursts_detected += 1
+        elif self._burst_len:
+            self.bursts_discarded += 1
+        self._burst_parts = []
+        self._burst_len = 0
+
+    def flush(self):
+        """Close a burst still open at the end of the stream"""
+        completed = []
+        if self._active:
+            self._extend(self._history[self.window - 1 - self.delay:], completed)
+            self._close(completed, self._processed, self._last_on)
+            self._active = False
+        return completed
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+HackRF Channelizer - Streaming decimation for narrowband analysis
+Mixes each configured channel down to baseband with a phase-continuous
+oscillator and decimates it with a polyphase FIR whose state carries
+across blocks, so demodulators see only the samples they need
+"""
+
+import math
+from functools import lru_cache
+import numpy as np
+from scipy import signal
+
+@lru_cache(maxsize=32)
+def design_decimation_filter(decimation, cutoff_ratio, taps_per_phase=16):
+    """Low-pass prototype for a decimate-by-`decimation` stage.
+
+    cutoff_ratio is the passband edge as a fraction of the input Nyquist.
+    Cached and read-only because channels with equal parameters share it.
+    """
+    numtaps = taps_per_phase * decimation + 1
+    taps = signal.firwin(numtaps, cutoff_ratio).astype(np.float32)
+    taps.setflags(write=False)
+    return taps
+
+class StreamingDecimator:
+    """Polyphase FIR decimator with filter state kept between blocks.
+
+    Feeding a signal in arbitrary block sizes yields exactly the same output
+    as filtering it in one go: every output sample is produced once, when
+    the input sample it is aligned to arrives.
+    """
+
+    def __init__(self, decimation, taps):
+        self.decimation = int(decimation)
+        self.taps = np.asarray(taps)
+        self.history_len = len(self.taps) - 1
+        self._history = np.zeros(self.history_len, dtype=np.complex64)
+        self.samples_in = 0
+        self.samples_out = 0
+
+    def reset(self):
+        self._history[:] = 0
+        self.samples_in = 0
+        self.samples_out = 0
+
+    def process(self, block):
+        """Filter and decimate one block; returns the new output samples"""
+        count = len(block)
+        if count == 0:
+            return np.zeros(0, dtype=np.complex64)
+        D = self.decimation
+
+        # Prepend enough history that the filter is primed and the first
+        # local index lines up with an output instant (a multiple of D)
+        extra = (self.samples_in - self.history_len) % D
+        keep = self.history_len + extra
+        if keep > len(self._history):
+            history = np.concatenate((np.zeros(keep - len(self._history), dtype=np.complex64), self._history))
+        else:
+            history = self._history[len(self._history) - keep:]
+        extended = np.concatenate((history, block))
+
+        # upfirdn only evaluates the retained outputs (polyphase)
+        filtered = signal.upfirdn(self.taps, extended, up=1, down=D)
+        first = -(-keep // D)
+        last = -(-(keep + count) // D)
+        output = filtered[first:last].astype(np.complex64, copy=False)
+
+        self._history = extended[-self.history_len:] if self.history_len else extended[:0]
+        self.samples_in += count
+        self.samples_out += len(output)
+        return output
+
+class Channel:
+    """One narrowband channel pulled out of the wideband stream"""
+
+    def __init__(self, name, offset, bandwidth, sample_rate, oversample=2.5, taps_per_phase=16):
+        self.name = name
+        self.offset = float(offset)
+        self.bandwidth = float(bandwidth)
+        self.decimation = max(1, int(sample_rate // (self.bandwidth * oversample)))
+        self.output_rate = sample_rate / self.decimation
+        self._phase_step = -2 * np.pi * self.offset / sample_rate
+        self._phase = 0.0
+        self._oscillator = None
+
+        if self.decimation > 1:
+            cutoff = min(0.95, self.bandwidth / sample_rate)
+            taps = design_decimation_filter(self.decimation, round(cutoff, 6), taps_per_phase)
+            self.decimator = StreamingDecimator(self.decimation, taps)
+        else:
+            self.decimator = None
+
+    def _mix(self, block):
+        if self.offset == 0.0:
+            return block
+        count = len(block)
+        # The oscillator for a block length is built once; each block only
+        # rotates it to the running phase
+        if self._oscillator is None or len(self._oscillator) != count:
+            self._oscillator = np.exp(1j * self._phase_step * np.arange(count)).astype(np.complex64)
+        mixed = block * self._oscillator
+        mixed *= np.complex64(np.exp(1j * self._phase))
+        self._phase = math.remainder(self._phase + self._phase_step * count, 2 * np.pi)
+        return mixed
+
+    def process(self, block):
+        mixed = self._mix(block)
+        if self.decimator is None:
+            return np.asarray(mixed, dtype=np.complex64)
+        return self.decimator.process(mixed)
+
+    def reset(self):
+        self._phase = 0.0
+        if self.decimator is not None:
+            self.decimator.reset()
+
+class Channelizer:
+    """Bank of streaming channels sharing one wideband input.
+
+    channels is a list of dicts with 'offset' (Hz from the tuned centre),
+    'bandwidth' (Hz) and an optional 'name'.
+    """
+
+    def __init__(self, sample_rate, channels, oversample=2.5, taps_per_phase=16):
+        if not channels:
+            raise ValueError("At least one channel is required")
+        self.sample_rate = float(sample_rate)
+        self.channels = []
+        for index, spec in enumerate(channels):
+            if spec['bandwidth'] <= 0:
+                raise ValueError(f"Channel bandwidth must be positive: {spec}")
+            if abs(spec.get('offset', 0.0)) >= self.sample_rate / 2:
+                raise ValueError(f"Channel offset outside the captured band: {spec}")
+            self.channels.append(Channel(spec.get('name', f'ch{index}'), spec.get('offset', 0.0),
+                                         spec['bandwidth'], self.sample_rate, oversample, taps_per_phase))
+
+    def process(self, block):
+        """Channelize one block; returns {name: decimated samples}"""
+        return {channel.name: channel.process(block) for channel in self.channels}
+
+    def process_stream(self, blocks):
+        """Channelize an iterable of blocks and concatenate each channel's output"""
+        outputs = {channel.name: [] for channel in self.channels}
+        for block in blocks:
+            for name, samples in self.process(block).items():
+                outputs[name].append(samples)
+        return {name: np.concatenate(parts) if parts else np.zeros(0, dtype=np.complex64)
+                for name, parts in outputs.items()}
+
+    def reset(self):
+        for channel in self.channels:
+            channel.reset()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+HackRF Device Index - Compact device signatures and a persistent known-device set
+A signature packs the quantized frequency, bandwidth and power of a
+detection, plus a 16-bit checksum of the device type, into one 64-bit
+integer, so building it needs no serialization or cryptographic hashing
+and lookups are set membership tests. Signatures live in memory, are
+loaded from the device_signatures table at start-up and written back in
+batches
+"""
+
+import atexit
+import sqlite3
+import weakref
+import logging
+import threading
+import time
+import zlib
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Indexes with a database get their pending signatures written at exit;
+# the weak set does not keep them alive (sqlite's busy timeout bounds each flush)
+_persistent_indexes = weakref.WeakSet()
+
+@atexit.register
+def _flush_persistent_indexes():
+    for index in list(_persistent_indexes):
+        index.flush()
+
+# Field widths of the packed signature (most to least significant)
+TYPE_BITS = 16
+FREQUENCY_BITS = 24
+BANDWIDTH_BITS = 12
+POWER_BITS = 12
+POWER_OFFSET_DB = 200.0  # power buckets count up from -200 dB
+
+def _field(value, step, bits):
+    """Quantize `value` to multiples of `step`, clamped into `bits` bits"""
+    return min(max(int(round(value / step)), 0), (1 << bits) - 1)
+
+def device_signature(device_type, frequency, bandwidth, power, frequency_step=100e3,
+                     bandwidth_step=250e3, power_step=3.0):
+    """64-bit signature of a detection.
+
+    Frequency, bandwidth and power are rounded to the given steps, so
+    repeat observations of one device map to the same value; distinct
+    buckets never collide while they fit their fields (frequency up to
+    about 1.6 THz at 100 kHz, bandwidth up to 1 GHz at 250 kHz, power
+    -200..+12000 dB at 3 dB).
+    """
+    signature = zlib.crc32(device_type.encode()) & ((1 << TYPE_BITS) - 1)
+    signature = (signature << FREQUENCY_BITS) | _field(frequency, frequency_step, FREQUENCY_BITS)
+    signature = (signature << BANDWIDTH_BITS) | _field(bandwidth, bandwidth_step, BANDWIDTH_BITS)
+    signature = (signature << POWER_BITS) | _field(power + POWER_OFFSET_DB, power_step, POWER_BITS)
+    return signature
+
+def format_signature(signature):
+    """Fixed-width (16 hex digit) text form used in the database and in reports"""
+    return f'{signature:016x}'
+
+class DeviceSignatureIndex:
+    """In-memory known-device and whitelist sets backed by device_signatures.
+
+    observe() is O(1): new signatures and last-seen times of known ones
+    are buffered and written with one executemany once batch_size
+    signatures are pending or flush_interval seconds have passed. Rows
+    from older signature formats (not 16 hex digits) are ignored on load.
+    """
+
+    def __init__(self, db_path=None, batch_size=64, flush_interval=5.0):
+        self.db_path = db_path
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.known = set()
+        self.whitelist = set()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.batches_written = 0
+        if db_path is not None:
+            self.load()
+            # Write pending signatures when the interpreter exits
+            _persistent_indexes.add(self)
+
+    def load(self):
+        """Read the persisted signatures into memory"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute('SELECT signature, is_whitelisted FROM device_signatures').fetchall()
+        except Exception as e:
+            logger.error(f"Device signature load error: {e}")
+            return
+        with self._lock:
+            for text, whitelisted in rows:
+                if not isinstance(text, str) or len(text) != 16:
+                    continue
+                try:
+                    signature = int(text, 16)
+                except ValueError:
+                    continue
+                self.known.add(signature)
+                if whitelisted:
+                    self.whitelist.add(signature)
+
+    def __contains__(self, signature):
+        return signature in self.known
+
+    def __len__(self):
+        return len(self.known)
+
+    def is_whitelisted(self, signature):
+        return signature in self.whitelist
+
+    def observe(self, signature, device_type):
+        """Record a sighting; True if the signature was not known before"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            new = signature not in self.known
+            if new:
+                self.known.add(signature)
+            pending = self._pending.get(signature)
+            self._pending[signature] = (device_type, pending[1] if pending else now, now,
+                                        signature in self.whitelist)
+            due = len(self._pending) >= self.batch_size or \
+                time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+        return new
+
+    def add_to_whitelist(self, signature, device_type='unknown'):
+        """Mark a signature as authorised (written with the next batch)"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self.known.add(signature)
+            self.whitelist.add(signature)
+            pending = self._pending.get(signature)
+            self._pending[signature] = (pending[0] if pending else device_type,
+                                        pending[1] if pending else now, now, True)
+
+    def flush(self):
+        """Write the buffered signatures; returns the number written"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending or self.db_path is None:
+            return 0
+        rows = [(format_signature(signature), device_type, first_seen, last_seen, whitelisted)
+                for signature, (device_type, first_seen, last_seen, whitelisted) in pending.items()]
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany('''
+                    INSERT INTO device_signatures (signature, device_type, first_seen, last_seen, is_whitelisted)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (signature) DO UPDATE SET
+                        last_seen = excluded.last_seen,
+                        is_whitelisted = is_whitelisted OR excluded.is_whitelisted
+                ''', rows)
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Device signature save error: {e}")
+            # Keep the batch for the next attempt (newer sightings win)
+            with self._lock:
+                for signature, row in pending.items():
+                    self._pending.setdefault(signature, row)
+            return 0
+        self.batches_written += 1
+        return len(rows)
@@ -17,6 +17,10 @@ import queue
 import json
 from datetime import datetime
 import logging
+from hackrf_spectral import get_frequency_axis
+from hackrf_waterfall import WaterfallPyramid
+from hackrf_mailbox import LatestValueMailbox
+from hackrf_stage_pipeline import StagePipeline, BLOCK, DROP_OLDEST
 
 logger = logging.getLogger(__name__)
 
@@ -33,8 +37,12 @@ class HackRFEnhancedGUI:
         # GUI state
         self.is_scanning = False
         self.current_session = None
-        self.data_queue = queue.Queue()
+        # Spectra are rendered at the display rate: only the newest one is drawn.
+        # Analysis results and threats are all consumed, in order.
+        self.spectrum_mailbox = LatestValueMailbox()
+        self.analysis_queue = queue.Queue()
         self.threat_queue = queue.Queue()
+        self.scan_pipeline = None
         
         # Matplotlib setup
         plt.style.use('dark_background')
@@ -430,9 +438,25 @@ class HackRFEnhancedGUI:
         self.waterfall_canvas.draw()
         self.waterfall_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
-        # Waterfall data storage
-        self.waterfall_data = []
+        # Controls: history span (in sweeps) and how coarser levels are decimated
+        waterfall_controls = ttk.Frame(waterfall_frame)
+        waterfall_controls.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(waterfall_controls, text="History (sweeps):").pack(side=tk.LEFT, padx=2)
+        self.waterfall_span_var = tk.StringVar(value="100")
+        ttk.Combobox(waterfall_controls, textvariable=self.waterfall_span_var, width=8,
+                     values=["100", "200", "400", "800", "1600", "3200", "6400"]).pack(side=tk.LEFT, padx=2)
+        ttk.Label(waterfall_controls, text="Decimation:").pack(side=tk.LEFT, padx=(10, 2))
+        self.waterfall_mode_var = tk.StringVar(value="max")
+        ttk.Combobox(waterfall_controls, textvariable=self.waterfall_mode_var, width=6,
+                     values=["max", "mean"], state="readonly").pack(side=tk.LEFT, padx=2)
+        
+        # Waterfall data storage: 100 rows per level, 7 levels reach back 6400 sweeps
+        self.waterfall_rows = 100
+        self.waterfall_max_bins = 2048
+        self.waterfall_data = WaterfallPyramid(8192, capacity=self.waterfall_rows, levels=7)
         self.waterfall_freqs = None
+        self.waterfall_lock = threading.Lock()
         
     def create_analysis_display(self, notebook):
         """Create analysis results display"""
@@ -487,26 +511,44 @@ class HackRFEnhancedGUI:
     def update_displays(self):
         """Update all displays with latest data"""
         try:
-            # Process data queue
-            while not self.data_queue.empty():
-                data = self.data_queue.get_nowait()
+            # Draw only the newest spectrum; frames published since the last
+            # tick were already added to the waterfall by the scan worker
+            data = self.spectrum_mailbox.take()
+            if data is not None:
                 self.update_spectrum_display(data)
-                self.update_waterfall_display(data)
-                self.update_analysis_display(data)
+                self.update_waterfall_display()
+            
+            # Every analysis result is shown, in one text update per tick
+            results = self.drain_queue(self.analysis_queue)
+            if results:
+                self.update_analysis_display(results)
             
             # Process threat queue
-            while not self.threat_queue.empty():
-                threat = self.threat_queue.get_nowait()
+            for threat in self.drain_queue(self.threat_queue):
                 self.add_security_alert(threat)
-                
-        except queue.Empty:
-            pass
+
+            # Per-stage latency and drops of the running scan
+            if self.is_scanning and self.scan_pipeline is not None and self.scan_pipeline.running:
+                self.status_label.configure(
+                    text=f"Scanning... {self.format_pipeline_stats(self.scan_pipeline.stats())}")
+
         except Exception as e:
             logger.error(f"Display update error: {e}")
         
         # Schedule next update
         self.root.after(self.update_rate_var.get(), self.update_displays)
         
+    @staticmethod
+    def drain_queue(source):
+        """Everything currently in a queue, oldest first"""
+        items = []
+        try:
+            while True:
+                items.append(source.get_nowait())
+        except queue.Empty:
+            pass
+        return items
+        
     def update_spectrum_display(self, spectrum_data):
         """Update spectrum plot"""
         if not spectrum_data:
@@ -536,33 +578,42 @@ class HackRFEnhancedGUI:
         except Exception as e:
             logger.error(f"Spectrum display update error: {e}")
             
-    def update_waterfall_display(self, spectrum_data):
-        """Update waterfall display"""
-        if not spectrum_data:
-            return
-            
-        try:
-            freqs = spectrum_data['frequencies'] / 1e6  # Convert to MHz
-            power = spectrum_data['power']
-            
-            # Store frequency array on first update
-            if self.waterfall_freqs is None:
+    def record_waterfall(self, spectrum_data):
+        """Add a spectrum to the waterfall history (called by the scan worker for every frame)"""
+        freqs = spectrum_data['frequencies'] / 1e6  # Convert to MHz
+        with self.waterfall_lock:
+            # A new FFT size or tuning restarts the history
+            if self.waterfall_freqs is None or len(freqs) != len(self.waterfall_freqs) \
+                    or freqs[0] != self.waterfall_freqs[0]:
                 self.waterfall_freqs = freqs
+                self.waterfall_data.reset(len(freqs))
             
-            # Add new data
-            self.waterfall_data.append(power)
+            # Add new data (every pyramid level is updated incrementally)
+            self.waterfall_data.append(spectrum_data['power'])
             
-            # Keep only recent data (last 100 sweeps)
-            if len(self.waterfall_data) > 100:
-                self.waterfall_data.pop(0)
+    def update_waterfall_display(self):
+        """Update waterfall display"""
+        try:
+            try:
+                span = max(1, int(self.waterfall_span_var.get()))
+            except ValueError:
+                span = self.waterfall_rows
             
-            # Update waterfall plot
-            if len(self.waterfall_data) > 1:
-                waterfall_array = np.array(self.waterfall_data)
-                
+            # Update waterfall plot from the finest level that fits the requested
+            # span into the display rows and bins
+            with self.waterfall_lock:
+                if self.waterfall_freqs is None:
+                    return
+                span = min(span, self.waterfall_data.rows_appended)
+                level, waterfall_array = self.waterfall_data.view_span(
+                    span, self.waterfall_rows, self.waterfall_max_bins, self.waterfall_mode_var.get())
+                waterfall_array = waterfall_array.copy()
+                level_freqs = self.waterfall_data.frequencies(self.waterfall_freqs, level)
+            
+            if len(waterfall_array) > 1:
                 self.waterfall_ax.clear()
                 im = self.waterfall_ax.imshow(waterfall_array, aspect='auto', 
-                                            extent=[freqs[0], freqs[-1], 0, len(self.waterfall_data)],
+                                            extent=[level_freqs[0], level_freqs[-1], 0, span],
                                             cmap='plasma', origin='lower')
                 
                 self.waterfall_ax.set_xlabel('Frequency (MHz)', color='white')
@@ -574,40 +625,47 @@ class HackRFEnhancedGUI:
         except Exception as e:
             logger.error(f"Waterfall display update error: {e}")
             
+    def format_analysis(self, analysis_data, timestamp):
+        """Text block for one analysis result"""
+        text = f"[{timestamp}] Analysis Results:\n"
+        
+        if 'classification' in analysis_data:
+            text += "Signal Classification:\n"
+            for classification in analysis_data['classification']:
+                text += f"  - {classification['type']}: {classification['confidence']:.2f}\n"
+        
+        if 'anomalies' in analysis_data:
+            text += "Anomalies Detected:\n"
+            for anomaly in analysis_data['anomalies']:
+                text += f"  - {anomaly['type']}: {anomaly['description']}\n"
+        
+        if 'patterns' in analysis_data:
+            text += "Patterns Recognized:\n"
+            for pattern in analysis_data['patterns']:
+                text += f"  - {pattern['pattern']}: {pattern['confidence']:.2f}\n"
+        
+        return text + "\n" + "="*50 + "\n\n"
+        
     def update_analysis_display(self, analysis_data):
-        """Update analysis text display"""
+        """Update analysis text display with one result or a list of results (oldest first)"""
         if not analysis_data:
             return
+        if isinstance(analysis_data, dict):
+            analysis_data = [analysis_data]
             
         try:
-            # Format analysis results
+            # Format analysis results, newest on top
             timestamp = datetime.now().strftime("%H:%M:%S")
-            text = f"[{timestamp}] Analysis Results:\n"
-            
-            if 'classification' in analysis_data:
-                text += "Signal Classification:\n"
-                for classification in analysis_data['classification']:
-                    text += f"  - {classification['type']}: {classification['confidence']:.2f}\n"
-            
-            if 'anomalies' in analysis_data:
-                text += "Anomalies Detected:\n"
-                for anomaly in analysis_data['anomalies']:
-                    text += f"  - {anomaly['type']}: {anomaly['description']}\n"
-            
-            if 'patterns' in analysis_data:
-                text += "Patterns Recognized:\n"
-                for pattern in analysis_data['patterns']:
-                    text += f"  - {pattern['pattern']}: {pattern['confidence']:.2f}\n"
-            
-            text += "\n" + "="*50 + "\n\n"
+            text = ''.join(self.format_analysis(result, timestamp)
+                           for result in reversed(analysis_data) if result)
             
             # Insert at beginning
             self.analysis_text.insert(1.0, text)
             
             # Limit text length
-            lines = self.analysis_text.get(1.0, tk.END).split('\n')
-            if len(lines) > 1000:
-                self.analysis_text.delete(f"{len(lines)-500}.0", tk.END)
+            lines = int(self.analysis_text.index('end-1c').split('.')[0])
+            if lines > 1000:
+                self.analysis_text.delete(f"{lines-500}.0", tk.END)
                 
         except Exception as e:
             logger.error(f"Analysis display update error: {e}")
@@ -720,54 +778,120 @@ class HackRFEnhancedGUI:
         self.status_label.configure(text="Scan stopped")
         
     def scan_worker(self):
-        """Background scanning worker"""
+        """Background capture loop feeding the processing pipeline.
+        
+        Capture only paces and produces frames; peak detection, AI,
+        security analysis and persistence run as pipeline stages on their
+        own threads, so the scan rate is set by the slowest stage instead
+        of the sum of all of them.
+        """
+        pipeline = self.build_scan_pipeline()
+        self.scan_pipeline = pipeline.start()
         try:
             center_freq = float(self.center_freq_var.get()) * 1e6
             sample_rate = float(self.sample_rate_var.get()) * 1e6
+            interval = 0.1  # 10 Hz update rate
+            next_frame = time.perf_counter()
             
             while self.is_scanning:
                 # Simulate spectrum data (replace with actual HackRF capture)
                 spectrum_data = self.simulate_spectrum_data(center_freq, sample_rate)
                 
                 if spectrum_data:
-                    # AI analysis
-                    if self.ai_enabled_var.get():
-                        ai_analysis = self.platform.signal_processor.process_signal(spectrum_data)
-                    else:
-                        ai_analysis = None
-                    
-                    # Security analysis
-                    security_report = self.platform.security_engine.analyze_security(spectrum_data, ai_analysis)
-                    
-                    # Queue data for GUI update
-                    self.data_queue.put(spectrum_data)
-                    
-                    if ai_analysis:
-                        self.data_queue.put(ai_analysis)
-                    
-                    # Queue threats
-                    for threat in security_report.get('threats', []):
-                        self.threat_queue.put(threat)
-                    
-                    # Save to database
-                    if self.auto_save_var.get() and self.current_session:
-                        self.platform.database.save_spectrum_data(self.current_session, spectrum_data)
-                        
-                        for threat in security_report.get('threats', []):
-                            self.platform.database.save_threat(self.current_session, threat)
+                    # Tk variables are read here, not in the stage threads
+                    pipeline.submit({
+                        'spectrum': spectrum_data,
+                        'ai_enabled': self.ai_enabled_var.get(),
+                        'save': bool(self.auto_save_var.get() and self.current_session),
+                        'session': self.current_session
+                    })
                 
-                time.sleep(0.1)  # 10 Hz update rate
+                # Pace on a deadline so processing time is not added to the interval
+                next_frame += interval
+                delay = next_frame - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_frame = time.perf_counter()
                 
         except Exception as e:
             logger.error(f"Scan worker error: {e}")
             self.is_scanning = False
+        finally:
+            if not pipeline.stop():
+                logger.warning("Scan pipeline did not drain before the stop timeout")
+            logger.info(f"Scan pipeline: {self.format_pipeline_stats(pipeline.stats())}")
+            
+    def build_scan_pipeline(self):
+        """Stages: spectrum -> ai -> security -> persistence.
+        
+        Only the first stage sheds load (oldest frame first), so a slow
+        stage back-pressures upstream and a backlog turns into dropped
+        frames at the entry, never into unbounded queues. Persistence gets
+        a deep queue to ride out database stalls.
+        """
+        pipeline = StagePipeline('scan', on_error=lambda stage, e: logger.error(f"Scan {stage} stage error: {e}"))
+        pipeline.add_stage('spectrum', self.spectrum_stage, maxsize=4, policy=DROP_OLDEST)
+        pipeline.add_stage('ai', self.ai_stage, maxsize=8, policy=BLOCK)
+        pipeline.add_stage('security', self.security_stage, maxsize=8, policy=BLOCK)
+        pipeline.add_stage('persistence', self.persistence_stage, maxsize=256, policy=BLOCK)
+        return pipeline
+        
+    def spectrum_stage(self, job):
+        """Detect peaks and hand the frame to the displays"""
+        spectrum_data = job['spectrum']
+        spectrum_data['peaks'] = self.platform.spectrum_analyzer.detect_peaks(spectrum_data['power'])
+        
+        # The waterfall keeps every frame, the spectrum plot only draws the newest one
+        self.record_waterfall(spectrum_data)
+        self.spectrum_mailbox.put(spectrum_data)
+        return job
+        
+    def ai_stage(self, job):
+        """AI signal analysis (when enabled)"""
+        if job['ai_enabled']:
+            job['analysis'] = self.platform.signal_processor.process_signal(job['spectrum'])
+            if job['analysis']:
+                self.analysis_queue.put(job['analysis'])
+        else:
+            job['analysis'] = None
+        return job
+        
+    def security_stage(self, job):
+        """Security analysis; threats go to the alert display"""
+        security_report = self.platform.security_engine.analyze_security(job['spectrum'], job['analysis'])
+        job['threats'] = security_report.get('threats', [])
+        for threat in job['threats']:
+            self.threat_queue.put(threat)
+        return job if job['save'] else None
+        
+    def persistence_stage(self, job):
+        """Save the frame and its threats to the database"""
+        self.platform.database.save_spectrum_data(job['session'], job['spectrum'])
+        for threat in job['threats']:
+            self.platform.database.save_threat(job['session'], threat)
+        return None
+        
+    @staticmethod
+    def format_pipeline_stats(stats):
+        """One-line summary of StagePipeline.stats()"""
+        parts = []
+        for name, stage in stats['stages'].items():
+            latency = stage['latency_ms']
+            parts.append(f"{name} {latency:.1f} ms" if latency is not None else f"{name} -")
+            if stage['dropped']:
+                parts[-1] += f" ({stage['dropped']} dropped)"
+        summary = f"{stats['throughput']:.1f} fps; " + ", ".join(parts)
+        if stats['bottleneck']:
+            summary += f"; bottleneck: {stats['bottleneck']}"
+        return summary
             
     def simulate_spectrum_data(self, center_freq, sample_rate):
         """Simulate spectrum data for testing"""
         try:
             # Generate simulated spectrum
             num_points = int(self.fft_size_var.get())
-            freqs = np.linspace(center_freq - sample_rate/2, center_freq + sample_rate/2, num_points)
+            freqs = get_frequency_axis(center_freq, sample_rate, num_points)
             
             # Base noise floor
             noise_floor = -90 + np.random.normal(0, 5, num_points)
@@ -783,18 +907,11 @@ class HackRFEnhancedGUI:
             
             power = noise_floor
             
-            # Detect peaks
-            peaks = []
-            for i in range(10, num_points-10):
-                if (power[i] > -60 and 
-                    power[i] > power[i-1] and 
-                    power[i] > power[i+1]):
-                    peaks.append((i, power[i]))
-            
+            # Peaks are detected by the pipeline's spectrum stage
             return {
                 'frequencies': freqs,
                 'power': power,
-                'peaks': peaks,
+                'peaks': [],
                 'timestamp': time.time(),
                 'center_freq': center_freq,
                 'sample_rate': sample_rate
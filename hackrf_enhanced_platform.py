@@ -12,7 +12,6 @@ import time
 import threading
 import subprocess
 import logging
-import hashlib
 import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -25,6 +24,14 @@ from collections import defaultdict, deque
 import requests
 import queue
 import signal
+from hackrf_spectral import get_spectral_context
+from hackrf_spectrum_writer import SpectrumWriter, ensure_spectrum_schema, decode_frame
+from hackrf_spectrum_archive import SpectrumArchive
+from hackrf_waterfall import WaterfallPyramid
+from hackrf_peaks import find_spectral_peaks
+from hackrf_spectrum_stats import SpectrumStatistics
+from hackrf_temporal import TemporalPatternEngine
+from hackrf_device_index import DeviceSignatureIndex, device_signature, format_signature
 
 # Configure logging
 logging.basicConfig(
@@ -42,12 +49,19 @@ class HackRFEnhancedPlatform:
     
     def __init__(self):
         self.version = "2.0.0"
+        
+        # Configuration
+        self.config = self.load_configuration()
+        
         self.device_manager = HackRFDeviceManager()
         self.spectrum_analyzer = EnhancedSpectrumAnalyzer()
-        self.signal_processor = AISignalProcessor()
-        self.security_engine = AdvancedSecurityEngine()
+        # One set of per-bin statistics, updated once per frame, read by every detector
+        self.spectrum_statistics = SpectrumStatistics()
+        self.database = HackRFDatabase(archive_dir=self.config.get('storage', {}).get('spectrum_archive'))
+        self.signal_processor = AISignalProcessor(self.spectrum_statistics)
+        # Known devices are loaded from, and saved to, the database
+        self.security_engine = AdvancedSecurityEngine(self.spectrum_statistics, self.database.device_index)
         self.protocol_analyzer = ProtocolAnalyzer()
-        self.database = HackRFDatabase()
         self.session_manager = SessionManager()
         
         # Platform state
@@ -56,9 +70,6 @@ class HackRFEnhancedPlatform:
         self.real_time_data = deque(maxlen=10000)
         self.analysis_queue = queue.Queue()
         
-        # Configuration
-        self.config = self.load_configuration()
-        
         logger.info(f"HackRF Enhanced Platform v{self.version} initialized")
     
     def load_configuration(self):
@@ -93,6 +104,9 @@ class HackRFEnhancedPlatform:
                 'theme': 'dark',
                 'update_interval': 100,
                 'max_plot_points': 1000
+            },
+            'storage': {
+                'spectrum_archive': 'hackrf_spectrum_archive'  # queryable frame history (None disables)
             }
         }
         
@@ -191,7 +205,9 @@ class EnhancedSpectrumAnalyzer:
         self.window = 'hann'
         self.averaging = 10
         self.peak_detection = True
-        self.waterfall_data = deque(maxlen=1000)
+        # 1000 full-resolution lines plus max/mean levels reaching 32x further
+        # back; half precision keeps it near the size of the old line deque
+        self.waterfall_data = WaterfallPyramid(self.fft_size, capacity=1000, dtype=np.float16)
         
     def analyze_spectrum(self, data, sample_rate, center_freq):
         """Perform enhanced spectrum analysis"""
@@ -202,19 +218,21 @@ class EnhancedSpectrumAnalyzer:
                 data = (data - 127.5) / 127.5
                 data = data[::2] + 1j * data[1::2]
             
-            # Windowing
-            window = np.hanning(len(data))
-            windowed_data = data * window
+            # Window, plan and frequency bins are cached per configuration
+            context = get_spectral_context(self.fft_size, self.window, sample_rate, center_freq)
+            segment = data[:self.fft_size]
             
-            # FFT
-            fft_data = np.fft.fftshift(np.fft.fft(windowed_data, self.fft_size))
+            # FFT - an even-length shifted window lands DC in the centre without fftshift
+            if self.fft_size % 2 == 0:
+                fft_data = context.fft(segment * context.window_for(len(segment)))
+            else:
+                fft_data = np.fft.fftshift(context.fft(segment * context.window_for(len(segment), shifted=False)))
             
             # Power spectrum
             power_spectrum = 20 * np.log10(np.abs(fft_data) + 1e-12)
             
-            # Frequency bins
-            freqs = np.fft.fftshift(np.fft.fftfreq(self.fft_size, 1/sample_rate))
-            freqs += center_freq
+            # Frequency bins (read-only, shared between calls)
+            freqs = context.frequencies
             
             # Peak detection
             peaks = self.detect_peaks(power_spectrum) if self.peak_detection else []
@@ -235,39 +253,28 @@ class EnhancedSpectrumAnalyzer:
             logger.error(f"Spectrum analysis error: {e}")
             return None
     
-    def detect_peaks(self, power_spectrum, threshold=-60, min_distance=10):
-        """Detect spectral peaks"""
-        peaks = []
+    def detect_peaks(self, power_spectrum, threshold=-60, min_distance=10, snr_db=10.0, prominence=6.0):
+        """Detect spectral peaks as (bin index, power) pairs.
         
+        Peaks must clear both `threshold` and the running-median noise floor
+        plus snr_db; see hackrf_peaks.find_spectral_peaks.
+        """
         try:
-            # Simple peak detection
-            for i in range(min_distance, len(power_spectrum) - min_distance):
-                if (power_spectrum[i] > threshold and
-                    power_spectrum[i] > power_spectrum[i-1] and
-                    power_spectrum[i] > power_spectrum[i+1]):
-                    
-                    # Check minimum distance
-                    too_close = False
-                    for peak_idx, _ in peaks:
-                        if abs(i - peak_idx) < min_distance:
-                            too_close = True
-                            break
-                    
-                    if not too_close:
-                        peaks.append((i, power_spectrum[i]))
-            
+            found = find_spectral_peaks(power_spectrum, threshold=threshold, snr_db=snr_db,
+                                        prominence=prominence, distance=min_distance)
+            return list(zip(found['indices'].tolist(), found['power'].tolist()))
         except Exception as e:
             logger.error(f"Peak detection error: {e}")
-        
-        return peaks
+            return []
 
 class AISignalProcessor:
     """AI-enhanced signal processing and analysis"""
     
-    def __init__(self):
+    def __init__(self, statistics=None):
+        self.statistics = statistics if statistics is not None else SpectrumStatistics()
         self.signal_classifier = SignalClassifier()
-        self.anomaly_detector = AnomalyDetector()
-        self.pattern_recognizer = PatternRecognizer()
+        self.anomaly_detector = AnomalyDetector(self.statistics)
+        self.pattern_recognizer = PatternRecognizer(self.statistics)
         
     def process_signal(self, spectrum_data):
         """Process signal with AI enhancement"""
@@ -291,31 +298,30 @@ class AISignalProcessor:
     
     def compute_statistics(self, spectrum_data):
         """Compute spectral statistics"""
-        power = spectrum_data['power']
+        frame = self.statistics.observe(spectrum_data)
         return {
-            'mean_power': np.mean(power),
-            'max_power': np.max(power),
-            'min_power': np.min(power),
-            'std_power': np.std(power),
-            'bandwidth': self.estimate_bandwidth(power),
+            'mean_power': frame['mean'],
+            'max_power': frame['max'],
+            'min_power': frame['min'],
+            'std_power': frame['std'],
+            'noise_floor': float(np.median(self.statistics.noise_floor)),
+            'occupancy': float(self.statistics.occupancy.mean()),
+            'bandwidth': self.estimate_bandwidth(spectrum_data['power']),
             'spectral_centroid': self.compute_spectral_centroid(spectrum_data)
         }
     
     def estimate_bandwidth(self, power, threshold=-70):
         """Estimate signal bandwidth"""
-        above_threshold = power > threshold
-        if np.any(above_threshold):
-            indices = np.where(above_threshold)[0]
-            return len(indices)
-        return 0
+        return self.statistics.frame_statistics(power).bins_above(threshold)
     
     def compute_spectral_centroid(self, spectrum_data):
         """Compute spectral centroid"""
         freqs = spectrum_data['frequencies']
-        power = 10**(spectrum_data['power']/10)  # Convert from dB
+        power = self.statistics.observe(spectrum_data).linear_power()  # Converted from dB once per frame
         
-        if np.sum(power) > 0:
-            centroid = np.sum(freqs * power) / np.sum(power)
+        total = np.sum(power)
+        if total > 0:
+            centroid = np.dot(freqs, power) / total
             return centroid
         return 0
 
@@ -392,20 +398,17 @@ class SignalClassifier:
 class AnomalyDetector:
     """Detect anomalous signals"""
     
-    def __init__(self):
+    def __init__(self, statistics=None):
         self.baseline_power = -70  # dBm
         self.power_threshold = 20  # dB above baseline
-        self.history = deque(maxlen=100)
+        # Frame peak history (last 100 frames) is kept by the statistics engine
+        self.statistics = statistics if statistics is not None else SpectrumStatistics()
         
     def detect(self, spectrum_data):
         """Detect anomalies in spectrum data"""
         anomalies = []
         
-        power = spectrum_data['power']
-        max_power = np.max(power)
-        
-        # Store in history
-        self.history.append(max_power)
+        max_power = self.statistics.observe(spectrum_data)['max']
         
         # Power anomaly detection
         if max_power > self.baseline_power + self.power_threshold:
@@ -428,9 +431,10 @@ class AnomalyDetector:
             })
         
         # Sudden power changes
-        if len(self.history) > 10:
-            recent_avg = np.mean(list(self.history)[-10:])
-            older_avg = np.mean(list(self.history)[-20:-10]) if len(self.history) > 20 else recent_avg
+        history = self.statistics.peak_history_length()
+        if history > 10:
+            recent_avg = self.statistics.recent_peak_mean(10)
+            older_avg = self.statistics.recent_peak_mean(10, skip=10) if history > 20 else recent_avg
             
             if abs(recent_avg - older_avg) > 15:  # 15 dB change
                 anomalies.append({
@@ -459,7 +463,10 @@ class AnomalyDetector:
 class PatternRecognizer:
     """Recognize signal patterns"""
     
-    def __init__(self):
+    def __init__(self, statistics=None):
+        self.statistics = statistics if statistics is not None else SpectrumStatistics()
+        # Sliding window of recent frames for the time-domain patterns
+        self.temporal = TemporalPatternEngine(statistics=self.statistics)
         self.patterns = {
             'burst': self.detect_burst_pattern,
             'continuous': self.detect_continuous_pattern,
@@ -487,9 +494,9 @@ class PatternRecognizer:
     
     def detect_burst_pattern(self, spectrum_data):
         """Detect burst transmission patterns"""
-        power = spectrum_data['power']
-        max_power = np.max(power)
-        mean_power = np.mean(power)
+        frame = self.statistics.observe(spectrum_data)
+        max_power = frame['max']
+        mean_power = frame['mean']
         
         if max_power - mean_power > 20:  # 20 dB above average
             return {
@@ -502,8 +509,7 @@ class PatternRecognizer:
     
     def detect_continuous_pattern(self, spectrum_data):
         """Detect continuous transmission patterns"""
-        power = spectrum_data['power']
-        std_power = np.std(power)
+        std_power = self.statistics.observe(spectrum_data)['std']
         
         if std_power < 5:  # Low variation indicates continuous signal
             return {
@@ -515,23 +521,24 @@ class PatternRecognizer:
     
     def detect_periodic_pattern(self, spectrum_data):
         """Detect periodic patterns"""
-        # This would analyze temporal patterns across multiple spectrum captures
-        # For now, return a placeholder
-        return None
+        # Autocorrelation of each band's on/off history over recent frames
+        self.temporal.update(spectrum_data)
+        return self.temporal.periodicity()
     
     def detect_fh_pattern(self, spectrum_data):
         """Detect frequency hopping patterns"""
-        # This would analyze frequency changes over time
-        # For now, return a placeholder
-        return None
+        # Strongest carriers linked frame to frame; unlinked appearances are hops
+        self.temporal.update(spectrum_data)
+        return self.temporal.hopping()
 
 class AdvancedSecurityEngine:
     """Advanced security analysis and threat detection"""
     
-    def __init__(self):
+    def __init__(self, statistics=None, device_index=None):
+        self.statistics = statistics if statistics is not None else SpectrumStatistics()
         self.threat_database = ThreatDatabase()
-        self.rogue_detector = RogueDeviceDetector()
-        self.jamming_detector = JammingDetector()
+        self.rogue_detector = RogueDeviceDetector(self.statistics, device_index)
+        self.jamming_detector = JammingDetector(self.statistics)
         
     def analyze_security(self, spectrum_data, ai_analysis):
         """Perform comprehensive security analysis"""
@@ -619,9 +626,13 @@ class ThreatDatabase:
 class RogueDeviceDetector:
     """Detect rogue/unauthorized devices"""
     
-    def __init__(self):
-        self.known_devices = set()
-        self.whitelist = set()
+    def __init__(self, statistics=None, device_index=None, occupied_margin_db=10.0):
+        self.statistics = statistics if statistics is not None else SpectrumStatistics()
+        # Known and whitelisted signatures, persisted when the index has a database
+        self.device_index = device_index if device_index is not None else DeviceSignatureIndex()
+        self.known_devices = self.device_index.known
+        self.whitelist = self.device_index.whitelist
+        self.occupied_margin_db = occupied_margin_db
         
     def detect(self, spectrum_data, ai_analysis):
         """Detect rogue devices"""
@@ -629,58 +640,68 @@ class RogueDeviceDetector:
         
         # Analyze AI classification results
         if ai_analysis and 'classification' in ai_analysis:
+            frame = None
             for classification in ai_analysis['classification']:
                 if classification['confidence'] > 0.8:
-                    device_signature = self.generate_device_signature(spectrum_data, classification)
+                    if frame is None:
+                        frame = self.observe_frame(spectrum_data)
+                    signature = self.generate_device_signature(spectrum_data, classification, frame)
                     
-                    if device_signature not in self.known_devices and device_signature not in self.whitelist:
+                    if self.device_index.is_whitelisted(signature):
+                        continue
+                    # Known devices only refresh their last-seen time
+                    if self.device_index.observe(signature, classification['type']):
                         rogue_devices.append({
                             'type': 'unknown_device',
                             'severity': 'medium',
                             'device_type': classification['type'],
                             'confidence': classification['confidence'],
-                            'signature': device_signature[:16],  # Truncated for display
+                            'signature': format_signature(signature),
                             'description': f"Unknown {classification['type']} device detected"
                         })
-                        
-                        # Add to known devices
-                        self.known_devices.add(device_signature)
         
         return rogue_devices
     
-    def generate_device_signature(self, spectrum_data, classification):
-        """Generate unique device signature"""
-        signature_data = {
-            'frequency': spectrum_data['center_freq'],
-            'type': classification['type'],
-            'power_profile': np.mean(spectrum_data['power'])
+    def observe_frame(self, spectrum_data):
+        """Mean power and occupied bandwidth of a frame (shared by its classifications)"""
+        frame = self.statistics.observe(spectrum_data)
+        occupied = frame.bins_above(frame['mean'] + self.occupied_margin_db)
+        return {
+            'power': frame['mean'],
+            'bandwidth': occupied * spectrum_data['sample_rate'] / max(1, frame.num_bins)
         }
-        
-        signature_str = json.dumps(signature_data, sort_keys=True)
-        return hashlib.md5(signature_str.encode()).hexdigest()
+    
+    def generate_device_signature(self, spectrum_data, classification, frame=None):
+        """Generate a 64-bit device signature (see hackrf_device_index.device_signature)"""
+        if frame is None:
+            frame = self.observe_frame(spectrum_data)
+        return device_signature(classification['type'], spectrum_data['center_freq'],
+                                frame['bandwidth'], frame['power'])
 
 class JammingDetector:
     """Detect jamming attempts"""
     
-    def __init__(self):
+    def __init__(self, statistics=None):
         self.baseline_noise = -100  # dBm
         self.jamming_threshold = 20  # dB above baseline
+        self.statistics = statistics if statistics is not None else SpectrumStatistics()
         
     def detect(self, spectrum_data):
         """Detect jamming signals"""
         jamming_threats = []
         
-        power = spectrum_data['power']
-        max_power = np.max(power)
-        power_bandwidth = np.sum(power > self.baseline_noise + 10)
+        frame = self.statistics.observe(spectrum_data)
+        max_power = frame['max']
+        power_bandwidth = frame.bins_above(self.baseline_noise + 10)
         
         # Wideband jamming detection
-        if power_bandwidth > len(power) * 0.8:  # 80% of spectrum active
+        if power_bandwidth > frame.num_bins * 0.8:  # 80% of spectrum active
             jamming_threats.append({
                 'type': 'wideband_jamming',
                 'severity': 'high',
                 'bandwidth_affected': power_bandwidth,
                 'max_power': max_power,
+                'occupancy': float(self.statistics.occupancy.mean()),
                 'description': 'Potential wideband jamming detected'
             })
         
@@ -802,9 +823,15 @@ class CellularDecoder:
 class HackRFDatabase:
     """Database for storing analysis results and configurations"""
     
-    def __init__(self, db_path='hackrf_platform.db'):
+    def __init__(self, db_path='hackrf_platform.db', spectrum_encoding='float16', archive_dir=None):
         self.db_path = db_path
         self.init_database()
+        # Spectrum frames go through one batching writer thread
+        self.spectrum_writer = SpectrumWriter(db_path, encoding=spectrum_encoding)
+        # Optional columnar history for time/frequency/power queries
+        self.spectrum_archive = SpectrumArchive(archive_dir) if archive_dir else None
+        # Known/whitelisted device signatures, written back in batches
+        self.device_index = DeviceSignatureIndex(db_path)
     
     def init_database(self):
         """Initialize database schema"""
@@ -857,6 +884,9 @@ class HackRFDatabase:
                     )
                 ''')
                 
+                # Binary spectrum rows and per-session frequency axes
+                ensure_spectrum_schema(conn)
+                
                 conn.commit()
                 
         except Exception as e:
@@ -880,34 +910,51 @@ class HackRFDatabase:
             return None
     
     def save_spectrum_data(self, session_id, spectrum_data):
-        """Save spectrum analysis data"""
+        """Save spectrum analysis data (queued; written in batches)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Serialize spectrum data
-                data_blob = json.dumps({
-                    'frequencies': spectrum_data['frequencies'].tolist(),
-                    'power': spectrum_data['power'].tolist(),
-                    'peaks': spectrum_data.get('peaks', [])
-                }).encode()
-                
-                conn.execute('''
-                    INSERT INTO spectrum_data 
-                    (session_id, timestamp, center_freq, sample_rate, max_power, data_blob)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    session_id,
-                    datetime.now().isoformat(),
-                    spectrum_data['center_freq'],
-                    spectrum_data['sample_rate'],
-                    np.max(spectrum_data['power']),
-                    data_blob
-                ))
-                
-                conn.commit()
-                
+            self.spectrum_writer.save(session_id, spectrum_data)
+            if self.spectrum_archive is not None:
+                self.spectrum_archive.append(session_id, spectrum_data)
         except Exception as e:
             logger.error(f"Spectrum data save error: {e}")
     
+    def flush(self, timeout=None):
+        """Wait until queued spectrum frames are committed and archived"""
+        if self.spectrum_archive is not None:
+            self.spectrum_archive.flush()
+        self.device_index.flush()
+        return self.spectrum_writer.flush(timeout)
+    
+    def close(self):
+        """Commit queued spectrum frames and stop the writer"""
+        if self.spectrum_archive is not None:
+            self.spectrum_archive.close()
+        self.device_index.flush()
+        self.spectrum_writer.close()
+    
+    def query_spectrum(self, freq_range=None, time_range=None, min_power=None, session_id=None):
+        """Historical frames from the spectrum archive (see SpectrumArchive.query)"""
+        if self.spectrum_archive is None:
+            return []
+        return self.spectrum_archive.query(freq_range, time_range, min_power, session_id)
+    
+    def load_spectrum_data(self, session_id, limit=None):
+        """Spectrum frames of a session in time order (binary and legacy JSON rows)"""
+        self.spectrum_writer.flush()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute('''
+                    SELECT d.timestamp, d.center_freq, d.sample_rate, d.max_power, d.data_blob,
+                           d.encoding, d.peaks, a.num_points, a.start_freq, a.stop_freq
+                    FROM spectrum_data d LEFT JOIN spectrum_axes a ON a.id = d.axis_id
+                    WHERE d.session_id = ? ORDER BY d.timestamp, d.id LIMIT ?
+                ''', (session_id, -1 if limit is None else limit)).fetchall()
+            return [decode_frame(row) for row in rows]
+            
+        except Exception as e:
+            logger.error(f"Spectrum data load error: {e}")
+            return []
+    
     def save_threat(self, session_id, threat):
         """Save detected threat"""
         try:
@@ -948,6 +995,7 @@ class SessionManager:
         """End current session"""
         if self.current_session and self.session_start_time:
             duration = int(time.time() - self.session_start_time)
+            database.flush()
             
             try:
                 with sqlite3.connect(database.db_path) as conn:
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+HackRF FFT Pipeline - Multi-core spectrum estimation for wideband capture
+Capture stage frames blocks and carries the overlap tail, a pool of FFT
+workers turns each block into a Welch PSD, and an ordered reassembly stage
+hands results on in capture order
+"""
+
+import os
+import queue
+import logging
+import threading
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import fft as sp_fft
+from hackrf_spectral import get_window
+
+logger = logging.getLogger(__name__)
+
+# Default FFT worker count; pocketfft and the NumPy ufuncs release the GIL,
+# so worker threads run on separate cores
+DEFAULT_WORKERS = int(os.environ.get('HACKRF_FFT_PIPELINE_WORKERS', 0)) or os.cpu_count() or 1
+
+class ParallelFFTPipeline:
+    """capture -> parallel FFT workers -> ordered reassembly.
+
+    submit() is called from the capture thread. Each block is framed with
+    the unconsumed tail of the previous one, so the frame sequence is the
+    same as a single-threaded WelchSpectrumEngine, then transformed on a
+    worker. Results are delivered strictly in submission order, either to
+    `on_result(seq, psd, frames)` or through `results()`, by one emitter
+    thread: on_result never runs on the capture (submitting) thread, and a
+    slow on_result holds the in-flight slots and so backpressures submit().
+
+    Blocks are not copied: a ring-buffer view is fine as long as the ring
+    holds more than `max_inflight` blocks.
+    """
+
+    def __init__(self, fft_size=1024, overlap=0.5, window='hann', workers=None,
+                 max_inflight=None, shifted=True, on_result=None):
+        self.fft_size = int(fft_size)
+        self.step = max(1, int(round(self.fft_size * (1 - overlap))))
+        self.shifted = shifted and self.fft_size % 2 == 0
+        self.window = get_window(window, self.fft_size, self.shifted)
+        self.scale = 1.0 / float(np.sum(get_window(window, self.fft_size)) ** 2)
+        self.workers = max(1, int(workers or DEFAULT_WORKERS))
+        self.max_inflight = int(max_inflight or 2 * self.workers)
+        self.on_result = on_result
+
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='fft-worker')
+        self._slots = threading.BoundedSemaphore(self.max_inflight)
+        self._tail = np.zeros(0, dtype=np.complex64)
+        self._next_submit = 0
+        self._local = threading.local()
+
+        # Reassembly state: workers hand (seq, psd, frames) to the emitter
+        self._completed = queue.Queue()
+        self._reorder = {}
+        self._next_emit = 0
+        self._results = queue.Queue()
+        self._emitter = threading.Thread(target=self._reassemble, name='fft-emitter', daemon=True)
+        self._emitter.start()
+
+        self.blocks_submitted = 0
+        self.blocks_dropped = 0
+        self.frames_processed = 0
+        self.closed = False
+
+    def submit(self, samples, block=True, timeout=None):
+        """Queue one block; returns its sequence number, or None if dropped.
+
+        With block=False a full pipeline drops the block instead of stalling
+        the capture thread; framing then restarts at the next block, so no
+        frame spans the gap.
+        """
+        if self.closed:
+            raise ValueError("Pipeline is closed")
+        if not self._slots.acquire(blocking=block, timeout=timeout if block else None):
+            self.blocks_dropped += 1
+            self._tail = np.zeros(0, dtype=np.complex64)
+            return None
+
+        # Capture stage: work out which frames this block completes and
+        # keep the remainder for the next one
+        tail = self._tail
+        total = len(tail) + len(samples)
+        n_frames = (total - self.fft_size) // self.step + 1 if total >= self.fft_size else 0
+        consumed = n_frames * self.step
+        if consumed >= len(tail):
+            self._tail = np.array(samples[consumed - len(tail):], dtype=np.complex64)
+        else:
+            self._tail = np.concatenate((tail[consumed:], samples))
+
+        seq = self._next_submit
+        self._next_submit += 1
+        self.blocks_submitted += 1
+        self._executor.submit(self._run, seq, tail, samples, n_frames)
+        return seq
+
+    def _run(self, seq, tail, samples, n_frames):
+        """Worker task: transform, then hand the result to the emitter"""
+        try:
+            psd, frames = self._transform(tail, samples, n_frames)
+        except Exception as e:
+            psd, frames = e, 0
+        self._completed.put((seq, psd, frames))
+
+    def _transform(self, tail, samples, n_frames):
+        """FFT stage: averaged linear PSD of every frame completed by the block"""
+        if n_frames == 0:
+            return None, 0
+        workspace = self._workspace(len(tail) + len(samples), n_frames)
+        if len(tail):
+            data = workspace.data[:len(tail) + len(samples)]
+            data[:len(tail)] = tail
+            data[len(tail):] = samples
+        else:
+            data = samples
+        frames = sliding_window_view(data, self.fft_size)[::self.step][:n_frames]
+        windowed = workspace.windowed[:n_frames]
+        np.multiply(frames, self.window, out=windowed)
+        spectra = sp_fft.fft(windowed, axis=-1, overwrite_x=True, workers=1)
+        power = np.abs(spectra, out=workspace.power[:n_frames])
+        np.square(power, out=power)
+        return power.mean(axis=0, dtype=np.float64) * self.scale, n_frames
+
+    def _workspace(self, total, n_frames):
+        """Per-worker scratch buffers, grown on demand and reused across blocks"""
+        workspace = getattr(self._local, 'workspace', None)
+        if workspace is None:
+            workspace = self._local.workspace = SimpleNamespace()
+            workspace.data = np.zeros(0, dtype=np.complex64)
+            workspace.windowed = np.zeros((0, self.fft_size), dtype=np.complex64)
+            workspace.power = np.zeros((0, self.fft_size), dtype=np.float32)
+        if len(workspace.data) < total:
+            workspace.data = np.zeros(total, dtype=np.complex64)
+        if len(workspace.windowed) < n_frames:
+            workspace.windowed = np.zeros((n_frames, self.fft_size), dtype=np.complex64)
+            workspace.power = np.zeros((n_frames, self.fft_size), dtype=np.float32)
+        return workspace
+
+    def _reassemble(self):
+        """Reassembly stage (emitter thread): release results in capture order.
+
+        The in-flight slot is only freed once the result has been handed on,
+        so a slow consumer applies backpressure to submit(). Exits once the
+        pipeline is closed and every submitted block has been emitted.
+        """
+        while True:
+            item = self._completed.get()
+            if item is not None:
+                seq, psd, frames = item
+                self._reorder[seq] = (psd, frames)
+            while self._next_emit in self._reorder:
+                ready_seq = self._next_emit
+                psd, frames = self._reorder.pop(ready_seq)
+                self._next_emit += 1
+                self.frames_processed += frames
+                try:
+                    if self.on_result is not None:
+                        self.on_result(ready_seq, psd, frames)
+                    else:
+                        self._results.put((ready_seq, psd, frames))
+                except Exception as e:
+                    logger.error(f"FFT pipeline result handler error: {e}")
+                finally:
+                    self._slots.release()
+            if self.closed and self._next_emit == self._next_submit:
+                return
+
+    def results(self, timeout=None):
+        """Next (seq, psd, frames) in order when no on_result callback is set.
+
+        psd is None for a block that did not complete a frame, and the raised
+        exception if its transform failed.
+        """
+        return self._results.get(timeout=timeout)
+
+    def process(self, blocks):
+        """Run an iterable of blocks through the pipeline; returns PSDs in order"""
+        if self.on_result is not None:
+            raise ValueError("process() collects results itself; create the pipeline without on_result")
+        count = 0
+        collected = []
+        for samples in blocks:
+            self.submit(samples)
+            count += 1
+            while not self._results.empty():
+                collected.append(self._results.get())
+        while len(collected) < count:
+            collected.append(self._results.get())
+        for _, psd, _ in collected:
+            if isinstance(psd, Exception):
+                raise psd
+        return [psd for _, psd, _ in collected]
+
+    def close(self, wait=True):
+        """Stop accepting blocks and shut the worker pool down; with wait,
+        also wait until every submitted block has been emitted"""
+        self.closed = True
+        self._executor.shutdown(wait=wait)
+        # Wake the emitter so it can see it is done
+        self._completed.put(None)
+        if wait:
+            self._emitter.join()
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'max_inflight': self.max_inflight,
+            'blocks_submitted': self.blocks_submitted,
+            'blocks_dropped': self.blocks_dropped,
+            'frames_processed': self.frames_processed,
+            'pending_reorder': len(self._reorder)
+        }
@@ -23,8 +23,11 @@ from matplotlib.figure import Figure
 import matplotlib.animation as animation
 
 # Signal processing
-from scipy import signal
-from scipy.fft import fft, fftfreq
+from hackrf_iq_buffer import IQRingBuffer
+from hackrf_spectral import WelchSpectrumEngine, get_spectral_context, get_window
+from hackrf_fft_pipeline import ParallelFFTPipeline, DEFAULT_WORKERS
+from hackrf_waterfall import WaterfallPyramid
+from hackrf_renderer import SpectrumRenderer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -41,8 +44,14 @@ class HackRFController:
         self.bandwidth = 20e6
         self.is_receiving = False
         self.receive_thread = None
-        self.data_buffer = []
+        self.block_size = 8192
         self.max_buffer_size = 1000
+        # Preallocated IQ storage; consumers attach with data_buffer.register_reader()
+        self.data_buffer = IQRingBuffer(self.max_buffer_size, self.block_size)
+        self._sim_rng = np.random.default_rng()
+        self._sim_noise = np.empty((2, self.block_size), dtype=np.float32)
+        self._sim_tones = None
+        self._sim_tone_key = None
         
         # Try to import hackrf library
         try:
@@ -136,38 +145,49 @@ class HackRFController:
             self.receive_thread.join(timeout=1.0)
         logger.info("Stopped receiving samples")
         
+    def _simulate_block(self, out):
+        """Fill a ring slot in place with noise plus two test tones"""
+        # Test signals at +1 MHz and -2 MHz offset only depend on the sample rate
+        if self._sim_tone_key != self.sample_rate:
+            t = np.linspace(0, self.block_size/self.sample_rate, self.block_size)
+            signal1 = 0.5 * np.exp(1j * 2 * np.pi * 1e6 * t)
+            signal2 = 0.3 * np.exp(-1j * 2 * np.pi * 2e6 * t)
+            self._sim_tones = (signal1 + signal2).astype(np.complex64)
+            self._sim_tone_key = self.sample_rate
+            
+        # Noise is drawn into preallocated float32 buffers - no per-block allocation
+        self._sim_rng.standard_normal(out=self._sim_noise, dtype=np.float32)
+        self._sim_noise *= 0.1
+        out.real = self._sim_noise[0]
+        out.imag = self._sim_noise[1]
+        out += self._sim_tones
+        
+    def latest_samples(self):
+        """View of the most recently captured block, or None"""
+        return self.data_buffer.latest()
+        
     def _receive_loop(self, callback):
-        """Internal receive loop"""
+        """Internal receive loop
+        
+        Blocks land in the preallocated ring buffer; the callback receives a
+        zero-copy view of the slot, which is reused after max_buffer_size
+        further blocks - copy it if you need to keep it longer.
+        """
         while self.is_receiving:
             try:
                 if self.hackrf_available:
                     # Real HackRF sampling
-                    samples = self.device.read_samples(8192)
+                    seq = self.data_buffer.write(self.device.read_samples(self.block_size))
                 else:
                     # Simulate samples with noise and test signals
                     time.sleep(0.01)  # 10ms intervals
-                    t = np.linspace(0, 8192/self.sample_rate, 8192)
-                    
-                    # Generate noise
-                    noise = np.random.normal(0, 0.1, 8192) + 1j * np.random.normal(0, 0.1, 8192)
-                    
-                    # Add some test signals
-                    test_freq1 = self.center_freq + 1e6  # 1 MHz offset
-                    test_freq2 = self.center_freq - 2e6  # -2 MHz offset
-                    
-                    signal1 = 0.5 * np.exp(1j * 2 * np.pi * (test_freq1 - self.center_freq) * t)
-                    signal2 = 0.3 * np.exp(1j * 2 * np.pi * (test_freq2 - self.center_freq) * t)
-                    
-                    samples = noise + signal1 + signal2
-                
-                # Add to buffer
-                self.data_buffer.append(samples)
-                if len(self.data_buffer) > self.max_buffer_size:
-                    self.data_buffer.pop(0)
+                    self._simulate_block(self.data_buffer.acquire())
+                    self.data_buffer.commit()
+                    seq = self.data_buffer.write_seq - 1
                     
                 # Call callback if provided
                 if callback:
-                    callback(samples)
+                    callback(self.data_buffer.block(seq))
                     
             except Exception as e:
                 logger.error(f"Error in receive loop: {e}")
@@ -176,59 +196,90 @@ class HackRFController:
 class SpectrumAnalyzer:
     """Spectrum analyzer with FFT and waterfall display"""
     
-    def __init__(self, hackrf_controller):
+    def __init__(self, hackrf_controller, fft_workers=None):
         self.hackrf = hackrf_controller
         self.fft_size = 1024
-        self.window = signal.hann(self.fft_size)
         self.overlap = 0.5
         self.averaging = 10
-        self.spectrum_history = []
-        self.waterfall_data = []
+        # Overlapped Welch frames over the whole block, averaged in a fixed buffer
+        self.engine = WelchSpectrumEngine(self.fft_size, self.overlap, self.averaging, shifted=True)
+        self.window = get_window('hann', self.fft_size)
         self.max_waterfall_lines = 100
-        
-    def process_samples(self, samples):
-        """Process samples and compute spectrum"""
-        if len(samples) < self.fft_size:
-            return None, None
-            
-        # Apply window and compute FFT
-        windowed = samples[:self.fft_size] * self.window
-        fft_data = fft(windowed)
-        
-        # Compute magnitude spectrum in dB
-        magnitude = np.abs(fft_data)
-        magnitude[magnitude == 0] = 1e-12  # Avoid log(0)
-        spectrum_db = 20 * np.log10(magnitude)
-        
-        # Generate frequency axis
-        freqs = fftfreq(self.fft_size, 1/self.hackrf.sample_rate)
-        freqs = freqs + self.hackrf.center_freq
-        
-        # Shift zero frequency to center
-        spectrum_db = np.fft.fftshift(spectrum_db)
-        freqs = np.fft.fftshift(freqs)
-        
-        # Add to history for averaging
-        self.spectrum_history.append(spectrum_db)
-        if len(self.spectrum_history) > self.averaging:
-            self.spectrum_history.pop(0)
+        # Full-resolution lines only: the renderer shows the newest rows, so no coarser levels
+        self.waterfall_data = WaterfallPyramid(self.fft_size, capacity=self.max_waterfall_lines, levels=1)
+        
+        # Streaming capture fans the FFTs out over a worker pool when more than one core is available
+        self.fft_workers = fft_workers or DEFAULT_WORKERS
+        self.pipeline = None
+        self.latest_spectrum_db = None
+        self._lock = threading.Lock()
+        
+    @property
+    def spectrum_history(self):
+        """True once at least one averaged spectrum is available"""
+        return self.engine.has_data
+        
+    def reset(self):
+        """Clear the running average and the waterfall"""
+        with self._lock:
+            self.engine.reset()
+            self.waterfall_data.reset()
+            self.latest_spectrum_db = None
             
-        # Compute averaged spectrum
-        avg_spectrum = np.mean(self.spectrum_history, axis=0)
+    def _frequencies(self):
+        # Engine output is already DC-centred; the axis is cached per tuning
+        return get_spectral_context(self.fft_size, 'hann', self.hackrf.sample_rate,
+                                    self.hackrf.center_freq).frequencies
+        
+    def _store_spectrum(self, avg_spectrum):
+        self.latest_spectrum_db = avg_spectrum
         
         # Add to waterfall
         self.waterfall_data.append(avg_spectrum)
-        if len(self.waterfall_data) > self.max_waterfall_lines:
-            self.waterfall_data.pop(0)
-            
-        return freqs, avg_spectrum
         
-    def get_waterfall_data(self):
-        """Get waterfall display data"""
-        if not self.waterfall_data:
-            return None
+    def process_samples(self, samples):
+        """Process samples and compute spectrum"""
+        with self._lock:
+            avg_spectrum = self.engine.update(samples)
+            if avg_spectrum is None:
+                return None, None
+            self._store_spectrum(avg_spectrum)
+        return self._frequencies(), avg_spectrum
+        
+    def submit_samples(self, samples):
+        """Streaming entry point for the capture thread.
+        
+        With several FFT workers the block goes to the parallel pipeline and
+        is averaged in capture order when its PSD is ready; a saturated
+        pipeline drops the block rather than stalling capture.
+        """
+        if self.fft_workers <= 1:
+            self.process_samples(samples)
+            return
+        if self.pipeline is None:
+            self.pipeline = ParallelFFTPipeline(self.fft_size, self.overlap, workers=self.fft_workers,
+                                                on_result=self._on_block_psd)
+        self.pipeline.submit(samples, block=False)
+        
+    def _on_block_psd(self, seq, psd, frames):
+        if psd is None or isinstance(psd, Exception):
+            return
+        with self._lock:
+            self._store_spectrum(self.engine.accumulate(psd))
             
-        return np.array(self.waterfall_data)
+    def latest_spectrum(self):
+        """(freqs, spectrum) of the newest averaged spectrum, or (None, None)"""
+        spectrum = self.latest_spectrum_db
+        if spectrum is None:
+            return None, None
+        return self._frequencies(), spectrum
+        
+    def waterfall_rows_since(self, seen):
+        """(rows appended so far, full-resolution rows added after the first `seen`)"""
+        with self._lock:
+            appended = self.waterfall_data.rows_appended
+            new = appended - seen if appended >= seen else appended  # reset since
+            return appended, self.waterfall_data.view(0, rows=new).copy()
 
 class HackRFInterface:
     """Main GUI interface for HackRF"""
@@ -388,6 +439,10 @@ class HackRFInterface:
         
         self.spectrum_canvas = FigureCanvasTkAgg(self.spectrum_figure, spectrum_frame)
         self.spectrum_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.spectrum_renderer = SpectrumRenderer(self.spectrum_canvas, self.spectrum_ax, self.waterfall_ax,
+                                                  waterfall_rows=self.spectrum_analyzer.max_waterfall_lines,
+                                                  line_color='cyan', cmap='viridis', origin='upper')
+        self.rendered_rows = 0
         
     def create_scanner_tab(self):
         """Create frequency scanner tab"""
@@ -518,15 +573,13 @@ class HackRFInterface:
         
     def clear_spectrum(self):
         """Clear spectrum display"""
-        self.spectrum_analyzer.spectrum_history.clear()
-        self.spectrum_analyzer.waterfall_data.clear()
+        self.spectrum_analyzer.reset()
+        self.spectrum_renderer.reset()
         
     def spectrum_callback(self, samples):
         """Callback for spectrum data"""
-        freqs, spectrum = self.spectrum_analyzer.process_samples(samples)
-        if freqs is not None:
-            # This will be updated in the main loop
-            pass
+        # Averaged spectra are picked up by update_displays
+        self.spectrum_analyzer.submit_samples(samples)
             
     def start_scan(self):
         """Start frequency scan"""
@@ -588,40 +641,20 @@ class HackRFInterface:
     def update_displays(self):
         """Update all displays"""
         try:
-            # Update spectrum display
-            if hasattr(self, 'spectrum_ax') and self.spectrum_analyzer.spectrum_history:
-                freqs, spectrum = None, None
-                if self.hackrf.data_buffer:
-                    freqs, spectrum = self.spectrum_analyzer.process_samples(self.hackrf.data_buffer[-1])
-                    
-                if freqs is not None and spectrum is not None:
-                    # Update spectrum plot
-                    self.spectrum_ax.clear()
-                    self.spectrum_ax.plot(freqs/1e6, spectrum, 'cyan', linewidth=1)
-                    self.spectrum_ax.set_facecolor('#1e1e1e')
-                    self.spectrum_ax.set_xlabel('Frequency (MHz)', color='white')
-                    self.spectrum_ax.set_ylabel('Power (dB)', color='white')
-                    self.spectrum_ax.tick_params(colors='white')
-                    self.spectrum_ax.grid(True, alpha=0.3)
-                    
-                    # Update waterfall plot
-                    waterfall_data = self.spectrum_analyzer.get_waterfall_data()
-                    if waterfall_data is not None:
-                        self.waterfall_ax.clear()
-                        self.waterfall_ax.imshow(waterfall_data, aspect='auto', cmap='viridis',
-                                               extent=[freqs[0]/1e6, freqs[-1]/1e6, 0, len(waterfall_data)])
-                        self.waterfall_ax.set_facecolor('#1e1e1e')
-                        self.waterfall_ax.set_xlabel('Frequency (MHz)', color='white')
-                        self.waterfall_ax.set_ylabel('Time', color='white')
-                        self.waterfall_ax.tick_params(colors='white')
-                        
-                    self.spectrum_canvas.draw()
+            # Update spectrum display (only when a new spectrum has arrived)
+            if hasattr(self, 'spectrum_renderer'):
+                if self.spectrum_analyzer.waterfall_data.rows_appended != self.rendered_rows:
+                    # Every row added since the last poll goes to the waterfall
+                    self.rendered_rows, new_rows = self.spectrum_analyzer.waterfall_rows_since(self.rendered_rows)
+                    freqs, spectrum = self.spectrum_analyzer.latest_spectrum()
+                    if freqs is not None and spectrum is not None and len(new_rows):
+                        self.spectrum_renderer.update(freqs / 1e6, spectrum, rows=new_rows)
                     
         except Exception as e:
             logger.error(f"Error updating displays: {e}")
             
-        # Schedule next update
-        self.root.after(100, self.update_displays)
+        # Schedule next update (the renderer caps the actual frame rate)
+        self.root.after(33, self.update_displays)
 
 def main():
     """Main function"""
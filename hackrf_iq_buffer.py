@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+HackRF IQ Ring Buffer - Preallocated sample storage for sustained capture
+Single-producer / multi-consumer ring of fixed-size complex64 blocks with
+independent read cursors, zero-copy block views and overrun accounting
+"""
+
+import threading
+import numpy as np
+
+class IQReader:
+    """Independent read cursor on an IQRingBuffer"""
+
+    def __init__(self, ring, name, start_seq):
+        self.ring = ring
+        self.name = name
+        self.next_seq = start_seq
+        self.blocks_read = 0
+        self.overruns = 0  # blocks overwritten before this reader got to them
+
+    def available(self):
+        """Number of committed blocks not yet read"""
+        return self.ring.write_seq - self.next_seq
+
+    def read(self):
+        """Return (seq, view) of the next unread block, or (None, None).
+
+        The view aliases ring storage: it stays valid until the producer laps
+        it (`capacity` blocks later). Use `is_valid(seq)` after processing, or
+        copy the view, if the consumer can fall that far behind.
+        """
+        write_seq = self.ring.write_seq
+        lag = write_seq - self.next_seq
+        if lag <= 0:
+            return None, None
+
+        if lag > self.ring.capacity:
+            # Producer lapped us - skip to the oldest block still in the ring
+            skipped = lag - self.ring.capacity
+            self.overruns += skipped
+            self.ring.total_overruns += skipped
+            self.next_seq = write_seq - self.ring.capacity
+
+        seq = self.next_seq
+        self.next_seq += 1
+        self.blocks_read += 1
+        return seq, self.ring.block(seq)
+
+    def read_latest(self):
+        """Jump to the newest block, counting everything skipped as dropped"""
+        write_seq = self.ring.write_seq
+        if write_seq <= self.next_seq:
+            return None, None
+        skipped = write_seq - 1 - self.next_seq
+        self.overruns += skipped
+        self.ring.total_overruns += skipped
+        self.next_seq = write_seq - 1
+        return self.read()
+
+    def is_valid(self, seq):
+        """True if block `seq` has not been overwritten since it was read"""
+        return self.ring.write_seq - seq <= self.ring.capacity
+
+    def stats(self):
+        return {
+            'name': self.name,
+            'blocks_read': self.blocks_read,
+            'overruns': self.overruns,
+            'lag': self.available()
+        }
+
+class IQRingBuffer:
+    """Preallocated complex64 ring buffer of fixed-size sample blocks.
+
+    The producer either fills `acquire()`'d slots in place and calls
+    `commit()`, or calls `write(samples)` which copies into the next slot.
+    Publishing is a single integer store, so readers never take a lock.
+    """
+
+    def __init__(self, capacity=1000, block_size=8192, dtype=np.complex64):
+        self.capacity = int(capacity)
+        self.block_size = int(block_size)
+        self.storage = np.zeros((self.capacity, self.block_size), dtype=dtype)
+        self.lengths = np.zeros(self.capacity, dtype=np.int64)
+        self.write_seq = 0  # number of committed blocks; next slot is write_seq % capacity
+        self.total_overruns = 0
+        self.short_writes = 0
+        self.truncated_writes = 0
+        self.readers = {}
+        self._readers_lock = threading.Lock()
+
+    def acquire(self):
+        """Writable view of the next slot; call commit() once it is filled"""
+        return self.storage[self.write_seq % self.capacity]
+
+    def commit(self, length=None):
+        """Publish the slot returned by acquire()"""
+        self.lengths[self.write_seq % self.capacity] = self.block_size if length is None else length
+        self.write_seq += 1
+
+    def write(self, samples):
+        """Copy one block of samples into the ring and publish it"""
+        count = len(samples)
+        if count > self.block_size:
+            self.truncated_writes += 1
+            count = self.block_size
+        elif count < self.block_size:
+            self.short_writes += 1
+        slot = self.acquire()
+        slot[:count] = samples[:count]
+        self.commit(count)
+        return self.write_seq - 1
+
+    def block(self, seq):
+        """Zero-copy view of committed block `seq`"""
+        index = seq % self.capacity
+        return self.storage[index, :self.lengths[index]]
+
+    def latest(self):
+        """View of the newest committed block, or None if nothing was written"""
+        if self.write_seq == 0:
+            return None
+        return self.block(self.write_seq - 1)
+
+    def register_reader(self, name, from_start=False):
+        """Create a read cursor; by default it only sees blocks written from now on"""
+        with self._readers_lock:
+            start = max(0, self.write_seq - self.capacity) if from_start else self.write_seq
+            reader = IQReader(self, name, start)
+            self.readers[name] = reader
+            return reader
+
+    def unregister_reader(self, name):
+        with self._readers_lock:
+            self.readers.pop(name, None)
+
+    def __len__(self):
+        return min(self.write_seq, self.capacity)
+
+    def stats(self):
+        return {
+            'capacity': self.capacity,
+            'block_size': self.block_size,
+            'blocks_written': self.write_seq,
+            'buffered': len(self),
+            'total_overruns': self.total_overruns,
+            'short_writes': self.short_writes,
+            'truncated_writes': self.truncated_writes,
+            'readers': [reader.stats() for reader in list(self.readers.values())]
+        }
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+HackRF IQ File Reader - Constant-memory access to large recordings
+Memory-maps 8-bit interleaved IQ captures (hackrf_transfer signed int8 or
+rtl_sdr style unsigned uint8) and yields complex64 chunks converted into a
+reused buffer, so multi-GB files never have to fit in RAM
+"""
+
+from pathlib import Path
+import numpy as np
+
+# format -> (raw dtype, DC offset subtracted from each component)
+IQ_FORMATS = {
+    'int8': (np.int8, 0.0),
+    'uint8': (np.uint8, 127.5)
+}
+
+# Common extensions that identify the sample format
+EXTENSION_FORMATS = {
+    '.cs8': 'int8',
+    '.s8': 'int8',
+    '.cu8': 'uint8',
+    '.u8': 'uint8'
+}
+
+def detect_iq_format(path, default='uint8'):
+    """Sample format implied by the file extension, or `default`"""
+    return EXTENSION_FORMATS.get(Path(path).suffix.lower(), default)
+
+class IQFileReader:
+    """Chunked, memory-mapped reader for interleaved 8-bit IQ files"""
+
+    def __init__(self, path, iq_format=None, default_format='uint8'):
+        self.path = Path(path)
+        self.iq_format = iq_format or detect_iq_format(path, default_format)
+        if self.iq_format not in IQ_FORMATS:
+            raise ValueError(f"Unsupported IQ format: {self.iq_format} (expected one of {', '.join(IQ_FORMATS)})")
+        dtype, self.dc_offset = IQ_FORMATS[self.iq_format]
+
+        if self.path.stat().st_size >= 2:
+            self._raw = np.memmap(self.path, dtype=dtype, mode='r')
+        else:
+            self._raw = np.zeros(0, dtype=dtype)
+        self.num_samples = len(self._raw) // 2
+        self._buffer = np.zeros(0, dtype=np.complex64)
+
+    def __len__(self):
+        return self.num_samples
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Release the mapping (closed once no chunk views reference it)"""
+        self._raw = np.zeros(0, dtype=self._raw.dtype)
+        self.num_samples = 0
+
+    def read(self, start, count, out=None):
+        """Convert samples [start, start + count) to complex64.
+
+        Writes into `out` when given (it must hold at least count samples)
+        and returns the filled view.
+        """
+        start = max(0, int(start))
+        count = max(0, min(int(count), self.num_samples - start))
+        if out is None:
+            out = np.empty(count, dtype=np.complex64)
+        out = out[:count]
+        raw = self._raw[2 * start:2 * (start + count)]
+        out.real = raw[0::2]
+        out.imag = raw[1::2]
+        if self.dc_offset:
+            out -= np.complex64(self.dc_offset + 1j * self.dc_offset)
+        return out
+
+    def chunks(self, chunk_size=1 << 20, overlap=0):
+        """Yield (start_sample, samples) covering the whole file.
+
+        Consecutive chunks share `overlap` samples. The yielded array is a
+        buffer reused for the next chunk - copy anything you need to keep.
+        """
+        chunk_size = int(chunk_size)
+        if overlap < 0 or overlap >= chunk_size:
+            raise ValueError("overlap must be in [0, chunk_size)")
+        if len(self._buffer) < chunk_size:
+            self._buffer = np.empty(chunk_size, dtype=np.complex64)
+
+        step = chunk_size - overlap
+        start = 0
+        while start < self.num_samples:
+            yield start, self.read(start, chunk_size, self._buffer)
+            if start + chunk_size >= self.num_samples:
+                break
+            start += step
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+HackRF Mailbox - Latest-value handoff between workers and the display
+A producer publishes frames as fast as it makes them; the consumer takes
+only the newest one when it is ready to draw. Older unread frames are
+overwritten (and counted) instead of queueing, so a slow display never
+builds a backlog or draws stale data
+"""
+
+import threading
+
+class LatestValueMailbox:
+    """Thread-safe single-slot mailbox holding the most recent value.
+
+    put() replaces any value not yet taken; take() returns the newest value
+    once (None when nothing new has arrived since the last take).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = None
+        self._fresh = False
+        self.published = 0
+        self.taken = 0
+        self.coalesced = 0
+
+    def put(self, value):
+        """Publish a value, superseding any unread one"""
+        with self._lock:
+            if self._fresh:
+                self.coalesced += 1
+            self._value = value
+            self._fresh = True
+            self.published += 1
+
+    def take(self):
+        """Newest unread value, or None"""
+        with self._lock:
+            if not self._fresh:
+                return None
+            self._fresh = False
+            self.taken += 1
+            return self._value
+
+    def peek(self):
+        """Newest value, read or not, without marking it taken"""
+        with self._lock:
+            return self._value
+
+    def clear(self):
+        with self._lock:
+            self._value = None
+            self._fresh = False
+
+    def stats(self):
+        """Counters for status displays: published, taken and coalesced frames"""
+        with self._lock:
+            return {'published': self.published, 'taken': self.taken, 'coalesced': self.coalesced}
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+HackRF Peaks - Vectorized spectral peak detection
+Peaks are found with scipy.signal.find_peaks (height, distance, prominence
+and optional width) against an adaptive threshold: a running-median noise
+floor across frequency plus a required SNR, optionally bounded below by an
+absolute level. Everything runs in NumPy/scipy, with no per-bin Python loop
+"""
+
+import numpy as np
+from scipy.signal import find_peaks
+
+# Bins per noise-floor median block
+NOISE_FLOOR_WINDOW = 256
+
+def noise_floor(power, window=NOISE_FLOOR_WINDOW):
+    """Running-median noise floor of a power spectrum (dB), one value per bin.
+
+    Medians are taken over consecutive blocks of `window` bins (the last
+    block is aligned to the end of the spectrum) and linearly interpolated
+    between block centres, which follows a sloping floor while ignoring
+    signals narrower than half a block. For even windows the upper of the
+    two middle values is used (a partition, not a sort).
+    """
+    power = np.asarray(power)
+    size = len(power)
+    window = max(1, min(int(window), size))
+    middle = window // 2
+    blocks = size // window
+    medians = np.partition(power[:blocks * window].reshape(blocks, window), middle, axis=1)[:, middle]
+    centres = np.arange(blocks) * window + (window - 1) / 2
+    if blocks * window < size:
+        medians = np.append(medians, np.partition(power[size - window:], middle)[middle])
+        centres = np.append(centres, size - (window + 1) / 2)
+    if len(medians) == 1:
+        return np.full(size, medians[0], dtype=np.float64)
+    return np.interp(np.arange(size), centres, medians)
+
+def find_spectral_peaks(power, threshold=None, snr_db=10.0, prominence=6.0, distance=10,
+                        min_width=None, floor_window=NOISE_FLOOR_WINDOW):
+    """Peaks of a power spectrum (dB).
+
+    A bin qualifies when it is a local maximum at least snr_db above the
+    noise floor (and above `threshold`, if given), stands `prominence` dB
+    above its surroundings, and is the strongest peak within `distance`
+    bins. With min_width, peaks narrower than that many bins (at half
+    prominence) are dropped and widths are returned.
+
+    Returns a dict of arrays: 'indices', 'power', 'prominences',
+    'noise_floor' (at each peak) and, with min_width, 'widths' in bins.
+    """
+    power = np.asarray(power, dtype=np.float64)
+    empty = np.empty(0)
+    result = {'indices': np.empty(0, dtype=np.intp), 'power': empty, 'prominences': empty, 'noise_floor': empty}
+    if min_width is not None:
+        result['widths'] = empty
+    if len(power) < 3:
+        return result
+
+    floor = noise_floor(power, floor_window)
+    height = floor + snr_db
+    if threshold is not None:
+        height = np.maximum(height, threshold)
+
+    indices, properties = find_peaks(power, height=height, distance=max(1, int(distance)),
+                                     prominence=prominence, width=min_width)
+    result.update(indices=indices, power=power[indices], noise_floor=floor[indices],
+                  prominences=properties.get('prominences', np.full(len(indices), np.nan)))
+    if min_width is not None:
+        result['widths'] = properties['widths']
+    return result
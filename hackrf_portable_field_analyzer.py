@@ -23,6 +23,8 @@ from datetime import datetime
 import serial
 import socket
 import requests
+from hackrf_spectral import get_frequency_axis
+from hackrf_renderer import SpectrumRenderer
 
 class HackRFPortableAnalyzer:
     def __init__(self):
@@ -212,6 +214,8 @@ class HackRFPortableAnalyzer:
         self.spectrum_canvas = FigureCanvasTkAgg(self.spectrum_fig, self.spectrum_display_frame)
         self.spectrum_canvas.draw()
         self.spectrum_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.spectrum_renderer = SpectrumRenderer(self.spectrum_canvas, self.spectrum_ax, self.waterfall_ax,
+                                                  line_color='lime')
         
         # Touch-optimized controls
         self.spectrum_controls = tk.Frame(self.spectrum_tab, bg='#1a1a1a', height=120)
@@ -810,8 +814,7 @@ class HackRFPortableAnalyzer:
         while self.running:
             try:
                 # Simulate spectrum data (replace with actual HackRF capture)
-                freqs = np.linspace(self.center_freq - self.sample_rate/2, 
-                                   self.center_freq + self.sample_rate/2, 1024)
+                freqs = get_frequency_axis(self.center_freq, self.sample_rate, 1024)
                 power = -80 + 20 * np.random.random(1024)  # Simulated spectrum
                 
                 # Update display
@@ -826,15 +829,7 @@ class HackRFPortableAnalyzer:
     def update_spectrum_display(self, freqs, power):
         """Update spectrum display"""
         try:
-            self.spectrum_ax.clear()
-            self.spectrum_ax.plot(freqs/1e6, power, 'lime', linewidth=1)
-            self.spectrum_ax.set_xlabel('Frequency (MHz)', color='white')
-            self.spectrum_ax.set_ylabel('Power (dB)', color='white')
-            self.spectrum_ax.set_facecolor('black')
-            self.spectrum_ax.tick_params(colors='white')
-            self.spectrum_ax.grid(True, alpha=0.3)
-            
-            self.spectrum_canvas.draw()
+            self.spectrum_renderer.update(freqs/1e6, power)
         except Exception as e:
             print(f"Display update error: {e}")
             
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+HackRF Protocol Index - Compiled lookup tables for protocol classification
+The protocol database is flattened into elementary frequency segments
+(bisect / searchsorted lookup) and per-protocol bit-rate bands, so a signal
+is matched in O(log n + k) and whole arrays of bursts in one call
+"""
+
+import bisect
+import numpy as np
+
+# Relative bit-rate tolerances: inside the first band scores 1.0, inside the
+# second 0.7 (the first listed rate that falls in either band decides)
+BIT_RATE_TOLERANCES = (0.1, 0.2)
+
+class ProtocolIndex:
+    """Frequency interval index and bit-rate bands over a protocol database"""
+
+    def __init__(self, protocols):
+        self.protocols = protocols
+        self.names = list(protocols)
+        self.details = [protocols[name] for name in self.names]
+        self.modulations = [info['modulation'].upper() for info in self.details]
+        self.bit_rates = [np.asarray(info.get('bit_rate') or [], dtype=np.float64) for info in self.details]
+        self._modulation_cache = {}
+
+        # Elementary segments: between consecutive range boundaries the set of
+        # matching protocols is constant. Ranges are inclusive at both ends,
+        # so each upper bound closes just above itself.
+        edges = set()
+        ranges = []
+        for index, info in enumerate(self.details):
+            for low, high in info['frequency_ranges']:
+                end = float(np.nextafter(float(high), np.inf))
+                ranges.append((float(low), end, index))
+                edges.update((float(low), end))
+        self.boundaries = sorted(edges)
+        self._boundary_array = np.asarray(self.boundaries)
+        self.segments = []
+        for start in self.boundaries:
+            covering = sorted({index for low, end, index in ranges if low <= start < end})
+            self.segments.append(np.asarray(covering, dtype=np.int64))
+
+    def __len__(self):
+        return len(self.names)
+
+    def _segment(self, frequency):
+        position = bisect.bisect_right(self.boundaries, frequency) - 1
+        return self.segments[position] if position >= 0 else self.segments[0][:0]
+
+    def _modulation_scores(self, modulation):
+        """Score of `modulation` against every protocol (cached per value)"""
+        scores = self._modulation_cache.get(modulation)
+        if scores is None:
+            wanted = str(modulation).upper()
+            scores = np.array([1.0 if wanted in declared else 0.5 for declared in self.modulations])
+            self._modulation_cache[modulation] = scores
+        return scores
+
+    def _bit_rate_scores(self, protocol, bit_rates):
+        rates = self.bit_rates[protocol]
+        if len(rates) == 0:
+            return np.zeros(len(bit_rates))
+        relative = np.abs(bit_rates[:, None] - rates[None, :]) / rates[None, :]
+        tight, loose = BIT_RATE_TOLERANCES
+        inside = relative < loose
+        first = np.argmax(inside, axis=1)
+        first_relative = relative[np.arange(len(bit_rates)), first]
+        return np.where(inside.any(axis=1), np.where(first_relative < tight, 1.0, 0.7), 0.0)
+
+    def _candidates(self, protocols, confidence, top):
+        # Stable sort keeps database order between equal confidences
+        order = np.argsort(-confidence, kind='stable')[:top]
+        return [{
+            'protocol': self.names[protocols[i]],
+            'confidence': float(confidence[i]),
+            'details': self.details[protocols[i]]
+        } for i in order]
+
+    def classify(self, frequency, modulation, bit_rate, top=3):
+        """Top candidates for one signal, best first"""
+        protocols = self._segment(frequency)
+        if len(protocols) == 0:
+            return []
+        modulation_score = self._modulation_scores(modulation)[protocols]
+        bit_rates = np.array([bit_rate], dtype=np.float64)
+        bit_rate_score = np.array([self._bit_rate_scores(p, bit_rates)[0] for p in protocols])
+        confidence = (1.0 + modulation_score + bit_rate_score) / 3.0
+        return self._candidates(protocols, confidence, top)
+
+    def classify_many(self, frequencies, modulations, bit_rates, top=3):
+        """Top candidates for arrays of signals; returns one list per signal.
+
+        Signals are grouped by frequency segment, and each protocol's bit-rate
+        bands are evaluated against the whole group at once.
+        """
+        frequencies = np.asarray(frequencies, dtype=np.float64)
+        bit_rates = np.asarray(bit_rates, dtype=np.float64)
+        modulations = list(modulations)
+        results = [[] for _ in range(len(frequencies))]
+        if len(frequencies) == 0:
+            return results
+
+        segment_ids = np.searchsorted(self._boundary_array, frequencies, side='right') - 1
+        for segment_id in np.unique(segment_ids):
+            if segment_id < 0:
+                continue
+            protocols = self.segments[segment_id]
+            if len(protocols) == 0:
+                continue
+            members = np.flatnonzero(segment_ids == segment_id)
+
+            modulation_score = np.stack([self._modulation_scores(modulations[m])[protocols] for m in members])
+            bit_rate_score = np.stack([self._bit_rate_scores(p, bit_rates[members]) for p in protocols], axis=1)
+            confidence = (1.0 + modulation_score + bit_rate_score) / 3.0
+            for row, member in enumerate(members):
+                results[member] = self._candidates(protocols, confidence[row], top)
+        return results
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+HackRF Renderer - Blitted real-time spectrum and waterfall display
+The spectrum line and waterfall image are created once and updated in
+place (set_ydata / set_data on a rolling row buffer); each frame restores
+the cached axes background and redraws only those artists. A full redraw
+happens only when the frequency axis, power range or canvas size changes,
+and frames arriving faster than max_fps are coalesced into the next draw
+"""
+
+import time
+import numpy as np
+
+# Step used when the power range grows to fit the data
+AUTOSCALE_STEP_DB = 10.0
+# Used until a frame with finite values arrives
+DEFAULT_POWER_RANGE = (-120.0, 0.0)
+
+class SpectrumRenderer:
+    """Persistent-artist renderer for a spectrum axes and/or a waterfall axes.
+
+    Call update(freqs, power) from the GUI thread for every new spectrum.
+    Each call adds a waterfall row; drawing is limited to max_fps and a
+    frame that arrives too early is drawn (as the latest data) by one
+    deferred callback, so a slow display skips frames instead of queueing
+    them. Waterfall rows are max-decimated to at most max_columns columns,
+    and spectra with more bins than the axes has pixels are drawn as a
+    min/max envelope per pixel column (same picture, far fewer vertices).
+
+    With power_range=None the range starts from the first frame and only
+    grows (in AUTOSCALE_STEP_DB steps), so rescaling stays rare.
+    """
+
+    def __init__(self, canvas, spectrum_ax=None, waterfall_ax=None, waterfall_rows=100,
+                 power_range=None, line_color='cyan', linewidth=1, cmap='viridis',
+                 origin='lower', max_columns=2048, max_fps=30):
+        self.canvas = canvas
+        self.figure = canvas.figure
+        self.spectrum_ax = spectrum_ax
+        self.waterfall_ax = waterfall_ax
+        self.waterfall_rows = int(waterfall_rows)
+        self.autoscale = power_range is None
+        self.power_range = tuple(power_range) if power_range is not None else None
+        self.origin = origin
+        self.max_columns = int(max_columns)
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.use_blit = bool(getattr(canvas, 'supports_blit', False))
+
+        self.line = None
+        if spectrum_ax is not None:
+            self.line, = spectrum_ax.plot([], [], color=line_color, linewidth=linewidth,
+                                          animated=self.use_blit)
+        self.image = None
+        self._cmap = cmap
+        self._waterfall = None
+        self._column_factor = 1
+        self._line_factor = 1
+        self._axis = None
+        self._latest = None
+        self._background = None
+        self._last_draw = 0.0
+        self._deferred = False
+
+        self.frames_received = 0
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+        self.full_redraws = 0
+
+        if self.use_blit:
+            canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        """Cache the static background after any full redraw"""
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.full_redraws += 1
+
+    def _full_redraw(self):
+        self._background = None
+        self.canvas.draw()
+        if not self.use_blit:
+            self.full_redraws += 1
+
+    def _configure(self, freqs):
+        """(Re)build axis limits, line x data and the waterfall image for a new frequency axis"""
+        freqs = np.asarray(freqs)
+        axis = self._axis_key(freqs)
+        resized_only = self._axis is not None and self._axis[:3] == axis[:3]
+        self._axis = axis
+        if self.power_range is None:
+            self.power_range = DEFAULT_POWER_RANGE
+
+        if self.spectrum_ax is not None:
+            self.spectrum_ax.set_xlim(freqs[0], freqs[-1])
+            self.spectrum_ax.set_ylim(*self.power_range)
+            pixels = max(1, int(self.spectrum_ax.bbox.width))
+            self._line_factor = max(1, len(freqs) // pixels)
+            x = self._envelope(freqs, x_axis=True)
+            self.line.set_data(x, np.full(len(x), np.nan))
+
+        if self.waterfall_ax is not None and not resized_only:
+            self._column_factor = max(1, -(-len(freqs) // self.max_columns))
+            columns = -(-len(freqs) // self._column_factor)
+            self._waterfall = np.full((self.waterfall_rows, columns), self.power_range[0], dtype=np.float32)
+            extent = [freqs[0], freqs[-1], 0, self.waterfall_rows]
+            if self.image is None:
+                self.image = self.waterfall_ax.imshow(self._waterfall, aspect='auto', cmap=self._cmap,
+                                                      origin=self.origin, extent=extent,
+                                                      vmin=self.power_range[0], vmax=self.power_range[1],
+                                                      interpolation='nearest', animated=self.use_blit)
+            else:
+                self.image.set_data(self._waterfall)
+                self.image.set_extent(extent)
+            self.waterfall_ax.set_xlim(freqs[0], freqs[-1])
+        self._full_redraw()
+
+    def reset(self):
+        """Forget the waterfall history and layout; the next update rebuilds both"""
+        self._axis = None
+        self._latest = None
+        if self.autoscale:
+            self.power_range = None
+
+    def _axis_key(self, freqs):
+        """Anything that invalidates the layout: the frequency axis and the canvas size"""
+        return (len(freqs), float(freqs[0]), float(freqs[-1]),
+                int(self.figure.bbox.width), int(self.figure.bbox.height))
+
+    def set_power_range(self, low, high, redraw=True):
+        """Change the spectrum y-limits and waterfall colour scale"""
+        self.power_range = (float(low), float(high))
+        if self.spectrum_ax is not None:
+            self.spectrum_ax.set_ylim(*self.power_range)
+        if self.image is not None:
+            self.image.set_clim(*self.power_range)
+        if redraw:
+            self._full_redraw()
+
+    def _fit_range(self, power):
+        """Grow the power range to include this frame; True if it changed"""
+        finite = power[np.isfinite(power)]
+        if len(finite) == 0:
+            return False
+        low = np.floor(finite.min() / AUTOSCALE_STEP_DB) * AUTOSCALE_STEP_DB
+        high = np.ceil(finite.max() / AUTOSCALE_STEP_DB) * AUTOSCALE_STEP_DB
+        if self.power_range is not None:
+            if low >= self.power_range[0] and high <= self.power_range[1]:
+                return False
+            low, high = min(low, self.power_range[0]), max(high, self.power_range[1])
+        if high <= low:
+            high = low + AUTOSCALE_STEP_DB
+        self.set_power_range(low, high, redraw=False)
+        return True
+
+    @staticmethod
+    def _groups(values, factor):
+        """values padded with their last element and reshaped to (groups, factor)"""
+        pad = (-len(values)) % factor
+        if pad:
+            values = np.concatenate((values, np.full(pad, values[-1], dtype=values.dtype)))
+        return values.reshape(-1, factor)
+
+    def _envelope(self, values, x_axis=False):
+        """Line vertices: every bin, or (min, max) pairs per pixel column"""
+        if self._line_factor == 1:
+            return values
+        groups = self._groups(np.asarray(values), self._line_factor)
+        if x_axis:
+            return np.repeat(groups[:, 0], 2)
+        envelope = np.empty((len(groups), 2), dtype=groups.dtype)
+        np.min(groups, axis=1, out=envelope[:, 0])
+        np.max(groups, axis=1, out=envelope[:, 1])
+        return envelope.ravel()
+
+    def _push_row(self, power):
+        row = power
+        if self._column_factor > 1:
+            row = self._groups(row, self._column_factor).max(axis=1)
+        if self.origin == 'lower':
+            self._waterfall[:-1] = self._waterfall[1:]
+            self._waterfall[-1] = row
+        else:
+            self._waterfall[1:] = self._waterfall[:-1]
+            self._waterfall[0] = row
+
+    def update(self, freqs, power, rows=None):
+        """Add one spectrum; draws now, later (coalesced) or not at all when behind.
+
+        rows (oldest first) replaces power as the new waterfall rows, for
+        callers that poll and may have missed spectra since the last call.
+        """
+        if freqs is None or power is None or len(power) == 0:
+            return
+        power = np.asarray(power, dtype=np.float32)
+        self.frames_received += 1
+
+        rescaled = self.autoscale and self._fit_range(power)
+        if self._axis_key(freqs) != self._axis:
+            self._configure(freqs)
+        elif rescaled:
+            self._full_redraw()
+        if self._waterfall is not None:
+            for row in (power,) if rows is None else rows[-self.waterfall_rows:]:
+                self._push_row(np.asarray(row, dtype=np.float32))
+
+        if self._latest is not None:
+            self.frames_skipped += 1  # superseded before it was drawn
+        self._latest = power
+        wait = self._last_draw + self.min_interval - time.perf_counter()
+        if wait <= 0:
+            self.render()
+        elif not self._deferred:
+            self._deferred = self._schedule(wait)
+
+    def _schedule(self, delay):
+        """Run render() after `delay` seconds on the GUI loop, if the canvas has one"""
+        widget = getattr(self.canvas, 'get_tk_widget', None)
+        if widget is None:
+            return False
+        widget().after(max(1, int(delay * 1000)), self._deferred_render)
+        return True
+
+    def _deferred_render(self):
+        self._deferred = False
+        self.render()
+
+    def render(self):
+        """Draw the latest spectrum and waterfall (no-op if nothing new)"""
+        power = self._latest
+        if power is None:
+            return
+        self._latest = None
+        if self.line is not None:
+            self.line.set_ydata(self._envelope(power))
+        if self.image is not None:
+            self.image.set_data(self._waterfall)
+
+        if not self.use_blit:
+            self.canvas.draw_idle()
+        else:
+            if self._background is None:
+                self.canvas.draw()  # caches the background via draw_event
+            self.canvas.restore_region(self._background)
+            if self.line is not None:
+                self.spectrum_ax.draw_artist(self.line)
+            if self.image is not None:
+                self.waterfall_ax.draw_artist(self.image)
+            self.canvas.blit(self.figure.bbox)
+        self._last_draw = time.perf_counter()
+        self.frames_drawn += 1
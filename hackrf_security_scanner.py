@@ -7,7 +7,6 @@ Compatible with Kali Linux and defensive security frameworks
 
 import os
 import sys
-import time
 import numpy as np
 import json
 from datetime import datetime
@@ -18,6 +17,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from hackrf_sweep import SweepEngine, SimulatedSweepSource
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,7 +25,16 @@ logger = logging.getLogger(__name__)
 class DefensiveRadarScanner:
     """Legitimate radar and spectrum scanning for defensive security purposes"""
     
-    def __init__(self):
+    AUTHORIZED_RANGES = [
+        (2400e6, 2485e6),  # WiFi/Bluetooth
+        (5150e6, 5850e6),  # 5GHz WiFi
+    ]
+    FORBIDDEN_RANGES = [
+        (450e6, 470e6),   # Emergency services
+        (460e6, 470e6),   # Public safety
+    ]
+    
+    def __init__(self, capture=None):
         self.scan_ranges = {
             'wifi_2_4ghz': {
                 'name': 'WiFi 2.4GHz Security Scan',
@@ -69,6 +78,11 @@ class DefensiveRadarScanner:
         self.is_scanning = False
         self.whitelist = set()  # Known good devices
         self.threat_signatures = self.load_threat_signatures()
+        # Sweep survey; capture(center_freq, sample_rate, num_samples) returns IQ
+        # (simulated carriers when no capture function is given)
+        self.sweep_engine = SweepEngine(capture if capture is not None else SimulatedSweepSource(
+            [(98.1e6, -45.0), (433.92e6, -40.0), (462.5e6, -25.0), (915e6, -48.0), (2437e6, -35.0)]))
+        self.last_panorama = None
         
     def load_threat_signatures(self):
         """Load known threat signatures for defensive detection"""
@@ -94,42 +108,72 @@ class DefensiveRadarScanner:
         """Scan frequency range for security threats"""
         logger.info(f"Starting defensive security scan: {scan_config['name']}")
         
-        start_freq = scan_config['start_freq']
-        stop_freq = scan_config['stop_freq']
-        step_size = 1e6  # 1 MHz steps
+        # One sweep pass gives the whole range at FFT resolution
+        panorama = self.sweep_engine.sweep(scan_config['start_freq'], scan_config['stop_freq'],
+                                           keep_running=lambda: self.is_scanning)
+        self.last_panorama = panorama
+        logger.info(f"Swept {len(panorama['power'])} bins in {panorama['retunes']} retunes, "
+                    f"{panorama['duration']:.2f}s")
+        
+        detections = self.find_detections(panorama, scan_config['name'])
+        if callback:
+            for detection in detections:
+                callback(detection)
+                
+        return detections
         
-        current_freq = start_freq
-        detections = []
+    def find_detections(self, panorama, scan_type, threshold=0.7):
+        """One detection per run of adjacent bins above the threat threshold (at its strongest bin)"""
+        frequencies, power = panorama['frequencies'], panorama['power']
+        threat = self.threat_levels(frequencies, power)
+        above = np.flatnonzero(threat > threshold)
+        if not len(above):
+            return []
         
-        while current_freq <= stop_freq and self.is_scanning:
-            try:
-                # Simulate scanning (replace with actual HackRF code)
-                power_level = self.measure_power_at_frequency(current_freq)
-                
-                # Analyze for security threats
-                threat_level = self.analyze_threat_level(current_freq, power_level)
-                
-                if threat_level > 0.7:  # High threat threshold
-                    detection = {
-                        'frequency': current_freq,
-                        'power': power_level,
-                        'threat_level': threat_level,
-                        'timestamp': datetime.now().isoformat(),
-                        'scan_type': scan_config['name']
-                    }
-                    detections.append(detection)
-                    
-                    if callback:
-                        callback(detection)
-                        
-                current_freq += step_size
-                time.sleep(0.01)  # Small delay
-                
-            except Exception as e:
-                logger.error(f"Error during scan at {current_freq}: {e}")
-                
+        # Split the flagged bins into contiguous runs
+        breaks = np.flatnonzero(np.diff(above) > 1) + 1
+        starts = above[np.r_[0, breaks]]
+        stops = above[np.r_[breaks - 1, len(above) - 1]] + 1
+        timestamp = datetime.now().isoformat()
+        
+        detections = []
+        for start, stop in zip(starts, stops):
+            index = start + int(np.argmax(power[start:stop]))
+            detections.append({
+                'frequency': float(frequencies[index]),
+                'power': float(power[index]),
+                'threat_level': float(threat[start:stop].max()),
+                'bandwidth': float((stop - start) * panorama['bin_width']),
+                'timestamp': timestamp,
+                'scan_type': scan_type
+            })
         return detections
         
+    def threat_levels(self, frequencies, power):
+        """Threat score (0..1) of every (frequency, power) bin"""
+        frequencies = np.asarray(frequencies, dtype=float)
+        power = np.asarray(power, dtype=float)
+        
+        # High power signals could indicate unauthorized transmitters
+        threat = np.where(power > -30, 0.5, np.where(power > -50, 0.3, 0.0))
+        # Reduce threat for known good frequencies
+        threat[self._in_ranges(frequencies, self.AUTHORIZED_RANGES)] *= 0.1
+        # Suspicious patterns
+        threat[self._signature_matches(frequencies, power)] += 0.4
+        return np.minimum(threat, 1.0)
+        
+    def _signature_matches(self, frequencies, power):
+        """Bins matching a known threat signature"""
+        # Very high power could indicate jamming; or unauthorized frequency usage
+        return (power > -20) | self._in_ranges(frequencies, self.FORBIDDEN_RANGES)
+        
+    @staticmethod
+    def _in_ranges(frequencies, ranges):
+        inside = np.zeros(len(frequencies), dtype=bool)
+        for start, stop in ranges:
+            inside |= (frequencies >= start) & (frequencies <= stop)
+        return inside
+        
     def measure_power_at_frequency(self, frequency):
         """Measure power level at specific frequency"""
         # Simulate power measurement
@@ -139,57 +183,15 @@ class DefensiveRadarScanner:
         
     def analyze_threat_level(self, frequency, power):
         """Analyze threat level based on frequency and power"""
-        threat_score = 0.0
-        
-        # High power signals could indicate unauthorized transmitters
-        if power > -30:  # Very high power
-            threat_score += 0.5
-        elif power > -50:  # Moderate power
-            threat_score += 0.3
-            
-        # Check against known good frequencies
-        if self.is_whitelisted_frequency(frequency):
-            threat_score *= 0.1  # Reduce threat for known good
-            
-        # Check for suspicious patterns
-        if self.matches_threat_signature(frequency, power):
-            threat_score += 0.4
-            
-        return min(threat_score, 1.0)
+        return float(self.threat_levels([frequency], [power])[0])
         
     def is_whitelisted_frequency(self, frequency):
         """Check if frequency is in whitelist"""
-        # Check against authorized frequencies
-        authorized_ranges = [
-            (2400e6, 2485e6),  # WiFi/Bluetooth
-            (5150e6, 5850e6),  # 5GHz WiFi
-        ]
-        
-        for start, stop in authorized_ranges:
-            if start <= frequency <= stop:
-                return True
-        return False
+        return bool(self._in_ranges(np.array([frequency], dtype=float), self.AUTHORIZED_RANGES)[0])
         
     def matches_threat_signature(self, frequency, power):
         """Check if signal matches known threat signatures"""
-        # Simple threat detection logic
-        # In real implementation, this would be much more sophisticated
-        
-        # Check for jamming patterns
-        if power > -20:  # Very high power could indicate jamming
-            return True
-            
-        # Check for unauthorized frequency usage
-        forbidden_ranges = [
-            (450e6, 470e6),   # Emergency services
-            (460e6, 470e6),   # Public safety
-        ]
-        
-        for start, stop in forbidden_ranges:
-            if start <= frequency <= stop:
-                return True
-                
-        return False
+        return bool(self._signature_matches(np.array([frequency], dtype=float), np.array([power], dtype=float))[0])
 
 class KaliLinuxIntegration:
     """Integration with Kali Linux security tools"""
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+HackRF Spectral Engine - Batched spectrum estimation for the analyzers
+Overlapped Welch framing with stride tricks, a single 2-D FFT per block,
+running averages held in fixed NumPy buffers, and a shared cache of
+windows, frequency axes and FFT plans so per-frame setup cost is zero
+"""
+
+import os
+import threading
+from functools import lru_cache
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import signal
+from scipy import fft as sp_fft
+
+try:
+    import pyfftw
+    import pyfftw.builders
+except ImportError:
+    pyfftw = None
+
+# Threads per FFT call (scipy workers / FFTW threads); -1 uses every core
+FFT_WORKERS = int(os.environ.get('HACKRF_FFT_WORKERS', 1))
+
+def _readonly(array):
+    array.setflags(write=False)
+    return array
+
+@lru_cache(maxsize=64)
+def get_window(window, size, shifted=False):
+    """Cached float32 window. shifted=True multiplies by (-1)^n so the FFT
+    output comes out already fftshift-ed (valid for even FFT sizes)."""
+    values = signal.get_window(window, size).astype(np.float32)
+    if shifted:
+        values[1::2] *= -1
+    return _readonly(values)
+
+@lru_cache(maxsize=64)
+def get_frequency_axis(center_freq, sample_rate, num_points):
+    """Cached linear frequency axis spanning center_freq +/- sample_rate/2"""
+    return _readonly(np.linspace(center_freq - sample_rate/2, center_freq + sample_rate/2, num_points))
+
+class FFTPlan:
+    """Reusable forward FFT along the last axis.
+
+    Uses pyFFTW wisdom-backed builders when pyfftw is installed, otherwise
+    scipy.fft with FFT_WORKERS threads. A pyFFTW builder owns its input and
+    output arrays, so each thread gets its own builders (one per input
+    shape) and results are copied out before the next call reuses them.
+    """
+
+    def __init__(self, fft_size, workers=None):
+        self.fft_size = fft_size
+        self.workers = FFT_WORKERS if workers is None else workers
+        self._local = threading.local()
+
+    def __call__(self, x):
+        if pyfftw is not None:
+            builders = getattr(self._local, 'builders', None)
+            if builders is None:
+                builders = self._local.builders = {}
+            key = (x.shape, x.dtype.str)
+            builder = builders.get(key)
+            if builder is None:
+                threads = os.cpu_count() if self.workers == -1 else max(1, self.workers)
+                builder = pyfftw.builders.fft(pyfftw.empty_aligned(x.shape, dtype=x.dtype),
+                                              n=self.fft_size, axis=-1, threads=threads)
+                builders[key] = builder
+            return builder(x).copy()
+        return sp_fft.fft(x, n=self.fft_size, axis=-1, workers=self.workers)
+
+@lru_cache(maxsize=16)
+def get_fft_plan(fft_size):
+    """Shared FFT plan for a transform size"""
+    return FFTPlan(fft_size)
+
+class SpectralContext:
+    """Precomputed per-configuration state for spectrum analysis"""
+
+    def __init__(self, fft_size, window, sample_rate, center_freq):
+        self.fft_size = fft_size
+        self.window_type = window
+        self.sample_rate = sample_rate
+        self.center_freq = center_freq
+        self.window = get_window(window, fft_size)
+        self.shifted_window = get_window(window, fft_size, shifted=True)
+        self.frequencies = _readonly(
+            np.fft.fftshift(np.fft.fftfreq(fft_size, 1/sample_rate)) + center_freq)
+        self.fft = get_fft_plan(fft_size)
+
+    def window_for(self, length, shifted=True):
+        """Window for a segment shorter than fft_size (zero-padded transforms)"""
+        if length == self.fft_size:
+            return self.shifted_window if shifted else self.window
+        return get_window(self.window_type, length, shifted)
+
+@lru_cache(maxsize=128)
+def get_spectral_context(fft_size, window='hann', sample_rate=20e6, center_freq=0.0):
+    """Shared spectral context keyed on (fft_size, window, sample_rate, center_freq)"""
+    return SpectralContext(int(fft_size), window, float(sample_rate), float(center_freq))
+
+class WelchSpectrumEngine:
+    """Overlapped, windowed, batched power spectrum estimator.
+
+    Every sample of every block is used: frames advance by
+    fft_size * (1 - overlap) and the unconsumed tail of a block is carried
+    into the next one. All frames of a block go through one 2-D FFT, and the
+    per-block PSDs are averaged with a running sum over a fixed ring.
+    With shifted=True the spectra come out DC-centred without an fftshift.
+    """
+
+    def __init__(self, fft_size=1024, overlap=0.5, averaging=10, window='hann', shifted=False):
+        self.fft_size = int(fft_size)
+        self.overlap = float(overlap)
+        self.averaging = max(1, int(averaging))
+        self.step = max(1, int(round(self.fft_size * (1 - self.overlap))))
+        self.shifted = shifted and self.fft_size % 2 == 0
+        self.window = get_window(window, self.fft_size, self.shifted)
+        self.fft = get_fft_plan(self.fft_size)
+        # Power normalisation so a full-scale tone reads the same for any window
+        self.scale = 1.0 / float(np.sum(get_window(window, self.fft_size)) ** 2)
+
+        self._work = np.zeros(0, dtype=np.complex64)
+        self._windowed = np.zeros((0, self.fft_size), dtype=np.complex64)
+        self._carry_len = 0
+
+        self._history = np.zeros((self.averaging, self.fft_size), dtype=np.float64)
+        self._running_sum = np.zeros(self.fft_size, dtype=np.float64)
+        self._history_count = 0
+        self._history_index = 0
+
+        self.frames_processed = 0
+        self.samples_processed = 0
+
+    def reset(self):
+        """Forget carried samples and the running average"""
+        self._carry_len = 0
+        self._history[:] = 0
+        self._running_sum[:] = 0
+        self._history_count = 0
+        self._history_index = 0
+
+    @property
+    def has_data(self):
+        return self._history_count > 0
+
+    def _ensure_capacity(self, total):
+        if len(self._work) < total:
+            work = np.zeros(total, dtype=np.complex64)
+            work[:self._carry_len] = self._work[:self._carry_len]
+            self._work = work
+        max_frames = (total - self.fft_size) // self.step + 1
+        if len(self._windowed) < max_frames:
+            self._windowed = np.zeros((max_frames, self.fft_size), dtype=np.complex64)
+
+    def block_psd(self, samples):
+        """Linear power spectrum averaged over all frames in `samples`.
+
+        Returns None until at least fft_size samples have accumulated.
+        """
+        count = len(samples)
+        total = self._carry_len + count
+        self._ensure_capacity(total)
+        work = self._work
+        work[self._carry_len:total] = samples
+
+        if total < self.fft_size:
+            self._carry_len = total
+            return None
+
+        frames = sliding_window_view(work[:total], self.fft_size)[::self.step]
+        n_frames = len(frames)
+        windowed = self._windowed[:n_frames]
+        np.multiply(frames, self.window, out=windowed)
+
+        spectra = self.fft(windowed)
+        power = np.abs(spectra) ** 2
+        psd = power.mean(axis=0) * self.scale
+
+        # Keep the tail that has not started a frame yet
+        consumed = n_frames * self.step
+        leftover = total - consumed
+        work[:leftover] = work[consumed:total]
+        self._carry_len = leftover
+
+        self.frames_processed += n_frames
+        self.samples_processed += count
+        return psd
+
+    def update(self, samples):
+        """Process one block; returns the running-average PSD in dB"""
+        psd = self.block_psd(samples)
+        if psd is None:
+            return None
+        return self.accumulate(psd)
+
+    def accumulate(self, psd):
+        """Add one block PSD (e.g. from ParallelFFTPipeline) to the running average"""
+        slot = self._history[self._history_index]
+        self._running_sum -= slot
+        slot[:] = psd
+        self._running_sum += slot
+        self._history_index = (self._history_index + 1) % self.averaging
+        self._history_count = min(self._history_count + 1, self.averaging)
+
+        average = self._running_sum / self._history_count
+        np.maximum(average, 1e-20, out=average)
+        return 10 * np.log10(average)
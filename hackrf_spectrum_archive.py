@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+HackRF Spectrum Archive - Chunked columnar storage for historical spectra
+Frames are buffered per session into fixed-axis chunks of float16 power
+rows, sealed as .npz files partitioned by session and day, and described
+in a catalog of per-chunk time/frequency/power statistics so queries only
+open the chunks that can match
+"""
+
+import json
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+
+CATALOG_NAME = 'catalog.jsonl'
+
+# Each chunk records the max power in this many equal frequency bands, so a
+# narrowband query can skip chunks whose strong signals are elsewhere
+STAT_BANDS = 32
+
+def _as_timestamp(value):
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+def _band_max(power, bands=STAT_BANDS):
+    """Max over frames within `bands` contiguous bin groups"""
+    edges = np.linspace(0, power.shape[1], min(bands, power.shape[1]) + 1).astype(np.int64)
+    return np.maximum.reduceat(power.max(axis=0), edges[:-1])
+
+class _OpenChunk:
+    """In-memory chunk being filled for one session"""
+
+    def __init__(self, session_id, axis, capacity, dtype):
+        self.session_id = session_id
+        self.axis = axis  # (start_freq, stop_freq, num_points)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.power = np.zeros((capacity, axis[2]), dtype=dtype)
+        self.count = 0
+
+    @property
+    def day(self):
+        return datetime.fromtimestamp(self.timestamps[0], timezone.utc).date()
+
+    def arrays(self):
+        power = self.power[:self.count]
+        return {
+            'timestamps': self.timestamps[:self.count],
+            'power': power,
+            'frame_max': power.max(axis=1),
+            'axis': np.asarray(self.axis, dtype=np.float64)
+        }
+
+class SpectrumArchive:
+    """Append-only spectrum archive with predicate pushdown queries.
+
+    append() copies a frame into the session's open chunk; a chunk is sealed
+    when it holds chunk_frames frames, spans chunk_seconds, crosses a UTC
+    day or the frequency axis changes. query() filters the catalog on time,
+    frequency and per-band max power, then reads only the surviving chunks
+    (and frames, using each chunk's per-frame maxima).
+    """
+
+    def __init__(self, root, chunk_frames=1024, chunk_seconds=600.0, dtype=np.float16):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.chunk_frames = int(chunk_frames)
+        self.chunk_seconds = float(chunk_seconds)
+        self.dtype = np.dtype(dtype)
+        self._lock = threading.Lock()
+        self._open = {}
+        self._entries = []
+        self._stats = None
+        self._load_catalog()
+
+    def __len__(self):
+        return len(self._entries)
+
+    # Catalog
+
+    def _load_catalog(self):
+        path = self.root / CATALOG_NAME
+        if path.exists():
+            with open(path) as f:
+                self._entries = [json.loads(line) for line in f if line.strip()]
+        self._stats = None
+
+    def _catalog_arrays(self):
+        """Column arrays over the catalog (rebuilt lazily after new chunks)"""
+        if self._stats is None:
+            entries = self._entries
+            self._stats = {
+                'session_id': np.array([entry['session_id'] for entry in entries], dtype=object),
+                't_min': np.array([entry['t_min'] for entry in entries], dtype=np.float64),
+                't_max': np.array([entry['t_max'] for entry in entries], dtype=np.float64),
+                'f_min': np.array([entry['f_min'] for entry in entries], dtype=np.float64),
+                'f_max': np.array([entry['f_max'] for entry in entries], dtype=np.float64),
+                'p_max': np.array([entry['p_max'] for entry in entries], dtype=np.float64)
+            }
+        return self._stats
+
+    def rebuild_catalog(self):
+        """Recreate the catalog from the chunk files on disk"""
+        with self._lock:
+            entries = []
+            for path in sorted(self.root.glob('session_*/*/*.npz')):
+                session = path.parent.parent.name[len('session_'):]
+                session_id = None if session == 'none' else int(session) if session.isdigit() else session
+                with np.load(path) as chunk:
+                    entries.append(self._describe(path, session_id, chunk['timestamps'],
+                                                  chunk['power'], chunk['axis']))
+            with open(self.root / CATALOG_NAME, 'w') as f:
+                f.writelines(json.dumps(entry) + '\n' for entry in entries)
+            self._entries = entries
+            self._stats = None
+
+    def _describe(self, path, session_id, timestamps, power, axis):
+        return {
+            'path': str(path.relative_to(self.root)),
+            'session_id': session_id,
+            't_min': float(timestamps[0]),
+            't_max': float(timestamps[-1]),
+            'f_min': float(axis[0]),
+            'f_max': float(axis[1]),
+            'num_points': int(axis[2]),
+            'frames': len(timestamps),
+            'p_min': float(np.min(power)),
+            'p_max': float(np.max(power)),
+            'band_max': [float(value) for value in _band_max(power)]
+        }
+
+    # Writing
+
+    def append(self, session_id, spectrum_data):
+        """Add one frame (dict with frequencies, power and optional timestamp)"""
+        frequencies = spectrum_data['frequencies']
+        power = spectrum_data['power']
+        axis = (float(frequencies[0]), float(frequencies[-1]), len(power))
+        timestamp = _as_timestamp(spectrum_data.get('timestamp') or datetime.now())
+
+        with self._lock:
+            chunk = self._open.get(session_id)
+            if chunk is not None and (chunk.axis != axis or timestamp - chunk.timestamps[0] >= self.chunk_seconds
+                                      or datetime.fromtimestamp(timestamp, timezone.utc).date() != chunk.day):
+                self._seal(chunk)
+                chunk = None
+            if chunk is None:
+                chunk = self._open[session_id] = _OpenChunk(session_id, axis, self.chunk_frames, self.dtype)
+            chunk.timestamps[chunk.count] = timestamp
+            chunk.power[chunk.count] = power
+            chunk.count += 1
+            if chunk.count == self.chunk_frames:
+                self._seal(chunk)
+
+    def _seal(self, chunk):
+        """Write an open chunk and add it to the catalog (lock held)"""
+        self._open.pop(chunk.session_id, None)
+        if chunk.count == 0:
+            return
+        arrays = chunk.arrays()
+        session = 'none' if chunk.session_id is None else str(chunk.session_id)
+        directory = self.root / f"session_{session}" / chunk.day.isoformat()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{int(arrays['timestamps'][0] * 1000)}-{chunk.count}.npz"
+        np.savez(path, **arrays)
+
+        entry = self._describe(path, chunk.session_id, arrays['timestamps'], arrays['power'], arrays['axis'])
+        with open(self.root / CATALOG_NAME, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+        self._entries.append(entry)
+        self._stats = None
+
+    def flush(self):
+        """Seal every open chunk"""
+        with self._lock:
+            for chunk in list(self._open.values()):
+                self._seal(chunk)
+
+    def close(self):
+        self.flush()
+
+    # Queries
+
+    def query(self, freq_range=None, time_range=None, min_power=None, session_id=None):
+        """Frames matching every given predicate, oldest first.
+
+        freq_range and time_range are (low, high) inclusive, either end may be
+        None; times are Unix seconds or datetimes. With min_power only frames
+        with a bin at or above it inside freq_range are returned. Each match
+        is a dict with session_id, timestamps (n,), frequencies (m,) and
+        power (n, m) restricted to freq_range; frames still buffered in open
+        chunks are included.
+        """
+        f_low, f_high = freq_range or (None, None)
+        t_low, t_high = time_range or (None, None)
+        f_low = -np.inf if f_low is None else float(f_low)
+        f_high = np.inf if f_high is None else float(f_high)
+        t_low = -np.inf if t_low is None else _as_timestamp(t_low)
+        t_high = np.inf if t_high is None else _as_timestamp(t_high)
+
+        with self._lock:
+            stats = self._catalog_arrays()
+            candidates = (stats['t_max'] >= t_low) & (stats['t_min'] <= t_high) & \
+                         (stats['f_max'] >= f_low) & (stats['f_min'] <= f_high)
+            if min_power is not None:
+                candidates &= stats['p_max'] >= min_power
+            if session_id is not None:
+                candidates &= stats['session_id'] == session_id
+            entries = [self._entries[i] for i in np.flatnonzero(candidates)]
+            # Copies of the open buffers: appends continue once the lock is released
+            open_chunks = [(chunk.session_id, {key: value.copy() for key, value in chunk.arrays().items()})
+                           for chunk in self._open.values() if chunk.count]
+
+        results = []
+        for entry in entries:
+            if min_power is not None and not self._bands_reach(entry, f_low, f_high, min_power):
+                continue
+            with np.load(self.root / entry['path']) as chunk:
+                match = self._filter(entry['session_id'], chunk, f_low, f_high, t_low, t_high, min_power)
+            if match is not None:
+                results.append(match)
+        for sid, arrays in open_chunks:
+            if session_id is None or sid == session_id:
+                match = self._filter(sid, arrays, f_low, f_high, t_low, t_high, min_power)
+                if match is not None:
+                    results.append(match)
+
+        results.sort(key=lambda match: match['timestamps'][0])
+        return results
+
+    @staticmethod
+    def _bands_reach(entry, f_low, f_high, min_power):
+        """Whether any statistics band overlapping the range reaches min_power"""
+        band_max = np.asarray(entry['band_max'])
+        edges = np.linspace(0, entry['num_points'], len(band_max) + 1).astype(np.int64)
+        step = (entry['f_max'] - entry['f_min']) / max(1, entry['num_points'] - 1)
+        band_low = entry['f_min'] + edges[:-1] * step
+        band_high = entry['f_min'] + (edges[1:] - 1) * step
+        overlap = (band_high >= f_low) & (band_low <= f_high)
+        return bool(np.any(band_max[overlap] >= min_power))
+
+    @staticmethod
+    def _filter(session_id, chunk, f_low, f_high, t_low, t_high, min_power):
+        """Apply the predicates to one chunk; arrays are read only when needed"""
+        timestamps = chunk['timestamps']
+        frames = (timestamps >= t_low) & (timestamps <= t_high)
+        if min_power is not None:
+            frames &= chunk['frame_max'] >= min_power
+        if not np.any(frames):
+            return None
+
+        start, stop, num_points = chunk['axis']
+        frequencies = np.linspace(start, stop, int(num_points))
+        bins = np.flatnonzero((frequencies >= f_low) & (frequencies <= f_high))
+        if len(bins) == 0:
+            return None
+        rows = np.flatnonzero(frames)
+        power = chunk['power'][rows][:, bins[0]:bins[-1] + 1].astype(np.float32)
+        if min_power is not None:
+            hit = power.max(axis=1) >= min_power
+            rows, power = rows[hit], power[hit]
+            if len(rows) == 0:
+                return None
+        return {
+            'session_id': session_id,
+            'timestamps': timestamps[rows],
+            'frequencies': frequencies[bins[0]:bins[-1] + 1],
+            'power': power
+        }
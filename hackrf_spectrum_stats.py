@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+HackRF Spectrum Statistics - Streaming per-bin statistics shared by detectors
+One update per frame maintains, for every bin, an EWMA mean and variance,
+a percentile noise-floor estimate and a duty-cycle occupancy, plus a
+summary of the frame itself (min/max/mean/std) and a short history of
+frame peaks. All state lives in preallocated arrays updated in place, so
+each frame costs a few vectorized O(bins) passes and no allocation
+"""
+
+import threading
+from collections import OrderedDict
+import numpy as np
+
+class FrameStatistics:
+    """Scalar summary of one frame ('max', 'argmax', 'min', 'mean', 'std'),
+    plus per-frame derived values computed on first use. Readable after
+    the engine has moved on to later frames."""
+
+    def __init__(self, power, summary):
+        self.power = power
+        self.summary = summary
+        self.num_bins = len(power)
+        self._linear = None
+
+    def __getitem__(self, key):
+        return self.summary[key]
+
+    def bins_above(self, level):
+        """Number of bins above `level` dB"""
+        return int(np.count_nonzero(np.greater(self.power, level)))
+
+    def linear_power(self):
+        """The frame in linear units (computed once)"""
+        if self._linear is None:
+            self._linear = np.power(10.0, np.asarray(self.power, dtype=np.float64) / 10.0)
+            self._linear.setflags(write=False)
+        return self._linear
+
+class SpectrumStatistics:
+    """Per-bin streaming statistics over successive power spectra (dB).
+
+    - mean / variance: exponentially weighted with weight `alpha`
+    - noise_floor: running estimate of the `floor_percentile` percentile,
+      moved by at most floor_step_db per frame (stochastic approximation:
+      down by step*(1-p) when a value is below it, up by step*p otherwise)
+    - occupancy: EWMA (weight occupancy_alpha) of the fraction of frames
+      in which the bin was more than occupancy_margin_db above the floor
+
+    Several detectors can share one instance, also from different threads
+    working on different frames: frames are recognised by the identity of
+    their power array (so producers must not refill one array in place),
+    each is counted once whichever detector sees it first, and observe()
+    returns that frame's own FrameStatistics for the last recent_frames
+    frames. Read-only arrays are views of the internal
+    state and change on the next update.
+    """
+
+    def __init__(self, num_bins=None, alpha=0.1, floor_percentile=10.0, floor_step_db=0.5,
+                 occupancy_margin_db=10.0, occupancy_alpha=0.05, peak_history=100, recent_frames=64):
+        if not 0 < alpha <= 1 or not 0 < occupancy_alpha <= 1:
+            raise ValueError("alpha and occupancy_alpha must be in (0, 1]")
+        if not 0 < floor_percentile < 100:
+            raise ValueError("floor_percentile must be between 0 and 100")
+        self.alpha = float(alpha)
+        self.floor_quantile = floor_percentile / 100.0
+        self.floor_step_db = float(floor_step_db)
+        self.occupancy_margin_db = float(occupancy_margin_db)
+        self.occupancy_alpha = float(occupancy_alpha)
+        self._peaks = np.zeros(int(peak_history))
+        self._lock = threading.RLock()
+        self.num_bins = None
+        self.frames = 0
+        self._recent = OrderedDict()
+        self.recent_frames = int(recent_frames)
+        if num_bins is not None:
+            self.reset(num_bins)
+
+    def reset(self, num_bins=None):
+        """Forget all history (and change the bin count if num_bins is given)"""
+        with self._lock:
+            if num_bins is not None and num_bins != self.num_bins:
+                self.num_bins = int(num_bins)
+                shape = (self.num_bins,)
+                self._mean = np.zeros(shape)
+                self._variance = np.zeros(shape)
+                self._floor = np.zeros(shape)
+                self._occupancy = np.zeros(shape)
+                self._frame = np.zeros(shape)
+                self._delta = np.zeros(shape)
+                self._scratch = np.zeros(shape)
+                self._mask = np.zeros(shape, dtype=bool)
+                self._linear = np.zeros(shape)
+            self.frames = 0
+            self._recent.clear()
+            self._linear_valid = False
+            self._peak_count = 0
+            self.frame = {}
+
+    def update(self, power):
+        """Fold one spectrum into the statistics; False if this array was already counted"""
+        with self._lock:
+            seen = self._recent.get(id(power))
+            if seen is not None and seen.power is power:
+                return False
+            if self.num_bins is None or len(power) != self.num_bins:
+                self.reset(len(power))
+            x = self._frame
+            x[:] = power
+            self._linear_valid = False
+
+            if self.frames == 0:
+                self._mean[:] = x
+                self._variance.fill(0.0)
+                self._floor[:] = x
+                self._occupancy.fill(0.0)
+            else:
+                # EWMA mean and variance (West's incremental form)
+                np.subtract(x, self._mean, out=self._delta)
+                np.square(self._delta, out=self._scratch)
+                self._delta *= self.alpha
+                self._mean += self._delta
+                self._scratch *= self.alpha
+                self._variance += self._scratch
+                self._variance *= 1.0 - self.alpha
+
+                # Percentile tracker: step up by step*p, down by step*(1-p)
+                np.less(x, self._floor, out=self._mask)
+                np.copyto(self._scratch, self.floor_step_db * self.floor_quantile)
+                np.copyto(self._scratch, -self.floor_step_db * (1.0 - self.floor_quantile), where=self._mask)
+                self._floor += self._scratch
+
+                # Duty cycle of bins standing clear of their floor
+                np.subtract(x, self._floor, out=self._scratch)
+                np.greater(self._scratch, self.occupancy_margin_db, out=self._mask)
+                self._occupancy *= 1.0 - self.occupancy_alpha
+                np.add(self._occupancy, self.occupancy_alpha, out=self._occupancy, where=self._mask)
+
+            peak_index = int(np.argmax(x))
+            peak = x[peak_index]
+            mean = x.mean()
+            np.subtract(x, mean, out=self._scratch)
+            self.frame = {
+                'max': float(peak),
+                'argmax': peak_index,
+                'min': float(x.min()),
+                'mean': float(mean),
+                'std': float(np.sqrt(np.dot(self._scratch, self._scratch) / len(x)))
+            }
+            self._peaks[self._peak_count % len(self._peaks)] = peak
+            self._peak_count += 1
+            self.frames += 1
+
+            self._recent[id(power)] = FrameStatistics(power, self.frame)
+            if len(self._recent) > self.recent_frames:
+                self._recent.popitem(last=False)
+            return True
+
+    def frame_statistics(self, power):
+        """FrameStatistics of a power array, folding it in first if it is new"""
+        with self._lock:
+            self.update(power)
+            return self._recent[id(power)]
+
+    def observe(self, spectrum_data):
+        """frame_statistics() of a spectrum_data dict"""
+        return self.frame_statistics(spectrum_data['power'])
+
+    @staticmethod
+    def _readonly(array):
+        view = array.view()
+        view.setflags(write=False)
+        return view
+
+    @property
+    def mean(self):
+        return self._readonly(self._mean)
+
+    @property
+    def variance(self):
+        return self._readonly(self._variance)
+
+    @property
+    def noise_floor(self):
+        return self._readonly(self._floor)
+
+    @property
+    def occupancy(self):
+        return self._readonly(self._occupancy)
+
+    def std(self):
+        """Per-bin EWMA standard deviation (a new array)"""
+        return np.sqrt(self._variance)
+
+    def bins_above(self, level):
+        """Number of bins of the current frame above `level` dB"""
+        with self._lock:
+            np.greater(self._frame, level, out=self._mask)
+            return int(np.count_nonzero(self._mask))
+
+    def linear_power(self):
+        """Current frame in linear units (computed once per frame)"""
+        with self._lock:
+            if not self._linear_valid:
+                np.multiply(self._frame, np.log(10.0) / 10.0, out=self._linear)
+                np.exp(self._linear, out=self._linear)
+                self._linear_valid = True
+            return self._readonly(self._linear)
+
+    def recent_peak_mean(self, count, skip=0):
+        """Mean of the frame peaks `skip` to `skip + count` frames back, or None if not yet seen"""
+        with self._lock:
+            available = min(self._peak_count, len(self._peaks))
+            count = min(count, available - skip)
+            if count <= 0:
+                return None
+            newest = self._peak_count - 1 - skip
+            indices = np.arange(newest - count + 1, newest + 1) % len(self._peaks)
+            return float(self._peaks[indices].mean())
+
+    def peak_history_length(self):
+        """Frame peaks currently held"""
+        return min(self._peak_count, len(self._peaks))
+
+    def summary(self):
+        """Scalar summary of the current frame and the long-run state"""
+        with self._lock:
+            if not self.frames:
+                return {}
+            return dict(self.frame,
+                        noise_floor=float(np.median(self._floor)),
+                        occupancy=float(self._occupancy.mean()),
+                        frames=self.frames)
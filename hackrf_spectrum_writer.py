@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+HackRF Spectrum Writer - Batched, binary spectrum persistence to SQLite
+Frames are encoded on the caller's thread (power as a float16/float32
+blob, the frequency axis reduced to a per-session axis row) and written by
+one long-lived connection in WAL mode, a batch per transaction
+"""
+
+import json
+import atexit
+import queue
+import weakref
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Writers still open at interpreter exit get their backlog committed, each
+# within EXIT_TIMEOUT seconds; the weak set does not keep writers alive
+EXIT_TIMEOUT = 5.0
+_open_writers = weakref.WeakSet()
+
+@atexit.register
+def _close_open_writers():
+    for writer in list(_open_writers):
+        writer.close(timeout=EXIT_TIMEOUT)
+
+# Blob encodings of spectrum_data.data_blob; 'json' marks legacy rows
+POWER_ENCODINGS = {
+    'float16': np.float16,
+    'float32': np.float32
+}
+
+def ensure_spectrum_schema(conn):
+    """Create the axis table and add the binary-format columns to spectrum_data"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS spectrum_axes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER,
+            center_freq REAL,
+            sample_rate REAL,
+            num_points INTEGER,
+            start_freq REAL,
+            stop_freq REAL,
+            UNIQUE (session_id, center_freq, sample_rate, num_points, start_freq, stop_freq),
+            FOREIGN KEY (session_id) REFERENCES sessions (id)
+        )
+    ''')
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(spectrum_data)')}
+    for name, declaration in (('axis_id', 'INTEGER'), ('encoding', "TEXT DEFAULT 'json'"),
+                              ('peaks', 'TEXT')):
+        if name not in columns:
+            conn.execute(f'ALTER TABLE spectrum_data ADD COLUMN {name} {declaration}')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_spectrum_session ON spectrum_data (session_id, timestamp)')
+
+def encode_frame(session_id, spectrum_data, encoding='float16'):
+    """Row tuple for one spectrum frame (everything the writer thread needs)"""
+    frequencies = spectrum_data['frequencies']
+    power = np.asarray(spectrum_data['power'])
+    axis = (session_id, float(spectrum_data['center_freq']), float(spectrum_data['sample_rate']),
+            len(power), float(frequencies[0]), float(frequencies[-1]))
+    timestamp = spectrum_data.get('timestamp')
+    timestamp = datetime.fromtimestamp(timestamp) if timestamp else datetime.now()
+    peaks = spectrum_data.get('peaks') or []
+    return (axis, timestamp.isoformat(), float(np.max(power)),
+            power.astype(POWER_ENCODINGS[encoding]).tobytes(), encoding,
+            json.dumps(peaks, default=float) if len(peaks) else None)
+
+def decode_frame(row):
+    """Spectrum dict from a spectrum_data row joined with its axis.
+
+    `row` is (timestamp, center_freq, sample_rate, max_power, data_blob,
+    encoding, peaks, num_points, start_freq, stop_freq); legacy JSON rows
+    carry their own axis.
+    """
+    timestamp, center_freq, sample_rate, max_power, blob, encoding, peaks, num_points, start, stop = row
+    if encoding in POWER_ENCODINGS:
+        power = np.frombuffer(blob, dtype=POWER_ENCODINGS[encoding]).astype(np.float32)
+        frequencies = np.linspace(start, stop, num_points)
+        peaks = json.loads(peaks) if peaks else []
+    else:
+        data = json.loads(blob)
+        power = np.asarray(data['power'], dtype=np.float32)
+        frequencies = np.asarray(data['frequencies'])
+        peaks = data.get('peaks', [])
+    return {
+        'timestamp': timestamp,
+        'center_freq': center_freq,
+        'sample_rate': sample_rate,
+        'max_power': max_power,
+        'frequencies': frequencies,
+        'power': power,
+        'peaks': peaks
+    }
+
+class SpectrumWriter:
+    """Background writer for spectrum frames.
+
+    save() encodes the frame and queues it without touching the database;
+    the writer thread drains the queue in batches of up to batch_size (or
+    whatever arrived within flush_interval) with one executemany per
+    transaction. When the queue is full the frame is dropped and counted
+    rather than stalling the capture loop.
+    """
+
+    def __init__(self, db_path, encoding='float16', batch_size=64, flush_interval=0.5, max_queue=1024):
+        if encoding not in POWER_ENCODINGS:
+            raise ValueError(f"Unsupported power encoding: {encoding} (expected one of {', '.join(POWER_ENCODINGS)})")
+        self.db_path = db_path
+        self.encoding = encoding
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._axis_ids = {}
+
+        self.frames_queued = 0
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.batches_written = 0
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='spectrum-writer', daemon=True)
+                self._thread.start()
+                # Commit whatever is still queued when the interpreter exits
+                _open_writers.add(self)
+
+    def save(self, session_id, spectrum_data):
+        """Queue one frame; returns False if it was dropped"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(encode_frame(session_id, spectrum_data, self.encoding))
+        except queue.Full:
+            self.frames_dropped += 1
+            if self.frames_dropped == 1 or self.frames_dropped % 100 == 0:
+                logger.warning(f"Spectrum writer backlog full, {self.frames_dropped} frames dropped")
+            return False
+        self.frames_queued += 1
+        return True
+
+    def flush(self, timeout=None):
+        """Block until every frame queued so far is committed"""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=None):
+        """Commit the backlog and stop the writer thread"""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            logger.error("Spectrum writer queue still full; not waiting for it to drain")
+            return
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.error("Spectrum writer did not stop within the timeout")
+            return
+        self._thread = None
+        _open_writers.discard(self)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        ensure_spectrum_schema(conn)
+        conn.commit()
+        return conn
+
+    def _axis_id(self, conn, axis):
+        axis_id = self._axis_ids.get(axis)
+        if axis_id is None:
+            conn.execute('''
+                INSERT OR IGNORE INTO spectrum_axes
+                (session_id, center_freq, sample_rate, num_points, start_freq, stop_freq)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', axis)
+            axis_id = conn.execute('''
+                SELECT id FROM spectrum_axes WHERE session_id IS ? AND center_freq = ? AND sample_rate = ?
+                AND num_points = ? AND start_freq = ? AND stop_freq = ?
+            ''', axis).fetchone()[0]
+            self._axis_ids[axis] = axis_id
+        return axis_id
+
+    def _write(self, conn, frames):
+        rows = [(axis[0], timestamp, axis[1], axis[2], max_power, blob, self._axis_id(conn, axis), encoding, peaks)
+                for axis, timestamp, max_power, blob, encoding, peaks in frames]
+        with conn:
+            conn.executemany('''
+                INSERT INTO spectrum_data
+                (session_id, timestamp, center_freq, sample_rate, max_power, data_blob, axis_id, encoding, peaks)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+        self.frames_written += len(rows)
+        self.batches_written += 1
+
+    def _run(self):
+        conn = None
+        try:
+            conn = self._connect()
+        except Exception as e:
+            logger.error(f"Spectrum writer database error: {e}")
+
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            frames, markers = [], []
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    frames.append(item)
+                if stop or markers or len(frames) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    break
+
+            if frames and conn is not None:
+                try:
+                    self._write(conn, frames)
+                except Exception as e:
+                    logger.error(f"Spectrum data save error: {e}")
+            for marker in markers:
+                marker.set()
+
+        if conn is not None:
+            conn.close()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+HackRF Stage Pipeline - Bounded, multi-threaded processing chain
+Each stage has its own worker thread(s) and a bounded input queue with a
+drop policy, so stages overlap: throughput is set by the slowest stage
+rather than the sum of all of them, and an overloaded stage sheds or
+back-pressures work instead of growing memory. Every stage keeps counters
+and latency figures for status displays
+"""
+
+import time
+import threading
+from collections import deque
+
+# What a full stage queue does with a new item
+BLOCK = 'block'                # wait for room (back-pressure the previous stage)
+DROP_NEWEST = 'drop_newest'    # discard the new item
+DROP_OLDEST = 'drop_oldest'    # discard the oldest queued item, keep the new one
+DROP_POLICIES = (BLOCK, DROP_NEWEST, DROP_OLDEST)
+
+_STOP = object()
+
+class _StageQueue:
+    """Bounded FIFO applying a drop policy when full"""
+
+    def __init__(self, maxsize, policy):
+        self.maxsize = max(1, int(maxsize))
+        self.policy = policy
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def put(self, item, timeout=None):
+        """Enqueue; returns the number of items dropped (0 or 1)"""
+        with self._lock:
+            if len(self._items) >= self.maxsize:
+                if self.policy == DROP_NEWEST:
+                    return 1
+                if self.policy == DROP_OLDEST:
+                    self._items.popleft()
+                    self._items.append(item)
+                    self._not_empty.notify()
+                    return 1
+                if not self._not_full.wait_for(lambda: len(self._items) < self.maxsize, timeout):
+                    return 1
+            self._items.append(item)
+            self._not_empty.notify()
+            return 0
+
+    def put_control(self, item):
+        """Enqueue ignoring the bound (shutdown markers)"""
+        with self._lock:
+            self._items.append(item)
+            self._not_empty.notify()
+
+    def get(self):
+        with self._lock:
+            self._not_empty.wait_for(lambda: self._items)
+            item = self._items.popleft()
+            self._not_full.notify()
+            return item
+
+    def __len__(self):
+        return len(self._items)
+
+class Stage:
+    """One step of a StagePipeline.
+
+    `function(item)` returns the item for the next stage, or None to end
+    the item's journey here. Exceptions are counted and logged through
+    on_error, and the item is dropped.
+    """
+
+    def __init__(self, name, function, maxsize=8, policy=BLOCK, workers=1):
+        if policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy: {policy} (expected one of {', '.join(DROP_POLICIES)})")
+        self.name = name
+        self.function = function
+        self.workers = max(1, int(workers))
+        self.queue = _StageQueue(maxsize, policy)
+        self.next = None
+        self._threads = []
+        self._lock = threading.Lock()
+
+        self.received = 0
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.latency = None      # EWMA seconds in function()
+        self.max_latency = 0.0
+        self.wait = None         # EWMA seconds spent queued
+        self.busy = 0.0          # total seconds in function()
+
+    def offer(self, item, timeout=None):
+        """Hand an item to this stage; False if its drop policy discarded one"""
+        with self._lock:
+            self.received += 1
+        dropped = self.queue.put((time.perf_counter(), item), timeout)
+        if dropped:
+            with self._lock:
+                self.dropped += dropped
+        return not dropped
+
+    def _record(self, waited, elapsed):
+        with self._lock:
+            self.processed += 1
+            self.busy += elapsed
+            self.max_latency = max(self.max_latency, elapsed)
+            self.latency = elapsed if self.latency is None else 0.9 * self.latency + 0.1 * elapsed
+            self.wait = waited if self.wait is None else 0.9 * self.wait + 0.1 * waited
+
+    def stats(self):
+        with self._lock:
+            return {
+                'received': self.received,
+                'processed': self.processed,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'queued': len(self.queue),
+                'capacity': self.queue.maxsize,
+                'policy': self.queue.policy,
+                'latency_ms': None if self.latency is None else self.latency * 1e3,
+                'max_latency_ms': self.max_latency * 1e3,
+                'queue_wait_ms': None if self.wait is None else self.wait * 1e3,
+                'busy_seconds': self.busy
+            }
+
+class StagePipeline:
+    """Linear chain of Stages, each on its own worker thread(s).
+
+    Build with add_stage() in order, start(), then submit() items into the
+    first stage from the producer (capture) thread. stop() lets queued
+    items drain (up to a timeout) and joins the workers.
+    """
+
+    def __init__(self, name='pipeline', on_error=None):
+        self.name = name
+        self.stages = []
+        self.on_error = on_error
+        self.running = False
+        self.started_at = None
+        self.completed = 0       # items that finished (last stage, or a stage returned None)
+        self._lock = threading.Lock()
+
+    def add_stage(self, name, function, maxsize=8, policy=BLOCK, workers=1):
+        if self.running:
+            raise ValueError("Cannot add stages to a running pipeline")
+        stage = Stage(name, function, maxsize, policy, workers)
+        if self.stages:
+            self.stages[-1].next = stage
+        self.stages.append(stage)
+        return stage
+
+    def start(self):
+        if not self.stages:
+            raise ValueError("Pipeline has no stages")
+        self.running = True
+        self.started_at = time.perf_counter()
+        self.completed = 0
+        for stage in self.stages:
+            for index in range(stage.workers):
+                thread = threading.Thread(target=self._work, args=(stage,), daemon=True,
+                                          name=f"{self.name}-{stage.name}-{index}")
+                stage._threads.append(thread)
+                thread.start()
+        return self
+
+    def submit(self, item, timeout=None):
+        """Feed the first stage; False if its drop policy discarded an item"""
+        if not self.running:
+            raise ValueError("Pipeline is not running")
+        return self.stages[0].offer(item, timeout)
+
+    def _work(self, stage):
+        while True:
+            queued_at, item = stage.queue.get()
+            if item is _STOP:
+                return
+            started = time.perf_counter()
+            try:
+                result = stage.function(item)
+            except Exception as e:
+                with stage._lock:
+                    stage.errors += 1
+                if self.on_error is not None:
+                    self.on_error(stage.name, e)
+                continue
+            stage._record(started - queued_at, time.perf_counter() - started)
+            if result is not None and stage.next is not None:
+                stage.next.offer(result)
+            else:
+                with self._lock:
+                    self.completed += 1
+
+    def stop(self, timeout=5.0):
+        """Drain and stop the stages in order; returns False if a worker did not finish in time"""
+        if not self.running:
+            return True
+        self.running = False
+        deadline = time.perf_counter() + timeout
+        finished = True
+        for stage in self.stages:
+            for _ in stage._threads:
+                stage.queue.put_control((time.perf_counter(), _STOP))
+            for thread in stage._threads:
+                thread.join(max(0.0, deadline - time.perf_counter()))
+                finished = finished and not thread.is_alive()
+            stage._threads = []
+        return finished
+
+    def stats(self):
+        """Per-stage counters and latencies, plus end-to-end throughput and the bottleneck stage"""
+        stages = {stage.name: stage.stats() for stage in self.stages}
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        busiest = max(self.stages, key=lambda stage: stage.busy / stage.workers, default=None)
+        return {
+            'stages': stages,
+            'completed': self.completed,
+            'throughput': self.completed / elapsed if elapsed > 0 else 0.0,
+            'bottleneck': busiest.name if busiest is not None and busiest.busy else None
+        }
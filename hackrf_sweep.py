@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+HackRF Sweep - Wideband survey by retuning across the band (hackrf_sweep style)
+Each retune captures one dwell at the full sample rate and turns it into
+an overlapped Welch PSD. Only the flat central part of the band is kept:
+the anti-alias roll-off at the edges is cut away and the DC spike is
+interpolated over. The retune step equals the kept width, so neighbouring
+captures overlap and their kept parts tile the range, giving one
+full-resolution panorama per pass
+"""
+
+import time
+import numpy as np
+from hackrf_spectral import WelchSpectrumEngine, get_window
+
+class SimulatedSweepSource:
+    """IQ capture stand-in: complex noise plus fixed carriers.
+
+    `noise_db` is the noise level per PSD bin and each signal is
+    (frequency, power_db) as the sweep engine will report them (same
+    window and FFT size). Call as source(center_freq, sample_rate, num_samples).
+    """
+
+    def __init__(self, signals=(), noise_db=-90.0, fft_size=1024, window='hann', seed=None):
+        self.signals = [(float(frequency), float(power)) for frequency, power in signals]
+        self.noise_db = float(noise_db)
+        w = get_window(window, fft_size).astype(np.float64)
+        # Noise variance that reads noise_db per bin after the Welch scaling
+        self._noise_sigma = np.sqrt(10 ** (self.noise_db / 10) * np.sum(w) ** 2 / np.sum(w ** 2) / 2)
+        self._rng = np.random.default_rng(seed)
+        self._t = None
+
+    def __call__(self, center_freq, sample_rate, num_samples):
+        noise = self._rng.standard_normal((num_samples, 2), dtype=np.float32)
+        samples = noise.view(np.complex64)[:, 0] * np.float32(self._noise_sigma)
+        if self._t is None or len(self._t) != num_samples:
+            self._t = np.arange(num_samples)
+        for frequency, power in self.signals:
+            offset = frequency - center_freq
+            if abs(offset) < sample_rate / 2:
+                phase = (2 * np.pi * offset / sample_rate) * self._t
+                samples += (10 ** (power / 20) * np.exp(1j * phase)).astype(np.complex64)
+        return samples
+
+class SweepEngine:
+    """Retune-and-stitch wideband spectrum survey.
+
+    With a sample rate fs and fft_size bins, every retune keeps the
+    central usable_fraction of its bins (rounded to an even count K) and
+    the next retune is K bins higher. Bin k of retune i therefore lands at
+    start_freq + (i * K + k) * fs / fft_size, so the panorama has the FFT
+    resolution across the whole range. dc_bins bins around the centre
+    (the LO leakage) are replaced by their neighbours' mean.
+
+    capture(center_freq, sample_rate, num_samples) returns complex IQ;
+    dwell_samples per retune are averaged as overlapped Welch frames.
+    """
+
+    def __init__(self, capture=None, sample_rate=20e6, fft_size=1024, dwell_samples=8192,
+                 usable_fraction=0.75, dc_bins=1, overlap=0.5, window='hann'):
+        if not 0 < usable_fraction <= 1:
+            raise ValueError("usable_fraction must be in (0, 1]")
+        self.capture = capture if capture is not None else SimulatedSweepSource(fft_size=fft_size, window=window)
+        self.sample_rate = float(sample_rate)
+        self.fft_size = int(fft_size)
+        self.dwell_samples = max(self.fft_size, int(dwell_samples))
+        self.bin_width = self.sample_rate / self.fft_size
+        self.usable_bins = max(2, int(self.fft_size * usable_fraction) // 2 * 2)
+        self.step = self.usable_bins * self.bin_width
+        self.dc_bins = max(0, int(dc_bins))
+        self.welch = WelchSpectrumEngine(self.fft_size, overlap=overlap, averaging=1, window=window, shifted=True)
+        # Kept slice of the shifted spectrum and the DC bins inside it
+        self._keep = slice(self.fft_size // 2 - self.usable_bins // 2, self.fft_size // 2 + self.usable_bins // 2)
+        # dc_bins bins starting dc_bins // 2 below the DC bin (centred for odd counts)
+        first = self.usable_bins // 2 - self.dc_bins // 2
+        self._dc = slice(first, first + self.dc_bins) if self.dc_bins else None
+        self._panorama = np.zeros((0, self.usable_bins))
+
+    def plan(self, start_freq, stop_freq):
+        """Retune centre frequencies covering start_freq..stop_freq"""
+        if stop_freq <= start_freq:
+            raise ValueError("stop_freq must be above start_freq")
+        retunes = int(np.ceil((stop_freq - start_freq + self.bin_width) / self.step))
+        return start_freq + (np.arange(retunes) + 0.5) * self.step
+
+    def sweep(self, start_freq, stop_freq, keep_running=None):
+        """One pass over the range.
+
+        Returns {'frequencies', 'power' (dB), 'bin_width', 'retunes',
+        'duration', 'complete'}; if keep_running() turns False the pass
+        stops early and covers the retunes done so far.
+        """
+        started = time.perf_counter()
+        centers = self.plan(start_freq, stop_freq)
+        if len(self._panorama) < len(centers):
+            self._panorama = np.zeros((len(centers), self.usable_bins))
+        panorama = self._panorama[:len(centers)]
+
+        done = 0
+        for center in centers:
+            if keep_running is not None and not keep_running():
+                break
+            self.welch.reset()
+            psd = self.welch.block_psd(self.capture(center, self.sample_rate, self.dwell_samples))
+            segment = panorama[done]
+            segment[:] = psd[self._keep]
+            if self._dc is not None:
+                segment[self._dc] = 0.5 * (segment[self._dc.start - 1] + segment[self._dc.stop])
+            done += 1
+
+        # Stitched bins up to stop_freq (or as far as the pass got)
+        count = min(done * self.usable_bins, int(round((stop_freq - start_freq) / self.bin_width)) + 1)
+        power = panorama[:done].reshape(-1)[:count]
+        power = 10 * np.log10(np.maximum(power, 1e-20))
+        return {
+            'frequencies': start_freq + np.arange(count) * self.bin_width,
+            'power': power,
+            'bin_width': self.bin_width,
+            'retunes': done,
+            'duration': time.perf_counter() - started,
+            'complete': done == len(centers)
+        }
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+HackRF Temporal - Periodicity and frequency-hopping detection across frames
+Each spectrum is reduced to at most a few hundred frequency bands, and a band is
+'on' when its mean power stands on_db above a running per-band floor.
+Over a sliding window of frames the engine keeps (1) lagged products of the
+on/off sequences, so the autocorrelation of every band at every lag is
+available without rescanning the window, and (2) the strongest active
+bands of each frame linked to the previous frame's, counting unlinked
+appearances as hops. Both are updated by adding the newest frame and
+removing the one leaving the window, so the cost per frame is constant
+"""
+
+import numpy as np
+
+class TemporalPatternEngine:
+    """Sliding-window temporal analysis of a spectrum stream.
+
+    Periodicity: for each band with a duty cycle between min_duty and
+    max_duty, the normalised autocorrelation of its on/off sequence over
+    lags 1..max_lag; a band is periodic when some lag >= min_period reaches
+    min_correlation (the shortest lag within 10 % of the best is the
+    period, so multiples of the period are not reported).
+
+    Hopping: up to max_peaks strongest 'on' bands per frame are tracked; a
+    peak with no peak of the last active frame (at most max_gap frames
+    back) within link_bands is a hop. A hopper shows min_hops hops spread
+    over min_channels distinct bands within the window.
+
+    Bands average at least min_band_bins bins, which keeps the band noise
+    well inside on_db. A SpectrumStatistics instance, if given, supplies the frame's linear
+    power (computed once per frame for every detector).
+    """
+
+    def __init__(self, window=128, max_lag=32, bands=128, min_band_bins=32, on_db=6.0, floor_percentile=10.0,
+                 floor_step_db=0.5, min_period=2, min_duty=0.02, max_duty=0.8, min_correlation=0.5,
+                 max_peaks=4, link_bands=1, max_gap=3, min_hops=6, min_channels=4, statistics=None):
+        if max_lag >= window:
+            raise ValueError("max_lag must be smaller than window")
+        self.window = int(window)
+        self.max_lag = int(max_lag)
+        self.max_bands = int(bands)
+        self.min_band_bins = max(1, int(min_band_bins))
+        self.on_db = float(on_db)
+        self.floor_quantile = floor_percentile / 100.0
+        self.floor_step_db = float(floor_step_db)
+        self.min_period = max(1, int(min_period))
+        self.min_duty = float(min_duty)
+        self.max_duty = float(max_duty)
+        self.min_correlation = float(min_correlation)
+        self.max_peaks = int(max_peaks)
+        self.link_bands = int(link_bands)
+        self.max_gap = int(max_gap)
+        self.min_hops = int(min_hops)
+        self.min_channels = int(min_channels)
+        self.statistics = statistics
+
+        # Ring of frames: window for the sums plus max_lag of lag context
+        self.capacity = self.window + self.max_lag
+        self._lags = np.arange(self.max_lag + 1)
+        self._lag_slots = np.zeros(self.max_lag + 1, dtype=np.intp)
+        self._axis = None
+        self._last_power = None
+        self.frame_interval = None
+        self._last_timestamp = None
+
+    def reset(self, frequencies):
+        """Restart the history for a frequency axis (new tuning or FFT size)"""
+        frequencies = np.asarray(frequencies, dtype=np.float64)
+        num_bins = len(frequencies)
+        # Averaging enough bins per band keeps noise from crossing on_db
+        bands = max(1, min(self.max_bands, num_bins // self.min_band_bins))
+        self._starts = (np.arange(bands) * num_bins) // bands
+        self._sizes = np.diff(np.append(self._starts, num_bins)).astype(np.float64)
+        self.band_frequencies = np.add.reduceat(frequencies, self._starts) / self._sizes
+        self.num_bands = bands
+        self._axis = (num_bins, float(frequencies[0]), float(frequencies[-1]))
+
+        self._band_db = np.zeros(bands)
+        self._excess = np.zeros(bands)
+        self._floor = None
+        self._step = np.zeros(bands)
+        self._below = np.zeros(bands, dtype=bool)
+        self._on = np.zeros((self.capacity, bands), dtype=np.int32)
+        self._lagged = np.zeros((self.max_lag + 1, bands), dtype=np.int32)
+        self._products = np.zeros((self.max_lag + 1, bands), dtype=np.int64)
+        self._sums = np.zeros((self.max_lag + 1, bands), dtype=np.int64)
+
+        self._peaks = np.full((self.capacity, self.max_peaks), -1, dtype=np.intp)
+        self._hops = np.zeros(self.capacity, dtype=np.int64)
+        self._visits = np.zeros(bands, dtype=np.int64)
+        self._hop_total = 0
+        self._peak_total = 0
+        self._active = np.empty(0, dtype=np.intp)
+        self._active_age = self.max_gap + 1
+        self.frames = 0
+        self._last_timestamp = None
+        self.frame_interval = None
+
+    def update(self, spectrum_data):
+        """Add one frame; False if this frame was already added"""
+        power = spectrum_data['power']
+        if power is self._last_power:
+            return False
+        self._last_power = power
+        frequencies = spectrum_data['frequencies']
+        if self._axis != (len(frequencies), float(frequencies[0]), float(frequencies[-1])):
+            self.reset(frequencies)
+        self._track_time(spectrum_data.get('timestamp'))
+
+        # Band energy: dB of the mean linear power across each band's bins
+        if self.statistics is not None:
+            linear = self.statistics.observe(spectrum_data).linear_power()
+        else:
+            linear = np.power(10.0, np.asarray(power, dtype=np.float64) / 10.0)
+        np.add.reduceat(linear, self._starts, out=self._band_db)
+        self._band_db /= self._sizes
+        np.log10(np.maximum(self._band_db, 1e-30, out=self._band_db), out=self._band_db)
+        self._band_db *= 10.0
+
+        # Per-band percentile floor (same tracker as SpectrumStatistics)
+        if self._floor is None:
+            self._floor = self._band_db.copy()
+        else:
+            np.less(self._band_db, self._floor, out=self._below)
+            np.copyto(self._step, self.floor_step_db * self.floor_quantile)
+            np.copyto(self._step, -self.floor_step_db * (1.0 - self.floor_quantile), where=self._below)
+            self._floor += self._step
+        np.subtract(self._band_db, self._floor, out=self._excess)
+
+        slot = self.frames % self.capacity
+        self._update_correlation(slot)
+        self._update_tracks(slot)
+        self.frames += 1
+        return True
+
+    def _track_time(self, timestamp):
+        if timestamp is None:
+            return
+        if self._last_timestamp is not None and timestamp > self._last_timestamp:
+            interval = timestamp - self._last_timestamp
+            self.frame_interval = interval if self.frame_interval is None else \
+                0.9 * self.frame_interval + 0.1 * interval
+        self._last_timestamp = timestamp
+
+    def _update_correlation(self, slot):
+        """Slide the lagged on/off products by one frame"""
+        t = self.frames
+        # Remove the pairs of the frame leaving the window (before its
+        # oldest partner's slot is overwritten by the new frame)
+        leaving = t - self.window
+        if leaving >= 0:
+            np.subtract(leaving, self._lags, out=self._lag_slots)
+            np.remainder(self._lag_slots, self.capacity, out=self._lag_slots)
+            np.take(self._on, self._lag_slots, axis=0, out=self._lagged)
+            np.multiply(self._lagged, self._on[leaving % self.capacity], out=self._products)
+            self._sums -= self._products
+
+        np.greater(self._excess, self.on_db, out=self._on[slot])
+        np.subtract(t, self._lags, out=self._lag_slots)
+        np.remainder(self._lag_slots, self.capacity, out=self._lag_slots)
+        # Lags reaching back before the first frame land on unwritten (zero) slots
+        np.take(self._on, self._lag_slots, axis=0, out=self._lagged)
+        np.multiply(self._lagged, self._on[slot], out=self._products)
+        self._sums += self._products
+
+    def _update_tracks(self, slot):
+        """Link this frame's strongest active bands to the last active frame's"""
+        leaving = self.frames - self.window
+        if leaving >= 0:
+            old = self._peaks[leaving % self.capacity]
+            old = old[old >= 0]
+            np.subtract.at(self._visits, old, 1)
+            self._peak_total -= len(old)
+            self._hop_total -= self._hops[leaving % self.capacity]
+
+        on = np.flatnonzero(self._on[slot])
+        if len(on) > self.max_peaks:
+            on = on[np.argpartition(self._excess[on], -self.max_peaks)[-self.max_peaks:]]
+        self._peaks[slot].fill(-1)
+        self._peaks[slot, :len(on)] = on
+        np.add.at(self._visits, on, 1)
+        self._peak_total += len(on)
+
+        hops = 0
+        if len(on):
+            if len(self._active) and self._active_age <= self.max_gap:
+                distance = np.abs(on[:, None] - self._active[None, :]).min(axis=1)
+                hops = int(np.count_nonzero(distance > self.link_bands))
+            self._active = on
+            self._active_age = 0
+        self._active_age += 1
+        self._hops[slot] = hops
+        self._hop_total += hops
+
+    def _window_frames(self):
+        return min(self.frames, self.window)
+
+    def autocorrelation(self):
+        """Normalised autocorrelation, shape (max_lag + 1, bands), of each band's on/off sequence"""
+        n = self._window_frames()
+        if n == 0:
+            return np.zeros((self.max_lag + 1, self.num_bands if self._axis else 0))
+        # Pairs per lag: later frame in the window, earlier one seen
+        pairs = np.clip(np.minimum(n, self.frames - self._lags), 1, None)[:, None]
+        duty = self._sums[0] / n
+        variance = duty - duty ** 2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            correlation = (self._sums / pairs - duty ** 2) / variance
+        correlation[:, variance <= 0] = 0.0
+        return correlation
+
+    def periodicity(self):
+        """Strongest periodic band as a dict, or None"""
+        n = self._window_frames()
+        if self._axis is None or n < 3 * self.min_period:
+            return None
+        duty = self._sums[0] / n
+        correlation = self.autocorrelation()[self.min_period:]
+        # A period needs at least three repetitions inside the window
+        usable = (self._lags[self.min_period:] * 3 <= n)[:, None]
+        correlation = np.where(usable, correlation, -np.inf)
+        best = correlation.max(axis=0)
+        candidates = (duty >= self.min_duty) & (duty <= self.max_duty) & (best >= self.min_correlation)
+        if not np.any(candidates):
+            return None
+
+        band = int(np.flatnonzero(candidates)[np.argmax(best[candidates])])
+        # Shortest lag close to the best one: the fundamental, not a multiple
+        lag = self.min_period + int(np.argmax(correlation[:, band] >= 0.9 * best[band]))
+        result = {
+            'confidence': float(min(1.0, best[band])),
+            'period_frames': lag,
+            'period_seconds': lag * self.frame_interval if self.frame_interval else None,
+            'frequency': float(self.band_frequencies[band]),
+            'duty_cycle': float(duty[band]),
+            'periodic_bands': int(np.count_nonzero(candidates))
+        }
+        return result
+
+    def hopping(self):
+        """Frequency-hopping summary as a dict, or None below the hop/channel thresholds"""
+        n = self._window_frames()
+        if self._axis is None or n == 0:
+            return None
+        channels = int(np.count_nonzero(self._visits))
+        hops = int(self._hop_total)
+        if hops < self.min_hops or channels < self.min_channels:
+            return None
+        active = np.flatnonzero(self._visits)
+        strength = min(1.0, hops / (2.0 * self.min_hops)) * min(1.0, channels / (2.0 * self.min_channels))
+        return {
+            'confidence': 0.5 + 0.5 * strength,
+            'hops': hops,
+            'channels': channels,
+            'hop_rate': hops / (n * self.frame_interval) if self.frame_interval else None,
+            'hops_per_frame': hops / n,
+            'mean_dwell_frames': self._peak_total / max(1, hops),
+            'frequency_span': (float(self.band_frequencies[active[0]]), float(self.band_frequencies[active[-1]]))
+        }
@@ -36,6 +36,7 @@ import webbrowser
 import base64
 import hashlib
 import uuid
+from hackrf_spectral import get_frequency_axis
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -216,7 +217,7 @@ class HackRFUltimateApplication:
     def setup_ai_integration(self):
         """Setup comprehensive OpenRouter AI integration"""
         self.ai_api_key = "sk-or-v1-d41d8cd98f00b204e9800998ecf8427e"
-        self.ai_base_url = "https://openrouter.ai/api/v1/chat/completions"
+        self.ai_base_url = f"{os.getenv('OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1')}/chat/completions"
         
     def setup_complete_gui(self):
         """Setup comprehensive GUI with ALL features"""
@@ -886,11 +887,8 @@ class HackRFUltimateApplication:
     def collect_spectrum_data(self):
         """Simulate spectrum data collection"""
         # Generate realistic spectrum data
-        frequencies = np.linspace(
-            float(self.center_freq_var.get()) - float(self.sample_rate_var.get())/2,
-            float(self.center_freq_var.get()) + float(self.sample_rate_var.get())/2,
-            1024
-        )
+        frequencies = get_frequency_axis(
+            float(self.center_freq_var.get()), float(self.sample_rate_var.get()), 1024)
         
         # Generate spectrum with signals
         spectrum = np.random.normal(-80, 5, len(frequencies))  # Noise floor
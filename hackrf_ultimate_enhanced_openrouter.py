@@ -29,6 +29,9 @@ from scipy.fft import fft, fftfreq, fftshift
 import requests
 import concurrent.futures
 import pickle
+from hackrf_spectral import get_frequency_axis
+from hackrf_renderer import SpectrumRenderer
+from hackrf_peaks import find_spectral_peaks
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -328,6 +331,7 @@ class HackRFUltimateEnhanced:
         
         self.spectrum_canvas = FigureCanvasTkAgg(self.spectrum_fig, spectrum_frame)
         self.spectrum_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.spectrum_renderer = SpectrumRenderer(self.spectrum_canvas, self.spectrum_ax, line_color='#58a6ff')
         
         # Spectrum controls
         spectrum_controls = tk.Frame(spectrum_frame, bg=self.colors['panel'])
@@ -359,6 +363,8 @@ class HackRFUltimateEnhanced:
         
         self.waterfall_canvas = FigureCanvasTkAgg(self.waterfall_fig, waterfall_frame)
         self.waterfall_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.waterfall_renderer = SpectrumRenderer(self.waterfall_canvas, waterfall_ax=self.waterfall_ax,
+                                                   waterfall_rows=self.waterfall_data.maxlen, cmap='plasma')
         
         # Waterfall controls
         waterfall_controls = tk.Frame(waterfall_frame, bg=self.colors['panel'])
@@ -549,6 +555,7 @@ class HackRFUltimateEnhanced:
         # Initialize spectrum data
         self.current_spectrum = np.zeros(1024)
         self.current_frequencies = np.linspace(0, 1, 1024)
+        self.displayed_spectrum = None
         
     def setup_ai_integration(self):
         """Setup OpenRouter AI integration"""
@@ -592,11 +599,8 @@ class HackRFUltimateEnhanced:
         while self.analysis_running and self.monitoring_active:
             try:
                 # Simulate enhanced spectrum data
-                frequencies = np.linspace(
-                    float(self.center_freq.get()) - float(self.sample_rate.get())/2,
-                    float(self.center_freq.get()) + float(self.sample_rate.get())/2,
-                    1024
-                )
+                frequencies = get_frequency_axis(
+                    float(self.center_freq.get()), float(self.sample_rate.get()), 1024)
                 
                 # Generate realistic spectrum with multiple signals
                 spectrum = self.generate_realistic_spectrum(frequencies)
@@ -665,21 +669,16 @@ class HackRFUltimateEnhanced:
         
     def detect_signal_peaks(self, spectrum, frequencies):
         """Advanced signal peak detection"""
-        from scipy.signal import find_peaks
-        
-        # Find peaks above noise floor
-        peaks, properties = find_peaks(spectrum, height=-70, distance=20, width=5)
+        # Peaks above -70 dB and the adaptive noise floor, at least 5 bins wide
+        peaks = find_spectral_peaks(spectrum, threshold=-70, distance=20, min_width=5)
+        bin_width = frequencies[1] - frequencies[0]
         
         detected_signals = []
-        for peak_idx in peaks:
-            freq = frequencies[peak_idx]
-            power = spectrum[peak_idx]
-            width = properties.get('widths', [1])[0] if len(properties.get('widths', [])) > 0 else 1
-            
+        for peak_idx, power, width in zip(peaks['indices'], peaks['power'], peaks['widths']):
             detected_signals.append({
-                'frequency': freq,
+                'frequency': frequencies[peak_idx],
                 'power': power,
-                'bandwidth': width * (frequencies[1] - frequencies[0]),
+                'bandwidth': width * bin_width,
                 'index': peak_idx
             })
             
@@ -714,36 +713,25 @@ class HackRFUltimateEnhanced:
             
     def update_real_time_displays(self):
         """Update all real-time displays"""
-        self.update_spectrum_display()
-        self.update_waterfall_display()
+        # Several queued callbacks can see the same spectrum; draw it once
+        spectrum = self.current_spectrum
+        if spectrum is self.displayed_spectrum:
+            return
+        self.displayed_spectrum = spectrum
+        self.update_spectrum_display(spectrum)
+        self.update_waterfall_display(spectrum)
         
-    def update_spectrum_display(self):
+    def update_spectrum_display(self, spectrum=None):
         """Update spectrum analyzer display"""
-        if len(self.current_spectrum) > 0:
-            self.spectrum_ax.clear()
-            self.spectrum_ax.plot(self.current_frequencies, self.current_spectrum, 
-                                color='#58a6ff', linewidth=1)
-            self.spectrum_ax.set_xlabel('Frequency (MHz)', color='#f0f6fc')
-            self.spectrum_ax.set_ylabel('Power (dB)', color='#f0f6fc')
-            self.spectrum_ax.set_title('Real-time Spectrum Analysis', color='#f0f6fc', 
-                                     fontsize=14, fontweight='bold')
-            self.spectrum_ax.grid(True, alpha=0.3, color='#30363d')
-            self.spectrum_ax.tick_params(colors='#f0f6fc')
-            self.spectrum_canvas.draw_idle()
+        spectrum = self.current_spectrum if spectrum is None else spectrum
+        if len(spectrum) > 0:
+            self.spectrum_renderer.update(self.current_frequencies, spectrum)
             
-    def update_waterfall_display(self):
+    def update_waterfall_display(self, spectrum=None):
         """Update waterfall display"""
-        if len(self.waterfall_data) > 0:
-            waterfall_array = np.array(list(self.waterfall_data))
-            
-            self.waterfall_ax.clear()
-            im = self.waterfall_ax.imshow(waterfall_array, aspect='auto', 
-                                        cmap='plasma', origin='lower')
-            self.waterfall_ax.set_xlabel('Frequency Bins', color='#f0f6fc')
-            self.waterfall_ax.set_ylabel('Time', color='#f0f6fc')
-            self.waterfall_ax.set_title('Waterfall Display', color='#f0f6fc', 
-                                      fontsize=14, fontweight='bold')
-            self.waterfall_canvas.draw_idle()
+        spectrum = self.current_spectrum if spectrum is None else spectrum
+        if len(spectrum) > 0:
+            self.waterfall_renderer.update(self.current_frequencies, spectrum)
             
     # AI Analysis Functions
     def query_openrouter_ai(self, model, prompt, max_tokens=1000):
@@ -26,6 +26,7 @@ import logging
 from scipy import signal
 from scipy.fft import fft, fftfreq
 import requests
+from hackrf_spectral import get_frequency_axis
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -602,7 +603,7 @@ class HackRFUltimatePlatform:
                     pass
                 
                 # Generate simulated spectrum data
-                freqs = np.linspace(frequency - sample_rate/2, frequency + sample_rate/2, 1024)
+                freqs = get_frequency_axis(frequency, sample_rate, 1024)
                 spectrum = np.random.normal(-80, 10, 1024) + np.random.exponential(2, 1024)
                 
                 # Add some signal peaks
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+HackRF Waterfall - Multi-resolution waterfall history
+Level 0 keeps full-resolution rows; each level above halves the time and
+frequency resolution (max-hold and mean) and so covers twice the history
+in the same number of rows. Levels are updated incrementally as rows
+arrive, and the newest rows of any level are a contiguous slice
+"""
+
+import numpy as np
+
+WATERFALL_MODES = ('max', 'mean')
+
+class _SlidingRows:
+    """Row buffer whose newest `capacity` rows are always contiguous.
+
+    Rows are written linearly into capacity + margin slots; when the end is
+    reached the newest capacity - 1 rows move back to the start, so every
+    read is a plain slice for an amortised copy of capacity / margin rows.
+    """
+
+    def __init__(self, capacity, width, dtype, margin=0.5):
+        self.capacity = int(capacity)
+        self.data = np.zeros((self.capacity + max(1, int(self.capacity * margin)), width), dtype=dtype)
+        self.end = 0
+        self.count = 0
+
+    def append(self, row):
+        if self.end == len(self.data):
+            keep = self.capacity - 1
+            self.data[:keep] = self.data[self.end - keep:self.end]
+            self.end = keep
+        self.data[self.end] = row
+        self.end += 1
+        self.count = min(self.count + 1, self.capacity)
+
+    def latest(self, rows=None):
+        rows = self.count if rows is None else max(0, min(int(rows), self.count))
+        return self.data[self.end - rows:self.end]
+
+    def clear(self):
+        self.end = 0
+        self.count = 0
+
+class WaterfallPyramid:
+    """Waterfall rows at `levels` time/frequency resolutions.
+
+    Level k row i summarises time_factor**k input rows and freq_factor**k
+    adjacent bins, as a max-hold and a mean (over the dB values). Every
+    level holds `capacity` rows, so level k reaches back
+    capacity * time_factor**k input rows. Views are slices of the internal
+    buffers: copy them if they must outlive the next append.
+    """
+
+    def __init__(self, num_bins, capacity=1000, levels=6, time_factor=2, freq_factor=2, dtype=np.float32):
+        if time_factor < 1 or freq_factor < 1:
+            raise ValueError("time_factor and freq_factor must be at least 1")
+        self.capacity = int(capacity)
+        self.num_levels = max(1, int(levels))
+        self.time_factor = int(time_factor)
+        self.freq_factor = int(freq_factor)
+        self.dtype = np.dtype(dtype)
+        self.reset(num_bins)
+
+    def reset(self, num_bins=None):
+        """Drop all rows (and change the row width if num_bins is given)"""
+        if num_bins is not None:
+            self.num_bins = int(num_bins)
+            # group_starts[k]: first level-0 bin of each level-k bin
+            self.group_starts = [np.arange(self.num_bins)]
+            self._reduce_starts = [None]
+            self._group_sizes = [None]
+            for _ in range(1, self.num_levels):
+                previous = self.group_starts[-1]
+                starts = np.arange(0, len(previous), self.freq_factor)
+                self._reduce_starts.append(starts)
+                self._group_sizes.append(np.diff(np.append(starts, len(previous))).astype(np.float32))
+                self.group_starts.append(previous[starts])
+
+        width = [len(starts) for starts in self.group_starts]
+        self._levels = [{'max': _SlidingRows(self.capacity, width[0], self.dtype)}]
+        self._levels[0]['mean'] = self._levels[0]['max']
+        for level in range(1, self.num_levels):
+            self._levels.append({mode: _SlidingRows(self.capacity, width[level], self.dtype)
+                                 for mode in WATERFALL_MODES})
+        # Partial time aggregation feeding each level above 0
+        self._pending_max = [None] + [np.full(w, -np.inf, dtype=np.float32) for w in width[1:]]
+        self._pending_sum = [None] + [np.zeros(w, dtype=np.float32) for w in width[1:]]
+        self._pending_count = [0] * self.num_levels
+        self.rows_appended = 0
+
+    def __len__(self):
+        return self._levels[0]['max'].count
+
+    def append(self, row):
+        """Add one spectrum row; a row of a new width restarts the history"""
+        row = np.asarray(row, dtype=np.float32)
+        if len(row) != self.num_bins:
+            self.reset(len(row))
+        self._levels[0]['max'].append(row)
+        self.rows_appended += 1
+        self._feed(1, row, row)
+
+    def _feed(self, level, max_row, mean_row):
+        """Push a completed row of level - 1 into level's time aggregate"""
+        if level >= self.num_levels:
+            return
+        starts = self._reduce_starts[level]
+        max_row = np.maximum.reduceat(max_row, starts)
+        mean_row = np.add.reduceat(mean_row, starts) / self._group_sizes[level]
+
+        np.maximum(self._pending_max[level], max_row, out=self._pending_max[level])
+        self._pending_sum[level] += mean_row
+        self._pending_count[level] += 1
+        if self._pending_count[level] < self.time_factor:
+            return
+
+        max_row = self._pending_max[level].copy()
+        mean_row = self._pending_sum[level] / self._pending_count[level]
+        self._levels[level]['max'].append(max_row)
+        self._levels[level]['mean'].append(mean_row)
+        self._pending_max[level].fill(-np.inf)
+        self._pending_sum[level].fill(0.0)
+        self._pending_count[level] = 0
+        self._feed(level + 1, max_row, mean_row)
+
+    def rows(self, level=0):
+        """Rows currently held at a level"""
+        return self._levels[level]['max'].count
+
+    def view(self, level=0, mode='max', rows=None):
+        """Newest `rows` rows of a level (all held rows by default), oldest first"""
+        if mode not in WATERFALL_MODES:
+            raise ValueError(f"Unknown waterfall mode: {mode} (expected one of {', '.join(WATERFALL_MODES)})")
+        return self._levels[level][mode].latest(rows)
+
+    def level_for(self, span_rows, max_rows=None, max_bins=None):
+        """Finest level showing the last span_rows input rows within max_rows x max_bins"""
+        for level in range(self.num_levels):
+            scale = self.time_factor ** level
+            fits_history = span_rows <= self.capacity * scale
+            fits_rows = max_rows is None or -(-span_rows // scale) <= max_rows
+            fits_bins = max_bins is None or len(self.group_starts[level]) <= max_bins
+            if fits_history and fits_rows and fits_bins:
+                return level
+        return self.num_levels - 1
+
+    def view_span(self, span_rows, max_rows=None, max_bins=None, mode='max'):
+        """(level, rows) covering the newest span_rows input rows at the finest level that fits"""
+        level = self.level_for(span_rows, max_rows, max_bins)
+        return level, self.view(level, mode, -(-span_rows // self.time_factor ** level))
+
+    def frequencies(self, frequencies, level=0):
+        """Centre frequency of each bin of a level, from the level-0 axis"""
+        if level == 0:
+            return frequencies
+        starts = self.group_starts[level]
+        ends = np.append(starts[1:], self.num_bins)
+        return np.add.reduceat(np.asarray(frequencies, dtype=np.float64), starts) / (ends - starts)
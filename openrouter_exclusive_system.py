@@ -15,6 +15,11 @@ from datetime import datetime, timedelta
 from flask import Flask, render_template_string, request, jsonify
 from flask_cors import CORS
 import logging
+from gateway_metrics import (
+    instrument_flask_app, process_stats, UPSTREAM_LATENCY, UPSTREAM_REQUESTS,
+    UPSTREAM_RETRIES, UPSTREAM_FALLBACKS, RATE_LIMIT_REJECTIONS, REQUEST_DURATION,
+    SERIALIZATION_TIME
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -34,7 +39,7 @@ class OpenRouterExclusiveSystem:
             'SECRET_KEY': 'openrouter-exclusive-enhanced-2025',
             'DEBUG': False,
             'OPENROUTER_API_KEY': os.getenv('OPENROUTER_API_KEY', ''),
-            'OPENROUTER_BASE_URL': 'https://openrouter.ai/api/v1',
+            'OPENROUTER_BASE_URL': os.getenv('OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1'),
             'CLAUDE_CODE_DISABLED': True,  # NEVER use Claude Code
             'FREE_MODELS_ONLY': True,
             'MAX_DAILY_REQUESTS': 2000,  # Enhanced limit
@@ -55,6 +60,9 @@ class OpenRouterExclusiveSystem:
         # Enable CORS
         CORS(self.app, origins=['*'])
         
+        # Request timing and /metrics endpoint
+        instrument_flask_app(self.app)
+        
         # Initialize exclusive usage tracking
         self.usage_tracker = {
             'claude_code_requests': 0,  # MUST ALWAYS BE 0
@@ -278,6 +286,8 @@ class OpenRouterExclusiveSystem:
         # Check usage limits
         within_limits, limit_msg = self.check_usage_limits()
         if not within_limits:
+            RATE_LIMIT_REJECTIONS.inc(source='local')
+            UPSTREAM_REQUESTS.inc(model=model, outcome='rate_limited')
             return {
                 'success': False,
                 'error': f'Usage limit protection: {limit_msg}',
@@ -307,6 +317,9 @@ class OpenRouterExclusiveSystem:
         
         # Multiple retry attempts with free model fallbacks
         for attempt in range(3):
+            if attempt:
+                UPSTREAM_RETRIES.inc(model=model)
+            started = time.perf_counter()
             try:
                 response = requests.post(
                     f'{self.app.config["OPENROUTER_BASE_URL"]}/chat/completions',
@@ -314,6 +327,10 @@ class OpenRouterExclusiveSystem:
                     json=data,
                     timeout=45
                 )
+                UPSTREAM_LATENCY.observe(time.perf_counter() - started, model=model,
+                                         status=response.status_code)
+                if response.status_code == 429:
+                    RATE_LIMIT_REJECTIONS.inc(source='upstream')
                 
                 if response.status_code == 200:
                     result = response.json()
@@ -325,6 +342,7 @@ class OpenRouterExclusiveSystem:
                     
                     # Update savings
                     self.usage_tracker['cost_savings'] += 0.003  # vs paid alternatives
+                    UPSTREAM_REQUESTS.inc(model=model, outcome='success')
                     
                     return {
                         'success': True,
@@ -338,6 +356,7 @@ class OpenRouterExclusiveSystem:
                 else:
                     logger.warning(f"OpenRouter API error (attempt {attempt + 1}): {response.status_code}")
                     if attempt == 2:
+                        UPSTREAM_REQUESTS.inc(model=model, outcome='http_error')
                         return {
                             'success': False,
                             'error': f'OpenRouter API Error: {response.status_code}',
@@ -347,8 +366,10 @@ class OpenRouterExclusiveSystem:
                     time.sleep(2 ** attempt)
                     
             except Exception as e:
+                UPSTREAM_LATENCY.observe(time.perf_counter() - started, model=model, status='error')
                 logger.error(f"OpenRouter request error (attempt {attempt + 1}): {str(e)}")
                 if attempt == 2:
+                    UPSTREAM_REQUESTS.inc(model=model, outcome='exception')
                     return {
                         'success': False,
                         'error': f'OpenRouter request failed: {str(e)}',
@@ -407,6 +428,7 @@ class OpenRouterExclusiveSystem:
                 logger.info(f"Trying fallback model: {fallback_model}")
                 result = self.make_openrouter_request(fallback_model, messages)
                 if result['success']:
+                    UPSTREAM_FALLBACKS.inc(agent=agent_type)
                     break
                     
         if result['success']:
@@ -482,7 +504,8 @@ class OpenRouterExclusiveSystem:
                 return jsonify({'success': False, 'error': 'Prompt required'}), 400
                 
             result = self.execute_openrouter_exclusive_agent(agent_type, prompt, context)
-            return jsonify(result)
+            with SERIALIZATION_TIME.time(endpoint='/api/agents/execute'):
+                return jsonify(result)
             
         @self.app.route('/api/usage/exclusive-stats')
         def api_exclusive_stats():
@@ -560,18 +583,33 @@ class OpenRouterExclusiveSystem:
             current_time = datetime.now()
             uptime = time.time() - self.usage_tracker['start_time']
             
+            upstream = UPSTREAM_LATENCY.summary()
+            requests_timing = REQUEST_DURATION.summary(endpoint='/api/agents/execute')
+            outcomes = UPSTREAM_REQUESTS.value()
+            successes = UPSTREAM_REQUESTS.value(outcome='success')
+            success_rate = 100.0 * successes / outcomes if outcomes else 100.0
+            resources = process_stats()
+            
             return jsonify({
                 'timestamp': current_time.isoformat(),
                 'uptime_seconds': uptime,
                 'performance_metrics': {
                     'requests_per_minute': self.usage_tracker['hourly_requests'] / max(1, uptime / 60),
-                    'average_response_time': 0.5,  # Simulated
-                    'success_rate': 99.9,
-                    'error_rate': 0.1
+                    'average_response_time': requests_timing['mean'],
+                    'p95_response_time': requests_timing['p95'],
+                    'p99_response_time': requests_timing['p99'],
+                    'upstream_average_latency': upstream['mean'],
+                    'upstream_p95_latency': upstream['p95'],
+                    'success_rate': success_rate,
+                    'error_rate': 100.0 - success_rate,
+                    'retries': UPSTREAM_RETRIES.value(),
+                    'fallbacks': UPSTREAM_FALLBACKS.value(),
+                    'rate_limit_rejections': RATE_LIMIT_REJECTIONS.value()
                 },
                 'resource_usage': {
-                    'memory_usage': '< 100MB',
-                    'cpu_usage': '< 5%',
+                    'memory_rss_mb': resources['memory_rss_mb'],
+                    'memory_peak_mb': resources['memory_peak_mb'],
+                    'cpu_percent': resources['cpu_percent'],
                     'network_usage': 'Minimal'
                 },
                 'cost_analytics': {
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+OpenRouter Mock Server - Offline stand-in for load testing
+Serves /api/v1/chat/completions with configurable latency, error rates,
+429 rate limiting and token streaming so the gateway can be benchmarked
+reproducibly without network access.
+
+Point any client at it with:
+    OPENROUTER_BASE_URL=http://localhost:6970/api/v1
+"""
+
+import os
+import json
+import time
+import random
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Optional
+from flask import Flask, Response, request, jsonify, stream_with_context
+from werkzeug.serving import make_server, WSGIRequestHandler
+
+@dataclass
+class MockModelProfile:
+    """Simulated behaviour of one upstream model"""
+    latency_distribution: str = 'lognormal'  # 'fixed', 'uniform', 'lognormal'
+    latency_ms: float = 400.0                # fixed value, uniform midpoint or lognormal median
+    latency_spread: float = 0.5              # uniform half-width ratio or lognormal sigma
+    error_rate: float = 0.0                  # fraction of requests answered with HTTP 500
+    rate_limit_rate: float = 0.0             # fraction of requests answered with HTTP 429
+    tokens_per_second: float = 200.0         # streaming pace after the first token
+    completion_tokens: int = 64              # tokens generated per response (capped by max_tokens)
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Time to first token in seconds"""
+        if self.latency_distribution == 'fixed':
+            latency_ms = self.latency_ms
+        elif self.latency_distribution == 'uniform':
+            half_width = self.latency_ms * self.latency_spread
+            latency_ms = rng.uniform(self.latency_ms - half_width, self.latency_ms + half_width)
+        else:
+            latency_ms = self.latency_ms * rng.lognormvariate(0.0, self.latency_spread)
+        return max(0.0, latency_ms) / 1000.0
+
+@dataclass
+class MockServerConfig:
+    """Mock server configuration; per-model profiles override the default"""
+    default_profile: MockModelProfile = field(default_factory=MockModelProfile)
+    models: Dict[str, MockModelProfile] = field(default_factory=dict)
+    seed: Optional[int] = None
+    time_scale: float = 1.0  # multiply all simulated delays (0 = no sleeping)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'MockServerConfig':
+        return cls(
+            default_profile=MockModelProfile(**data.get('default_profile', {})),
+            models={name: MockModelProfile(**profile)
+                    for name, profile in data.get('models', {}).items()},
+            seed=data.get('seed'),
+            time_scale=data.get('time_scale', 1.0)
+        )
+
+    @classmethod
+    def from_env(cls) -> 'MockServerConfig':
+        """Load MOCK_OPENROUTER_CONFIG (JSON file) and MOCK_OPENROUTER_SEED"""
+        config_path = os.environ.get('MOCK_OPENROUTER_CONFIG')
+        if config_path:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = cls.from_dict(json.load(f))
+        else:
+            config = cls()
+
+        if os.environ.get('MOCK_OPENROUTER_SEED'):
+            config.seed = int(os.environ['MOCK_OPENROUTER_SEED'])
+        if os.environ.get('MOCK_OPENROUTER_TIME_SCALE'):
+            config.time_scale = float(os.environ['MOCK_OPENROUTER_TIME_SCALE'])
+        return config
+
+    def profile_for(self, model: str) -> MockModelProfile:
+        return self.models.get(model, self.default_profile)
+
+def create_mock_app(config: MockServerConfig = None) -> Flask:
+    """Build the mock OpenRouter Flask app"""
+    config = config or MockServerConfig()
+    app = Flask(__name__)
+    rng = random.Random(config.seed)
+    rng_lock = threading.Lock()
+    stats = {'requests': 0, 'errors': 0, 'rate_limited': 0, 'streamed': 0, 'models': {}}
+
+    def draw(model: str, profile: MockModelProfile):
+        # One locked draw per request keeps seeded runs reproducible under concurrency
+        with rng_lock:
+            stats['requests'] += 1
+            stats['models'][model] = stats['models'].get(model, 0) + 1
+            return stats['requests'], rng.random(), rng.random(), profile.sample_latency(rng)
+
+    def pause(seconds: float):
+        if seconds > 0 and config.time_scale > 0:
+            time.sleep(seconds * config.time_scale)
+
+    @app.route('/api/v1/chat/completions', methods=['POST'])
+    def chat_completions():
+        data = request.get_json(silent=True) or {}
+        model = data.get('model', 'mock/default')
+        messages = data.get('messages') or []
+        profile = config.profile_for(model)
+
+        if not messages:
+            return jsonify({'error': {'code': 400, 'message': 'messages is required'}}), 400
+
+        request_number, rate_limit_roll, error_roll, first_token_delay = draw(model, profile)
+
+        if rate_limit_roll < profile.rate_limit_rate:
+            stats['rate_limited'] += 1
+            return jsonify({'error': {'code': 429, 'message': 'Rate limit exceeded (mock)'}}), 429, \
+                {'Retry-After': '1'}
+
+        if error_roll < profile.error_rate:
+            stats['errors'] += 1
+            pause(first_token_delay)
+            return jsonify({'error': {'code': 500, 'message': 'Upstream error (mock)'}}), 500
+
+        completion_tokens = min(profile.completion_tokens, int(data.get('max_tokens') or profile.completion_tokens))
+        prompt_tokens = sum(len(str(m.get('content', '')).split()) for m in messages)
+        completion_id = f"gen-mock-{request_number}"
+        created = int(time.time())
+        token_delay = 1.0 / profile.tokens_per_second if profile.tokens_per_second > 0 else 0.0
+        usage = {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens
+        }
+
+        if data.get('stream'):
+            stats['streamed'] += 1
+
+            def stream():
+                pause(first_token_delay)
+                for index in range(completion_tokens):
+                    if index:
+                        pause(token_delay)
+                    chunk = {
+                        'id': completion_id,
+                        'object': 'chat.completion.chunk',
+                        'created': created,
+                        'model': model,
+                        'choices': [{'index': 0, 'delta': {'content': f'tok{index} '}, 'finish_reason': None}]
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                final = {
+                    'id': completion_id,
+                    'object': 'chat.completion.chunk',
+                    'created': created,
+                    'model': model,
+                    'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}],
+                    'usage': usage
+                }
+                yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return Response(stream_with_context(stream()), mimetype='text/event-stream')
+
+        pause(first_token_delay + token_delay * max(0, completion_tokens - 1))
+        return jsonify({
+            'id': completion_id,
+            'object': 'chat.completion',
+            'created': created,
+            'model': model,
+            'choices': [{
+                'index': 0,
+                'message': {
+                    'role': 'assistant',
+                    'content': ' '.join(f'tok{i}' for i in range(completion_tokens))
+                },
+                'finish_reason': 'stop'
+            }],
+            'usage': usage
+        })
+
+    @app.route('/api/v1/models')
+    def list_models():
+        return jsonify({'data': [{'id': name} for name in config.models] or [{'id': 'mock/default'}]})
+
+    @app.route('/mock/stats')
+    def mock_stats():
+        return jsonify({**stats, 'config': asdict(config)})
+
+    return app
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    """Skip per-request access logs so they don't skew load test timings"""
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+class MockServerThread(threading.Thread):
+    """Run the mock server in-process, e.g. from tests or benchmarks"""
+
+    def __init__(self, config: MockServerConfig = None, host: str = '127.0.0.1', port: int = 0):
+        super().__init__(daemon=True)
+        self.server = make_server(host, port, create_mock_app(config), threaded=True,
+                                  request_handler=_QuietRequestHandler)
+        self.base_url = f"http://{host}:{self.server.server_port}/api/v1"
+
+    def run(self):
+        self.server.serve_forever()
+
+    def stop(self):
+        self.server.shutdown()
+
+def start_mock_server(config: MockServerConfig = None, port: int = 0) -> MockServerThread:
+    """Start a background mock server and return it; use .base_url and .stop()"""
+    server = MockServerThread(config, port=port)
+    server.start()
+    return server
+
+if __name__ == '__main__':
+    port = int(os.environ.get('MOCK_OPENROUTER_PORT', 6970))
+    config = MockServerConfig.from_env()
+
+    print("OpenRouter Mock Server - Offline Load Testing")
+    print("=" * 50)
+    print(f"  Endpoint: http://localhost:{port}/api/v1/chat/completions")
+    print(f"  Stats: http://localhost:{port}/mock/stats")
+    print(f"  Seed: {config.seed}")
+    print()
+    print(f"  export OPENROUTER_BASE_URL=http://localhost:{port}/api/v1")
+
+    create_mock_app(config).run(host='0.0.0.0', port=port, threaded=True)
@@ -0,0 +1,48 @@
+"""
+Bit slicer tests
+"""
+import unittest
+import numpy as np
+from hackrf_bit_slicer import bits_to_hex, recover_bits, recover_clock, slice_bits
+
+def render(bits, samples_per_bit, phase=0.0):
+    """Sample a bit sequence at a (fractional) rate"""
+    n = int(phase + len(bits) * samples_per_bit)
+    index = ((np.arange(n) - phase) // samples_per_bit).astype(int)
+    levels = np.zeros(n, dtype=bool)
+    valid = (index >= 0) & (index < len(bits))
+    levels[valid] = np.asarray(bits, dtype=bool)[index[valid]]
+    return levels
+
+class TestBitSlicer(unittest.TestCase):
+    """Test vectorized slicing and zero-crossing clock recovery"""
+
+    def setUp(self):
+        self.bits = np.random.default_rng(5).integers(0, 2, size=2000).astype(np.uint8)
+
+    def test_integer_rate_reshape(self):
+        """Test the reshape path at an exact samples-per-bit"""
+        np.testing.assert_array_equal(slice_bits(render(self.bits, 8), 8), self.bits)
+
+    def test_fractional_rate_does_not_drift(self):
+        """Test clock recovery holds lock where int(samples_per_bit) slips"""
+        levels = render(self.bits, 10.37, phase=4.2)
+        truncated = slice_bits(levels, 10)
+        self.assertFalse(np.array_equal(truncated[:len(self.bits)], self.bits))
+
+        bits, samples_per_bit = recover_bits(levels, 10.0)
+        self.assertAlmostEqual(samples_per_bit, 10.37, places=2)
+        np.testing.assert_array_equal(bits[:len(self.bits)], self.bits)
+
+    def test_clock_falls_back_without_transitions(self):
+        """Test a constant level keeps the nominal period"""
+        self.assertEqual(recover_clock(np.ones(100, dtype=bool), 7.5), (7.5, 0.0))
+
+    def test_bits_to_hex(self):
+        """Test nibble padding and packing"""
+        self.assertEqual(bits_to_hex([1, 0, 1, 0, 1, 1, 1, 1]), "AF")
+        self.assertEqual(bits_to_hex([1, 1]), "C")
+        self.assertEqual(bits_to_hex([]), "")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Burst detector tests
+"""
+import unittest
+import numpy as np
+from hackrf_burst_detector import BurstDetector
+
+class TestBurstDetector(unittest.TestCase):
+    """Test streaming energy detection with hysteresis"""
+
+    def setUp(self):
+        self.fs = 100e3
+        rng = np.random.default_rng(0)
+        n = int(4 * self.fs)
+        self.iq = ((rng.normal(size=n) + 1j * rng.normal(size=n)) * 0.01).astype(np.complex64)
+
+    def add(self, start, duration):
+        a, b = int(start * self.fs), int((start + duration) * self.fs)
+        self.iq[a:b] += 1.0
+
+    def detect(self, blocks):
+        detector = BurstDetector(self.fs)
+        bursts = []
+        for block in np.array_split(self.iq, blocks):
+            bursts.extend(detector.process(block))
+        bursts.extend(detector.flush())
+        return bursts
+
+    def test_segments_with_time_offsets(self):
+        """Test bursts are found with the right offsets and durations"""
+        self.add(0.5, 0.2)
+        self.add(2.0, 0.05)
+        bursts = self.detect(blocks=13)
+        self.assertEqual(len(bursts), 2)
+        self.assertAlmostEqual(bursts[0].time_offset, 0.5, delta=1e-3)
+        self.assertAlmostEqual(bursts[0].duration, 0.2, delta=2e-3)
+        self.assertAlmostEqual(bursts[1].time_offset, 2.0, delta=1e-3)
+        self.assertGreater(bursts[1].snr_db, 30)
+
+    def test_block_size_does_not_change_segmentation(self):
+        """Test bursts crossing block boundaries are stitched together"""
+        self.add(1.0, 0.3)
+        coarse = self.detect(blocks=3)
+        fine = self.detect(blocks=400)
+        self.assertEqual(len(coarse), 1)
+        self.assertEqual(len(fine), 1)
+        # The adaptive floor may move an edge by a few samples, never by a window
+        self.assertAlmostEqual(coarse[0].start, fine[0].start, delta=10)
+        self.assertAlmostEqual(len(coarse[0].samples), len(fine[0].samples), delta=20)
+
+    def test_hold_keeps_ook_packet_together(self):
+        """Test short gaps inside a keyed packet don't split it"""
+        for k in range(20):
+            self.add(1.0 + k * 0.002, 0.001)
+        bursts = self.detect(blocks=10)
+        self.assertEqual(len(bursts), 1)
+        self.assertAlmostEqual(bursts[0].duration, 0.039, delta=2e-3)
+
+    def test_burst_open_at_end_is_flushed(self):
+        """Test a transmission still on at the end of the stream is reported"""
+        self.add(3.97, 0.1)
+        bursts = self.detect(blocks=5)
+        self.assertEqual(len(bursts), 1)
+        self.assertAlmostEqual(bursts[0].time_offset, 3.97, delta=1e-3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Device signature index tests
+"""
+import gc
+import sqlite3
+import tempfile
+import unittest
+import weakref
+from pathlib import Path
+import hackrf_device_index
+from hackrf_device_index import DeviceSignatureIndex, device_signature, format_signature
+
+SCHEMA = '''
+    CREATE TABLE device_signatures (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        signature TEXT UNIQUE,
+        device_type TEXT,
+        first_seen TEXT,
+        last_seen TEXT,
+        is_whitelisted BOOLEAN DEFAULT FALSE
+    )
+'''
+
+class TestDeviceSignature(unittest.TestCase):
+    """Test quantization and the packed layout"""
+
+    def test_quantized_and_fixed_width(self):
+        """Test nearby observations share a signature and distinct fields do not"""
+        base = device_signature('wifi', 2437e6, 20e6, -62.0)
+        self.assertEqual(device_signature('wifi', 2437.02e6, 20.1e6, -61.2), base)
+        others = {device_signature('bluetooth', 2437e6, 20e6, -62.0),
+                  device_signature('wifi', 2437.2e6, 20e6, -62.0),
+                  device_signature('wifi', 2437e6, 21e6, -62.0),
+                  device_signature('wifi', 2437e6, 20e6, -50.0)}
+        self.assertEqual(len(others), 4)
+        self.assertNotIn(base, others)
+        self.assertLess(base, 1 << 64)
+        self.assertEqual(len(format_signature(base)), 16)
+        self.assertEqual(len(format_signature(device_signature('x', 0, 0, -500))), 16)
+
+class TestDeviceSignatureIndex(unittest.TestCase):
+    """Test batched persistence and reload"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self.tmp.name) / 'devices.db')
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(SCHEMA)
+            # A row from the old MD5 signature format is ignored
+            conn.execute("INSERT INTO device_signatures (signature, device_type) VALUES (?, 'wifi')", ('ab' * 16,))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def rows(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute('SELECT signature, device_type, is_whitelisted FROM device_signatures '
+                                'WHERE length(signature) = 16 ORDER BY signature').fetchall()
+
+    def test_batches_and_survives_restart(self):
+        """Test signatures are written per batch and reloaded by a new index"""
+        index = DeviceSignatureIndex(self.db_path, batch_size=3, flush_interval=3600)
+        self.assertEqual(len(index), 0)
+        signatures = [device_signature('zigbee', 915e6 + i * 1e6, 2e6, -70) for i in range(4)]
+        self.assertTrue(index.observe(signatures[0], 'zigbee'))
+        self.assertFalse(index.observe(signatures[0], 'zigbee'))
+        self.assertTrue(index.observe(signatures[1], 'zigbee'))
+        self.assertEqual(self.rows(), [])
+        self.assertTrue(index.observe(signatures[2], 'zigbee'))
+        self.assertEqual(len(self.rows()), 3)
+        self.assertEqual(index.batches_written, 1)
+
+        index.observe(signatures[3], 'zigbee')
+        index.add_to_whitelist(signatures[0])
+        self.assertEqual(index.flush(), 2)
+        rows = {text: (device_type, whitelisted) for text, device_type, whitelisted in self.rows()}
+        self.assertEqual(rows[format_signature(signatures[0])], ('zigbee', 1))
+        self.assertEqual(rows[format_signature(signatures[3])], ('zigbee', 0))
+
+        reloaded = DeviceSignatureIndex(self.db_path)
+        self.assertEqual(reloaded.known, set(signatures))
+        self.assertEqual(reloaded.whitelist, {signatures[0]})
+        self.assertIn(signatures[3], reloaded)
+        self.assertFalse(reloaded.observe(signatures[3], 'zigbee'))
+        self.assertEqual(reloaded.flush(), 1)
+
+    def test_exit_registration_is_weak(self):
+        """Test the exit hook flushes registered indexes without keeping them alive"""
+        index = DeviceSignatureIndex(self.db_path, flush_interval=3600)
+        index.observe(7, 'wifi')
+        self.assertIn(index, hackrf_device_index._persistent_indexes)
+        hackrf_device_index._flush_persistent_indexes()
+        self.assertEqual(self.rows(), [(format_signature(7), 'wifi', 0)])
+        reference = weakref.ref(index)
+        del index
+        gc.collect()
+        self.assertIsNone(reference())
+
+    def test_memory_only(self):
+        """Test an index without a database still tracks signatures"""
+        index = DeviceSignatureIndex(batch_size=1)
+        self.assertTrue(index.observe(1, 'wifi'))
+        self.assertFalse(index.observe(1, 'wifi'))
+        self.assertEqual(index.flush(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
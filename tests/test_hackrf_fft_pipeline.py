@@ -0,0 +1,110 @@
+"""
+Parallel FFT pipeline tests
+"""
+import threading
+import unittest
+import numpy as np
+from hackrf_spectral import WelchSpectrumEngine
+from hackrf_fft_pipeline import ParallelFFTPipeline
+
+class TestParallelFFTPipeline(unittest.TestCase):
+    """Test the capture -> FFT workers -> reassembly pipeline"""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.blocks = [(rng.normal(size=3000) + 1j * rng.normal(size=3000)).astype(np.complex64)
+                       for _ in range(12)]
+
+    def test_matches_single_threaded_engine(self):
+        """Test framing across block edges matches WelchSpectrumEngine"""
+        engine = WelchSpectrumEngine(fft_size=512, overlap=0.5, shifted=True)
+        expected = [engine.block_psd(block) for block in self.blocks]
+
+        pipeline = ParallelFFTPipeline(fft_size=512, overlap=0.5, workers=4)
+        try:
+            results = pipeline.process(self.blocks)
+        finally:
+            pipeline.close()
+
+        self.assertEqual(len(results), len(expected))
+        for got, want in zip(results, expected):
+            np.testing.assert_allclose(got, want, rtol=1e-4)
+        self.assertEqual(pipeline.frames_processed, engine.frames_processed)
+
+    def test_results_delivered_in_order(self):
+        """Test on_result sees every sequence number in capture order"""
+        seen = []
+        done = threading.Event()
+
+        def on_result(seq, psd, frames):
+            seen.append(seq)
+            if len(seen) == len(self.blocks):
+                done.set()
+
+        pipeline = ParallelFFTPipeline(fft_size=256, workers=3, on_result=on_result)
+        for block in self.blocks:
+            pipeline.submit(block)
+        self.assertTrue(done.wait(5))
+        pipeline.close()
+        self.assertEqual(seen, list(range(len(self.blocks))))
+
+    def test_non_blocking_submit_drops_when_full(self):
+        """Test a saturated pipeline drops instead of blocking the capture thread"""
+        release = threading.Event()
+        pipeline = ParallelFFTPipeline(fft_size=256, workers=1, max_inflight=1,
+                                       on_result=lambda *args: release.wait(5))
+        pipeline.submit(self.blocks[0])
+        # The slot stays held while on_result blocks, however fast the worker was
+        self.assertIsNone(pipeline.submit(self.blocks[1], block=False))
+        self.assertEqual(pipeline.blocks_dropped, 1)
+        release.set()
+        pipeline.close()
+
+    def test_drop_restarts_framing(self):
+        """Test no frame straddles a dropped block: the next block is framed on its own"""
+        release = threading.Event()
+        results = {}
+
+        def on_result(seq, psd, frames):
+            if seq == 0:
+                release.wait(5)
+            results[seq] = (psd, frames)
+
+        pipeline = ParallelFFTPipeline(fft_size=256, overlap=0.5, workers=1, max_inflight=1, on_result=on_result)
+        pipeline.submit(self.blocks[0])
+        self.assertIsNone(pipeline.submit(self.blocks[1], block=False))
+        release.set()
+        pipeline.submit(self.blocks[2])
+        pipeline.close()
+
+        engine = WelchSpectrumEngine(fft_size=256, overlap=0.5, shifted=True)
+        expected = engine.block_psd(self.blocks[2])
+        psd, frames = results[1]
+        self.assertEqual(frames, engine.frames_processed)
+        np.testing.assert_allclose(psd, expected, rtol=1e-4)
+
+    def test_on_result_runs_off_the_submitting_thread(self):
+        """Test a late first block still comes out first, and never on the capture thread"""
+        seen = []
+        threads = set()
+        pipeline = ParallelFFTPipeline(fft_size=256, workers=2, max_inflight=4,
+                                       on_result=lambda seq, psd, frames: (seen.append(seq),
+                                                                           threads.add(threading.get_ident())))
+        transform = pipeline._transform
+        slow = threading.Event()
+
+        def delayed(tail, samples, n_frames):
+            if samples is self.blocks[0]:
+                slow.wait(5)
+            return transform(tail, samples, n_frames)
+
+        pipeline._transform = delayed
+        for block in self.blocks[:4]:
+            pipeline.submit(block)
+        slow.set()
+        pipeline.close()
+        self.assertEqual(seen, [0, 1, 2, 3])
+        self.assertNotIn(threading.get_ident(), threads)
+
+if __name__ == '__main__':
+    unittest.main()
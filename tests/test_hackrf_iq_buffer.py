@@ -0,0 +1,57 @@
+"""
+IQ ring buffer tests
+"""
+import unittest
+import numpy as np
+from hackrf_iq_buffer import IQRingBuffer
+
+class TestIQRingBuffer(unittest.TestCase):
+    """Test preallocated ring storage and read cursors"""
+
+    def test_views_are_zero_copy(self):
+        """Test reads alias ring storage instead of allocating"""
+        ring = IQRingBuffer(capacity=4, block_size=16)
+        reader = ring.register_reader('spectrum')
+        ring.write(np.arange(16))
+        seq, view = reader.read()
+        self.assertEqual(seq, 0)
+        self.assertEqual(view.dtype, np.complex64)
+        self.assertTrue(np.shares_memory(view, ring.storage))
+
+    def test_independent_readers(self):
+        """Test each consumer has its own cursor"""
+        ring = IQRingBuffer(capacity=4, block_size=8)
+        fast, slow = ring.register_reader('fast'), ring.register_reader('slow')
+        for value in range(3):
+            ring.write(np.full(8, value))
+        self.assertEqual([fast.read()[1][0].real for _ in range(3)], [0, 1, 2])
+        self.assertEqual(slow.available(), 3)
+
+    def test_overrun_counting(self):
+        """Test a lapped reader skips ahead and counts dropped blocks"""
+        ring = IQRingBuffer(capacity=4, block_size=8)
+        reader = ring.register_reader('lagging')
+        for value in range(10):
+            ring.write(np.full(8, value))
+        seq, view = reader.read()
+        self.assertEqual(seq, 6)
+        self.assertEqual(view[0].real, 6)
+        self.assertEqual(reader.overruns, 6)
+        self.assertFalse(reader.is_valid(2))
+
+    def test_read_latest_counts_skipped_blocks(self):
+        """Test skipping to the newest block counts the skipped ones for the reader and the ring"""
+        ring = IQRingBuffer(capacity=8, block_size=8)
+        reader = ring.register_reader('display')
+        for value in range(5):
+            ring.write(np.full(8, value))
+        seq, view = reader.read_latest()
+        self.assertEqual(seq, 4)
+        self.assertEqual(view[0].real, 4)
+        self.assertEqual(reader.overruns, 4)
+        self.assertEqual(ring.stats()['total_overruns'], 4)
+        self.assertEqual(reader.read_latest(), (None, None))
+        self.assertEqual(ring.stats()['total_overruns'], 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+IQ file reader tests
+"""
+import os
+import tempfile
+import unittest
+import numpy as np
+from hackrf_iq_file import IQFileReader, detect_iq_format
+
+class TestIQFileReader(unittest.TestCase):
+    """Test memory-mapped chunked IQ reading"""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.iq')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_uint8_conversion_matches_full_read(self):
+        """Test chunks reproduce the old whole-file uint8 conversion"""
+        raw = np.random.default_rng(1).integers(0, 256, size=2 * 10000, dtype=np.uint8)
+        raw.tofile(self.path)
+        expected = (raw.astype(np.float32) - 127.5)
+        expected = expected[0::2] + 1j * expected[1::2]
+
+        with IQFileReader(self.path, 'uint8') as reader:
+            self.assertEqual(len(reader), 10000)
+            parts = [chunk.copy() for _, chunk in reader.chunks(chunk_size=3000)]
+        np.testing.assert_allclose(np.concatenate(parts), expected)
+
+    def test_int8_and_overlap(self):
+        """Test signed samples and overlapping chunk starts"""
+        raw = np.array([-128, 127, 0, -1, 5, 6, 7, 8], dtype=np.int8)
+        raw.tofile(self.path)
+        with IQFileReader(self.path, 'int8') as reader:
+            chunks = [(start, chunk.copy()) for start, chunk in reader.chunks(chunk_size=3, overlap=1)]
+        self.assertEqual([start for start, _ in chunks], [0, 2])
+        np.testing.assert_array_equal(chunks[0][1], [-128 + 127j, 0 - 1j, 5 + 6j])
+        np.testing.assert_array_equal(chunks[1][1], [5 + 6j, 7 + 8j])
+
+    def test_format_from_extension(self):
+        """Test .cs8/.cu8 select the sample format"""
+        self.assertEqual(detect_iq_format('capture.cs8'), 'int8')
+        self.assertEqual(detect_iq_format('capture.cu8'), 'uint8')
+        self.assertEqual(detect_iq_format('capture.iq', default='int8'), 'int8')
+        with self.assertRaises(ValueError):
+            IQFileReader(self.path, 'float32')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Latest-value mailbox tests
+"""
+import threading
+import unittest
+from hackrf_mailbox import LatestValueMailbox
+
+class TestLatestValueMailbox(unittest.TestCase):
+    """Test overwrite semantics and counters"""
+
+    def test_take_returns_newest_once(self):
+        """Test unread values are coalesced and a value is taken once"""
+        mailbox = LatestValueMailbox()
+        self.assertIsNone(mailbox.take())
+        for value in range(5):
+            mailbox.put(value)
+        self.assertEqual(mailbox.take(), 4)
+        self.assertIsNone(mailbox.take())
+        self.assertEqual(mailbox.peek(), 4)
+        self.assertEqual(mailbox.stats(), {'published': 5, 'taken': 1, 'coalesced': 4})
+
+        mailbox.clear()
+        self.assertIsNone(mailbox.peek())
+
+    def test_concurrent_producer(self):
+        """Test a consumer never sees values go backwards and ends on the last one"""
+        mailbox = LatestValueMailbox()
+        seen = []
+
+        def produce():
+            for value in range(20000):
+                mailbox.put(value)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        while producer.is_alive():
+            value = mailbox.take()
+            if value is not None:
+                seen.append(value)
+        producer.join()
+        final = mailbox.take()
+        if final is not None:
+            seen.append(final)
+        self.assertEqual(seen, sorted(set(seen)))
+        self.assertEqual(seen[-1], 19999)
+        stats = mailbox.stats()
+        self.assertEqual(stats['taken'] + stats['coalesced'], stats['published'])
+
+if __name__ == '__main__':
+    unittest.main()
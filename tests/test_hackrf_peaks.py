@@ -0,0 +1,49 @@
+"""
+Vectorized peak detection tests
+"""
+import unittest
+import numpy as np
+from hackrf_peaks import noise_floor, find_spectral_peaks
+
+class TestSpectralPeaks(unittest.TestCase):
+    """Test the running-median floor and the adaptive-threshold detector"""
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        # Noise floor rising 20 dB across the band, with three carriers
+        self.floor = np.linspace(-100, -80, 8192)
+        self.power = self.floor + rng.standard_normal(8192)
+        self.carriers = [500, 4000, 7900]
+        for index in self.carriers:
+            self.power[index - 3:index + 4] += 30 * np.exp(-0.5 * (np.arange(-3, 4) / 1.5) ** 2)
+
+    def test_noise_floor_tracks_slope(self):
+        """Test the floor follows the sloping noise, not the carriers"""
+        floor = noise_floor(self.power, window=256)
+        self.assertEqual(floor.shape, self.power.shape)
+        self.assertLess(np.max(np.abs(floor - self.floor)[128:-128]), 1.0)
+        np.testing.assert_allclose(noise_floor(np.full(100, -70.0), window=256), -70.0)
+
+    def test_finds_carriers_above_sloping_floor(self):
+        """Test carriers are found and noise is not, where a fixed threshold would fail"""
+        peaks = find_spectral_peaks(self.power, snr_db=10, min_width=3)
+        np.testing.assert_array_equal(peaks['indices'], self.carriers)
+        np.testing.assert_allclose(peaks['power'], self.power[self.carriers])
+        self.assertTrue(np.all(peaks['prominences'] > 20))
+        self.assertTrue(np.all(peaks['widths'] >= 3))
+        self.assertEqual(len(peaks['noise_floor']), 3)
+
+        # An absolute threshold still applies on top of the adaptive one
+        high = find_spectral_peaks(self.power, threshold=self.power[500] + 1)
+        self.assertNotIn(500, high['indices'])
+
+    def test_distance_keeps_strongest(self):
+        """Test the stronger of two close peaks wins, whatever the order"""
+        power = np.full(200, -90.0)
+        power[100], power[104] = -40.0, -30.0
+        peaks = find_spectral_peaks(power, distance=10, prominence=None)
+        np.testing.assert_array_equal(peaks['indices'], [104])
+        self.assertEqual(len(find_spectral_peaks(power[:2])['indices']), 0)
+
+if __name__ == '__main__':
+    unittest.main()
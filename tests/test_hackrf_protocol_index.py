@@ -0,0 +1,72 @@
+"""
+Protocol index tests
+"""
+import unittest
+import numpy as np
+from hackrf_protocol_index import ProtocolIndex
+
+PROTOCOLS = {
+    'ook_remote': {'frequency_ranges': [(433.05e6, 434.79e6), (314e6, 316e6)],
+                   'modulation': 'OOK', 'bit_rate': [1000, 2000]},
+    'fsk_sensor': {'frequency_ranges': [(433.92e6, 433.92e6), (868e6, 868.6e6)],
+                   'modulation': 'FSK/GFSK', 'bit_rate': [1250, 2400]},
+    'ask_meter': {'frequency_ranges': [(433e6, 435e6)],
+                  'modulation': 'ASK/OOK', 'bit_rate': []},
+    'lora': {'frequency_ranges': [(863e6, 870e6)],
+             'modulation': 'CSS', 'bit_rate': [300, 5470]}
+}
+
+def linear_classify(protocols, frequency, modulation, bit_rate):
+    """Reference: score every protocol in turn"""
+    candidates = []
+    for name, info in protocols.items():
+        if not any(low <= frequency <= high for low, high in info['frequency_ranges']):
+            continue
+        modulation_score = 1.0 if modulation.upper() in info['modulation'].upper() else 0.5
+        bit_rate_score = 0.0
+        for expected in info.get('bit_rate') or []:
+            if abs(bit_rate - expected) / expected < 0.1:
+                bit_rate_score = 1.0
+                break
+            elif abs(bit_rate - expected) / expected < 0.2:
+                bit_rate_score = 0.7
+                break
+        candidates.append({'protocol': name,
+                           'confidence': (1.0 + modulation_score + bit_rate_score) / 3.0,
+                           'details': info})
+    candidates.sort(key=lambda x: x['confidence'], reverse=True)
+    return candidates[:3]
+
+class TestProtocolIndex(unittest.TestCase):
+    """Test the interval index against a linear scan of the database"""
+
+    def setUp(self):
+        self.index = ProtocolIndex(PROTOCOLS)
+        rng = np.random.default_rng(11)
+        edges = [edge for info in PROTOCOLS.values() for span in info['frequency_ranges'] for edge in span]
+        self.frequencies = np.concatenate((edges, rng.uniform(300e6, 900e6, 200),
+                                           rng.uniform(433e6, 435e6, 200)))
+        self.modulations = rng.choice(['OOK', 'FSK', 'ASK', 'CSS', 'gfsk'], len(self.frequencies)).tolist()
+        self.bit_rates = rng.choice([0, 950, 1150, 1300, 2200, 2400, 5000], len(self.frequencies))
+
+    def test_classify_matches_linear_scan(self):
+        """Test single-signal lookup, including inclusive range edges"""
+        for frequency, modulation, bit_rate in zip(self.frequencies, self.modulations, self.bit_rates):
+            self.assertEqual(self.index.classify(frequency, modulation, bit_rate),
+                             linear_classify(PROTOCOLS, frequency, modulation, bit_rate))
+
+    def test_classify_many_matches_classify(self):
+        """Test the batched call returns the same candidates per signal"""
+        batched = self.index.classify_many(self.frequencies, self.modulations, self.bit_rates)
+        self.assertEqual(len(batched), len(self.frequencies))
+        for candidates, frequency, modulation, bit_rate in zip(batched, self.frequencies,
+                                                               self.modulations, self.bit_rates):
+            self.assertEqual(candidates, self.index.classify(frequency, modulation, bit_rate))
+
+    def test_outside_every_range(self):
+        """Test frequencies no protocol covers give no candidates"""
+        self.assertEqual(self.index.classify(100e6, 'OOK', 1000), [])
+        self.assertEqual(self.index.classify_many([100e6, 2.4e9], ['OOK', 'FSK'], [1000, 0]), [[], []])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Blitted spectrum renderer tests
+"""
+import unittest
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from hackrf_renderer import SpectrumRenderer
+
+class TestSpectrumRenderer(unittest.TestCase):
+    """Test persistent artists, waterfall rows, frame limiting and redraw triggers"""
+
+    def setUp(self):
+        figure = Figure(figsize=(6, 4), dpi=50)  # 300 px wide
+        self.canvas = FigureCanvasAgg(figure)
+        self.spectrum_ax = figure.add_subplot(211)
+        self.waterfall_ax = figure.add_subplot(212)
+        self.freqs = np.linspace(100.0, 102.0, 1000)
+        self.rng = np.random.default_rng(4)
+
+    def renderer(self, **kwargs):
+        kwargs.setdefault('max_fps', 0)
+        return SpectrumRenderer(self.canvas, self.spectrum_ax, self.waterfall_ax, waterfall_rows=8,
+                                max_columns=256, **kwargs)
+
+    def spectrum(self):
+        return (-90 + self.rng.standard_normal(len(self.freqs))).astype(np.float32)
+
+    def test_artists_are_reused(self):
+        """Test updates change data in place and redraw fully only on layout changes"""
+        renderer = self.renderer(power_range=(-120, 0))
+        renderer.update(self.freqs, self.spectrum())
+        line, image = renderer.line, renderer.image
+        for _ in range(5):
+            renderer.update(self.freqs, self.spectrum())
+        self.assertIs(renderer.line, line)
+        self.assertIs(renderer.image, image)
+        self.assertEqual(list(self.spectrum_ax.lines), [line])
+        self.assertEqual(list(self.waterfall_ax.images), [image])
+        self.assertEqual((renderer.full_redraws, renderer.frames_drawn), (1, 6))
+
+        renderer.update(self.freqs + 5, self.spectrum())  # retuned
+        self.assertEqual(renderer.full_redraws, 2)
+
+    def test_waterfall_and_envelope(self):
+        """Test rows are max-decimated and the line keeps each pixel's extremes"""
+        renderer = self.renderer(power_range=(-120, 0))
+        spectra = [self.spectrum() for _ in range(10)]
+        for power in spectra:
+            renderer.update(self.freqs, power)
+        waterfall = renderer.image.get_array()
+        self.assertEqual(waterfall.shape, (8, 250))
+        np.testing.assert_array_equal(waterfall[-1], spectra[-1].reshape(250, 4).max(axis=1))
+        np.testing.assert_array_equal(waterfall[0], spectra[2].reshape(250, 4).max(axis=1))
+
+        ydata = renderer.line.get_ydata()
+        self.assertLess(len(ydata), len(self.freqs))
+        self.assertEqual(ydata.max(), spectra[-1].max())
+        self.assertEqual(ydata.min(), spectra[-1].min())
+
+    def test_frame_limit_skips_but_keeps_rows(self):
+        """Test frames faster than max_fps are not drawn but still reach the waterfall"""
+        renderer = self.renderer(power_range=(-120, 0), max_fps=1)
+        spectra = [self.spectrum() for _ in range(4)]
+        for power in spectra:
+            renderer.update(self.freqs, power)
+        self.assertEqual((renderer.frames_drawn, renderer.frames_skipped), (1, 2))
+        renderer.render()  # what the deferred callback does
+        self.assertEqual(renderer.frames_drawn, 2)
+        np.testing.assert_array_equal(renderer.line.get_ydata().max(), spectra[-1].max())
+        np.testing.assert_array_equal(renderer.image.get_array()[-4:],
+                                      [power.reshape(250, 4).max(axis=1) for power in spectra])
+
+    def test_autoscale_only_grows(self):
+        """Test the automatic power range expands in 10 dB steps and never shrinks"""
+        renderer = self.renderer()
+        renderer.update(self.freqs, self.spectrum())
+        self.assertEqual(self.spectrum_ax.get_ylim(), (-100.0, -80.0))
+        redraws = renderer.full_redraws
+        renderer.update(self.freqs, np.full(len(self.freqs), -85.0))
+        self.assertEqual(renderer.full_redraws, redraws)
+        renderer.update(self.freqs, np.full(len(self.freqs), -35.0))
+        self.assertEqual(self.spectrum_ax.get_ylim(), (-100.0, -30.0))
+        self.assertEqual(renderer.image.get_clim(), (-100.0, -30.0))
+
+    def test_caller_supplied_rows(self):
+        """Test rows= feeds every missed row to the waterfall"""
+        renderer = self.renderer(power_range=(-120, 0))
+        rows = [np.full(len(self.freqs), -float(i)) for i in range(3)]
+        renderer.update(self.freqs, rows[-1], rows=rows)
+        np.testing.assert_array_equal(renderer.image.get_array()[-3:, 0], [0, -1, -2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Defensive scanner threat scoring tests
+"""
+import unittest
+import numpy as np
+from hackrf_security_scanner import DefensiveRadarScanner
+
+def scalar_threat(frequency, power):
+    """The per-frequency scoring rules, spelled out"""
+    score = 0.5 if power > -30 else 0.3 if power > -50 else 0.0
+    if 2400e6 <= frequency <= 2485e6 or 5150e6 <= frequency <= 5850e6:
+        score *= 0.1
+    if power > -20 or 450e6 <= frequency <= 470e6:
+        score += 0.4
+    return min(score, 1.0)
+
+class TestThreatScoring(unittest.TestCase):
+    """Test vectorized threat levels and grouping of flagged bins into detections"""
+
+    def setUp(self):
+        self.scanner = DefensiveRadarScanner()
+
+    def test_threat_levels_follow_scalar_rules(self):
+        """Test every power band and frequency class scores as the scalar rules say"""
+        frequencies = [100e6, 450e6, 462.5e6, 470e6, 2400e6, 2437e6, 2485e6, 5500e6, 5900e6]
+        powers = [-90.0, -50.0, -49.9, -30.0, -29.9, -20.0, -19.9, 0.0]
+        grid_f, grid_p = (grid.ravel() for grid in np.meshgrid(frequencies, powers))
+        expected = [scalar_threat(f, p) for f, p in zip(grid_f, grid_p)]
+        np.testing.assert_allclose(self.scanner.threat_levels(grid_f, grid_p), expected)
+        for f, p, want in zip(grid_f, grid_p, expected):
+            self.assertAlmostEqual(self.scanner.analyze_threat_level(f, p), want)
+        self.assertTrue(self.scanner.is_whitelisted_frequency(2437e6))
+        self.assertFalse(self.scanner.is_whitelisted_frequency(915e6))
+        self.assertTrue(self.scanner.matches_threat_signature(465e6, -90.0))
+        self.assertFalse(self.scanner.matches_threat_signature(915e6, -25.0))
+
+    def test_one_detection_per_contiguous_run(self):
+        """Test adjacent flagged bins form one detection at their strongest bin"""
+        bin_width = 25e3
+        frequencies = 100e6 + np.arange(200) * bin_width
+        power = np.full(200, -90.0)
+        power[20:25] = [-18.0, -15.0, -12.0, -16.0, -19.0]
+        power[25] = -25.0      # below the threshold: does not extend the run
+        power[60:62] = -10.0
+        power[63] = -5.0       # one-bin gap: a separate detection
+        panorama = {'frequencies': frequencies, 'power': power, 'bin_width': bin_width}
+
+        detections = self.scanner.find_detections(panorama, 'test')
+        self.assertEqual([d['frequency'] for d in detections],
+                         [frequencies[22], frequencies[60], frequencies[63]])
+        self.assertEqual([d['power'] for d in detections], [-12.0, -10.0, -5.0])
+        self.assertEqual([d['bandwidth'] for d in detections], [5 * bin_width, 2 * bin_width, bin_width])
+        for detection in detections:
+            self.assertAlmostEqual(detection['threat_level'], 0.9)
+            self.assertEqual(detection['scan_type'], 'test')
+
+        power[:] = -90.0
+        self.assertEqual(self.scanner.find_detections(panorama, 'test'), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Spectral engine tests
+"""
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+import numpy as np
+import hackrf_spectral
+from hackrf_spectral import FFTPlan, WelchSpectrumEngine, get_frequency_axis, get_spectral_context, get_window
+
+class TestWelchSpectrumEngine(unittest.TestCase):
+    """Test overlapped Welch spectrum estimation"""
+
+    def test_uses_every_sample(self):
+        """Test frames advance by the overlap step and the tail carries over"""
+        engine = WelchSpectrumEngine(fft_size=1024, overlap=0.5)
+        block = np.zeros(8192, dtype=np.complex64)
+        engine.update(block)
+        self.assertEqual(engine.frames_processed, 15)
+        engine.update(block)
+        self.assertEqual(engine.frames_processed, 31)
+
+    def test_tone_bin_and_level(self):
+        """Test a tone lands in its bin at the expected power"""
+        engine = WelchSpectrumEngine(fft_size=1024, overlap=0.5)
+        n = np.arange(8192)
+        tone = (0.5 * np.exp(2j * np.pi * 64 / 1024 * n)).astype(np.complex64)
+        spectrum = engine.update(tone)
+        self.assertEqual(int(np.argmax(spectrum)), 64)
+        self.assertAlmostEqual(spectrum[64], 20 * np.log10(0.5), delta=0.5)
+
+    def test_running_average_window(self):
+        """Test only the last `averaging` blocks contribute"""
+        engine = WelchSpectrumEngine(fft_size=256, overlap=0.0, averaging=2)
+        loud = np.ones(256, dtype=np.complex64)
+        quiet = np.full(256, 0.01, dtype=np.complex64)
+        engine.update(loud)
+        engine.update(quiet)
+        engine.update(quiet)
+        self.assertAlmostEqual(engine.update(quiet)[0], 20 * np.log10(0.01), delta=0.1)
+
+    def test_shifted_output_matches_fftshift(self):
+        """Test the pre-modulated window gives a DC-centred spectrum"""
+        rng = np.random.default_rng(0)
+        block = (rng.normal(size=4096) + 1j * rng.normal(size=4096)).astype(np.complex64)
+        plain = WelchSpectrumEngine(fft_size=512).update(block)
+        shifted = WelchSpectrumEngine(fft_size=512, shifted=True).update(block)
+        np.testing.assert_allclose(shifted, np.fft.fftshift(plain), atol=1e-3)
+
+class TestSpectralCache(unittest.TestCase):
+    """Test cached windows, frequency axes and spectral contexts"""
+
+    def test_context_is_shared_and_read_only(self):
+        """Test repeated lookups reuse the same read-only arrays"""
+        first = get_spectral_context(1024, 'hann', 20e6, 100e6)
+        self.assertIs(first, get_spectral_context(1024, 'hann', 20e6, 100e6))
+        self.assertIs(first.window, get_window('hann', 1024))
+        self.assertFalse(first.frequencies.flags.writeable)
+        expected = np.fft.fftshift(np.fft.fftfreq(1024, 1 / 20e6)) + 100e6
+        np.testing.assert_allclose(first.frequencies, expected)
+
+    def test_frequency_axis_matches_linspace(self):
+        """Test the cached axis is the same linspace the GUIs used to build"""
+        axis = get_frequency_axis(433.92e6, 2e6, 1024)
+        np.testing.assert_array_equal(axis, np.linspace(432.92e6, 434.92e6, 1024))
+        self.assertIs(axis, get_frequency_axis(433.92e6, 2e6, 1024))
+
+class FakeFFTWBuilder:
+    """Behaves like a pyFFTW builder: returns its one internal output array"""
+
+    def __init__(self, shape, n):
+        self.n = n
+        self.output = np.zeros(shape[:-1] + (n,), dtype=np.complex128)
+
+    def __call__(self, x):
+        self.output[...] = np.fft.fft(x, n=self.n, axis=-1)
+        return self.output
+
+class TestFFTPlan(unittest.TestCase):
+    """Test the pyFFTW path keeps results private to each call and thread"""
+
+    def fake_pyfftw(self):
+        builders = SimpleNamespace(fft=lambda a, n, axis, threads: FakeFFTWBuilder(a.shape, n))
+        return SimpleNamespace(builders=builders, empty_aligned=lambda shape, dtype: np.empty(shape, dtype))
+
+    def test_results_are_not_overwritten(self):
+        """Test an earlier result survives the next call, and threads do not share outputs"""
+        rng = np.random.default_rng(3)
+        inputs = [rng.standard_normal((4, 64)).astype(np.complex64) for _ in range(8)]
+        with mock.patch.object(hackrf_spectral, 'pyfftw', self.fake_pyfftw()):
+            plan = FFTPlan(64)
+            first = plan(inputs[0])
+            plan(inputs[1])
+            np.testing.assert_allclose(first, np.fft.fft(inputs[0], axis=-1), rtol=1e-5, atol=1e-5)
+
+            results = {}
+            start = threading.Barrier(len(inputs))
+
+            def transform(index):
+                start.wait()
+                for _ in range(20):
+                    results[index] = plan(inputs[index])
+
+            threads = [threading.Thread(target=transform, args=(i,)) for i in range(len(inputs))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        for index, x in enumerate(inputs):
+            np.testing.assert_allclose(results[index], np.fft.fft(x, axis=-1), rtol=1e-5, atol=1e-5)
+
+    @unittest.skipIf(hackrf_spectral.pyfftw is None, 'pyfftw not installed')
+    def test_pyfftw_matches_numpy(self):
+        """Test the real pyFFTW builders against numpy.fft"""
+        x = np.random.default_rng(4).standard_normal((3, 128)).astype(np.complex64)
+        plan = FFTPlan(128)
+        first = plan(x)
+        plan(x[::-1].copy())
+        np.testing.assert_allclose(first, np.fft.fft(x, axis=-1), rtol=1e-4, atol=1e-4)
+
+if __name__ == '__main__':
+    unittest.main()
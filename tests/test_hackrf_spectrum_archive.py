@@ -0,0 +1,74 @@
+"""
+Spectrum archive tests
+"""
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+from hackrf_spectrum_archive import SpectrumArchive, CATALOG_NAME
+
+class TestSpectrumArchive(unittest.TestCase):
+    """Test chunking, partitioning and predicate queries"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.frequencies = np.linspace(433e6, 435e6, 201)  # 10 kHz bins
+        self.start = datetime(2024, 3, 5, 23, 0, tzinfo=timezone.utc).timestamp()
+        rng = np.random.default_rng(9)
+        self.power = (-95 + rng.standard_normal((300, 201))).astype(np.float32)
+        self.power[[40, 250], 92] = -40.0  # bursts at 433.92 MHz
+
+        self.archive = SpectrumArchive(self.root, chunk_frames=64, chunk_seconds=3600)
+        for i, row in enumerate(self.power):
+            # One frame every 30 s: the stream crosses midnight UTC at frame 120
+            self.archive.append(7, {'frequencies': self.frequencies, 'power': row,
+                                    'timestamp': self.start + 30 * i})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_partitions_by_session_and_day(self):
+        """Test chunks are sealed at chunk_frames and at the day boundary"""
+        self.archive.flush()
+        days = sorted(path.name for path in (self.root / 'session_7').iterdir())
+        self.assertEqual(days, ['2024-03-05', '2024-03-06'])
+        self.assertEqual(sum(entry['frames'] for entry in self.archive._entries), 300)
+        self.assertTrue(all(entry['frames'] <= 64 for entry in self.archive._entries))
+
+    def test_min_power_query_finds_bursts(self):
+        """Test a narrowband power query returns just the burst frames, including unsealed ones"""
+        matches = self.archive.query((433.91e6, 433.93e6), min_power=-50)
+        timestamps = np.concatenate([match['timestamps'] for match in matches])
+        np.testing.assert_array_equal(timestamps, self.start + 30 * np.array([40, 250]))
+        for match in matches:
+            np.testing.assert_allclose(match['frequencies'], [433.91e6, 433.92e6, 433.93e6])
+            self.assertEqual(match['power'].shape, (1, 3))
+
+    def test_time_range_and_session(self):
+        """Test time filtering across chunks and session filtering"""
+        self.archive.flush()
+        matches = self.archive.query(time_range=(self.start + 30 * 60, self.start + 30 * 69.5))
+        timestamps = np.concatenate([match['timestamps'] for match in matches])
+        np.testing.assert_array_equal(timestamps, self.start + 30 * np.arange(60, 70))
+        power = np.concatenate([match['power'] for match in matches])
+        np.testing.assert_allclose(power, self.power[60:70], atol=0.05)
+        self.assertEqual(self.archive.query(session_id=8), [])
+
+    def test_catalog_reload_and_rebuild(self):
+        """Test a reopened archive answers from the persisted catalog"""
+        self.archive.flush()
+        expected = self.archive.query((433.91e6, 433.93e6), min_power=-50)
+        reopened = SpectrumArchive(self.root)
+        self.assertEqual(len(reopened), len(self.archive))
+
+        (self.root / CATALOG_NAME).unlink()
+        reopened.rebuild_catalog()
+        got = reopened.query((433.91e6, 433.93e6), min_power=-50)
+        self.assertEqual([match['session_id'] for match in got], [7, 7])
+        for a, b in zip(got, expected):
+            np.testing.assert_array_equal(a['timestamps'], b['timestamps'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Streaming spectrum statistics tests
+"""
+import unittest
+import numpy as np
+from hackrf_spectrum_stats import SpectrumStatistics
+
+class TestSpectrumStatistics(unittest.TestCase):
+    """Test EWMA moments, percentile floor, occupancy and frame summaries"""
+
+    def setUp(self):
+        self.rng = np.random.default_rng(11)
+        self.frames = -90 + 2 * self.rng.standard_normal((2000, 64))
+        # Bin 10 carries a -40 dB signal every other frame
+        self.frames[::2, 10] = -40.0
+
+    def test_ewma_matches_reference(self):
+        """Test mean and variance equal the textbook recurrences"""
+        stats = SpectrumStatistics(64, alpha=0.2)
+        mean, variance = self.frames[0].copy(), np.zeros(64)
+        stats.update(self.frames[0])
+        for frame in self.frames[1:50]:
+            delta = frame - mean
+            mean = mean + 0.2 * delta
+            variance = 0.8 * (variance + 0.2 * delta ** 2)
+            stats.update(frame)
+        np.testing.assert_allclose(stats.mean, mean)
+        np.testing.assert_allclose(stats.variance, variance)
+
+    def test_floor_and_occupancy(self):
+        """Test the floor settles near the 10th percentile and the duty cycle near 50 %"""
+        stats = SpectrumStatistics(64, floor_step_db=0.2)
+        for frame in self.frames:
+            stats.update(frame)
+        quiet = np.delete(np.arange(64), 10)
+        expected = np.percentile(self.frames[:, quiet], 10)
+        self.assertLess(np.max(np.abs(stats.noise_floor[quiet] - expected)), 1.0)
+        self.assertAlmostEqual(stats.occupancy[10], 0.5, delta=0.05)
+        self.assertLess(np.max(stats.occupancy[quiet]), 0.02)
+
+    def test_frame_summary_and_history(self):
+        """Test per-frame scalars, peak history and bins_above"""
+        stats = SpectrumStatistics(peak_history=20)
+        for frame in self.frames[:30]:
+            stats.update(frame)
+        last = self.frames[29]
+        self.assertAlmostEqual(stats.frame['max'], last.max())
+        self.assertAlmostEqual(stats.frame['std'], last.std())
+        self.assertEqual(stats.frame['argmax'], int(np.argmax(last)))
+        self.assertEqual(stats.bins_above(-85), int(np.sum(last > -85)))
+        np.testing.assert_allclose(stats.linear_power(), 10 ** (last / 10))
+        peaks = self.frames[:30].max(axis=1)
+        self.assertAlmostEqual(stats.recent_peak_mean(10), peaks[-10:].mean())
+        self.assertAlmostEqual(stats.recent_peak_mean(10, skip=10), peaks[-20:-10].mean())
+        self.assertIsNone(stats.recent_peak_mean(10, skip=20))  # older than the history
+
+    def test_shared_updates_once_in_place(self):
+        """Test a frame seen twice counts once and state arrays are reused"""
+        stats = SpectrumStatistics()
+        frame = self.frames[0]
+        self.assertTrue(stats.update(frame))
+        buffers = (stats._mean, stats._floor, stats._occupancy)
+        self.assertEqual(stats.observe({'power': frame})['max'], frame.max())
+        self.assertFalse(stats.update(frame))
+        self.assertEqual(stats.frames, 1)
+        for frame in self.frames[1:5]:
+            stats.update(frame)
+        self.assertTrue(all(a is b for a, b in zip(buffers, (stats._mean, stats._floor, stats._occupancy))))
+        with self.assertRaises(ValueError):
+            stats.mean[0] = 0.0
+
+        stats.update(np.zeros(32))  # new FFT size restarts
+        self.assertEqual((stats.num_bins, stats.frames), (32, 1))
+
+    def test_late_observer_gets_its_own_frame(self):
+        """Test a detector behind the engine reads its frame's summary without refolding it"""
+        stats = SpectrumStatistics()
+        first, second = self.frames[0], self.frames[1]
+        stats.update(first)
+        stats.update(second)
+        frame = stats.observe({'power': first})
+        self.assertEqual(stats.frames, 2)
+        self.assertAlmostEqual(frame['max'], first.max())
+        self.assertEqual(frame.bins_above(-85), int(np.sum(first > -85)))
+        np.testing.assert_allclose(frame.linear_power(), 10 ** (first / 10))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Spectrum writer tests
+"""
+import gc
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+import unittest.mock
+import weakref
+from pathlib import Path
+import numpy as np
+from hackrf_spectral import get_spectral_context
+import hackrf_spectrum_writer
+from hackrf_spectrum_writer import SpectrumWriter, ensure_spectrum_schema, decode_frame
+
+LEGACY_SCHEMA = '''
+    CREATE TABLE spectrum_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id INTEGER,
+        timestamp TEXT,
+        center_freq REAL,
+        sample_rate REAL,
+        max_power REAL,
+        data_blob BLOB
+    )
+'''
+
+SELECT_FRAMES = '''
+    SELECT d.timestamp, d.center_freq, d.sample_rate, d.max_power, d.data_blob,
+           d.encoding, d.peaks, a.num_points, a.start_freq, a.stop_freq
+    FROM spectrum_data d LEFT JOIN spectrum_axes a ON a.id = d.axis_id
+    ORDER BY d.id
+'''
+
+class TestSpectrumWriter(unittest.TestCase):
+    """Test batched binary writes against an existing (JSON era) table"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self.tmp.name) / 'spectrum.db')
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(LEGACY_SCHEMA)
+            conn.execute('INSERT INTO spectrum_data (session_id, timestamp, center_freq, sample_rate, max_power, '
+                         'data_blob) VALUES (1, ?, 433e6, 2e6, -40.0, ?)',
+                         ('2024-01-01T00:00:00', json.dumps({'frequencies': [1.0, 2.0],
+                                                             'power': [-50.0, -40.0], 'peaks': []}).encode()))
+            ensure_spectrum_schema(conn)
+
+        context = get_spectral_context(1024, 'hann', 2e6, 433e6)
+        rng = np.random.default_rng(3)
+        self.frames = [{'frequencies': context.frequencies, 'power': -90 + rng.normal(0, 5, 1024),
+                        'peaks': [(100, -42.5)], 'timestamp': 1.7e9 + i, 'center_freq': 433e6,
+                        'sample_rate': 2e6} for i in range(10)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_with_shared_axis(self):
+        """Test frames are batched, the axis is stored once and legacy rows still decode"""
+        writer = SpectrumWriter(self.db_path, encoding='float32', batch_size=4)
+        for frame in self.frames:
+            self.assertTrue(writer.save(1, frame))
+        self.assertTrue(writer.flush(5))
+        writer.close()
+
+        self.assertEqual(writer.frames_written, len(self.frames))
+        self.assertLess(writer.batches_written, len(self.frames))
+        with sqlite3.connect(self.db_path) as conn:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM spectrum_axes').fetchone()[0], 1)
+            rows = conn.execute(SELECT_FRAMES).fetchall()
+
+        legacy = decode_frame(rows[0])
+        np.testing.assert_array_equal(legacy['power'], [-50.0, -40.0])
+        for row, frame in zip(rows[1:], self.frames):
+            decoded = decode_frame(row)
+            np.testing.assert_allclose(decoded['power'], frame['power'], atol=1e-4)
+            np.testing.assert_allclose(decoded['frequencies'], frame['frequencies'])
+            self.assertEqual(decoded['peaks'], [[100, -42.5]])
+
+    def test_float16_precision(self):
+        """Test half precision keeps dB values within a tenth of a dB"""
+        writer = SpectrumWriter(self.db_path)
+        writer.save(2, self.frames[0])
+        writer.close()
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(SELECT_FRAMES).fetchall()[-1]
+        self.assertEqual(len(row[4]), 2 * 1024)
+        np.testing.assert_allclose(decode_frame(row)['power'], self.frames[0]['power'], atol=0.1)
+
+    def test_exit_registration_is_weak(self):
+        """Test closed writers leave the exit hook and can be garbage collected"""
+        writer = SpectrumWriter(self.db_path)
+        self.assertNotIn(writer, hackrf_spectrum_writer._open_writers)
+        writer.save(1, self.frames[0])
+        self.assertIn(writer, hackrf_spectrum_writer._open_writers)
+        writer.close()
+        self.assertNotIn(writer, hackrf_spectrum_writer._open_writers)
+        reference = weakref.ref(writer)
+        del writer
+        gc.collect()
+        self.assertIsNone(reference())
+
+    def test_exit_hook_does_not_hang_on_stuck_writer(self):
+        """Test the exit path gives up on a writer whose thread is stuck"""
+        release = threading.Event()
+        writer = SpectrumWriter(self.db_path, max_queue=1)
+        writer._write = lambda conn, frames: release.wait(10)
+        writer.save(1, self.frames[0])
+        # Wait for the writer thread to pick the frame up, then fill the queue
+        while writer._queue.qsize():
+            time.sleep(0.001)
+        writer.save(1, self.frames[1])
+        started = time.perf_counter()
+        with unittest.mock.patch.object(hackrf_spectrum_writer, 'EXIT_TIMEOUT', 0.1):
+            hackrf_spectrum_writer._close_open_writers()
+        self.assertLess(time.perf_counter() - started, 2.0)
+        release.set()
+        writer.close(timeout=5)
+
+    def test_unknown_encoding(self):
+        with self.assertRaises(ValueError):
+            SpectrumWriter(self.db_path, encoding='int8')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Staged processing pipeline tests
+"""
+import threading
+import time
+import unittest
+from hackrf_stage_pipeline import StagePipeline, BLOCK, DROP_NEWEST, DROP_OLDEST
+
+class TestStagePipeline(unittest.TestCase):
+    """Test ordering, drop policies, metrics and stage overlap"""
+
+    def test_items_flow_in_order(self):
+        """Test every item passes each stage once, in order, and None ends an item"""
+        seen = []
+        pipeline = StagePipeline()
+        pipeline.add_stage('double', lambda x: x * 2)
+        pipeline.add_stage('odd_only', lambda x: x + 1 if x % 4 else None)
+        pipeline.add_stage('sink', seen.append)
+        pipeline.start()
+        for i in range(50):
+            self.assertTrue(pipeline.submit(i))
+        self.assertTrue(pipeline.stop())
+
+        self.assertEqual(seen, [2 * i + 1 for i in range(50) if (2 * i) % 4])
+        stats = pipeline.stats()
+        self.assertEqual(stats['stages']['double']['processed'], 50)
+        self.assertEqual(stats['stages']['sink']['received'], 25)
+        self.assertEqual(stats['completed'], 50)
+        self.assertIsNotNone(stats['stages']['double']['latency_ms'])
+        with self.assertRaises(ValueError):
+            pipeline.submit(1)
+
+    def test_drop_policies(self):
+        """Test a full queue discards the oldest or the newest item, or blocks"""
+        for policy, expected in ((DROP_OLDEST, [0, 3, 4]), (DROP_NEWEST, [0, 1, 2])):
+            gate = threading.Event()
+            seen = []
+            pipeline = StagePipeline()
+            pipeline.add_stage('slow', lambda x: gate.wait() and x, maxsize=2, policy=policy)
+            pipeline.add_stage('sink', seen.append)
+            pipeline.start()
+            pipeline.submit(0)
+            # Wait for the worker to hold item 0 so the queue is empty
+            while pipeline.stages[0].stats()['queued']:
+                time.sleep(0.001)
+            results = [pipeline.submit(i) for i in range(1, 5)]
+            gate.set()
+            pipeline.stop()
+            self.assertEqual(seen, expected, policy)
+            self.assertEqual(results, [True, True, False, False])
+            self.assertEqual(pipeline.stats()['stages']['slow']['dropped'], 2)
+
+        gate = threading.Event()
+        pipeline = StagePipeline()
+        pipeline.add_stage('slow', lambda x: gate.wait() and x, maxsize=1, policy=BLOCK)
+        pipeline.start()
+        pipeline.submit(0)
+        pipeline.submit(1)
+        # Full: a blocking submit waits, and gives up after its timeout
+        self.assertFalse(pipeline.submit(2, timeout=0.05))
+        gate.set()
+        self.assertTrue(pipeline.submit(3, timeout=1.0))
+        pipeline.stop()
+        self.assertEqual(pipeline.stats()['stages']['slow']['processed'], 3)
+
+    def test_errors_are_counted(self):
+        """Test a failing item is reported and dropped without stopping the stage"""
+        errors = []
+        seen = []
+        pipeline = StagePipeline(on_error=lambda stage, e: errors.append((stage, str(e))))
+        pipeline.add_stage('parse', lambda x: 10 // x)
+        pipeline.add_stage('sink', seen.append)
+        pipeline.start()
+        for x in (1, 0, 2):
+            pipeline.submit(x)
+        pipeline.stop()
+        self.assertEqual(seen, [10, 5])
+        self.assertEqual(errors, [('parse', 'integer division or modulo by zero')])
+        self.assertEqual(pipeline.stats()['stages']['parse']['errors'], 1)
+        with self.assertRaises(ValueError):
+            StagePipeline().add_stage('bad', len, policy='sometimes')
+
+    def test_throughput_set_by_slowest_stage(self):
+        """Test stages overlap: total time follows the slowest stage, not the sum"""
+        delay = 0.02
+        def sleeper(seconds):
+            def work(x):
+                time.sleep(seconds)
+                return x
+            return work
+
+        pipeline = StagePipeline()
+        pipeline.add_stage('fast', sleeper(delay / 2))
+        pipeline.add_stage('slow', sleeper(delay))
+        pipeline.add_stage('medium', sleeper(delay / 2))
+        pipeline.start()
+        started = time.perf_counter()
+        for i in range(20):
+            pipeline.submit(i)
+        pipeline.stop()
+        elapsed = time.perf_counter() - started
+
+        # Sequential: 20 * 2 * delay; pipelined: about 20 * delay
+        self.assertLess(elapsed, 20 * 2 * delay * 0.8)
+        self.assertEqual(pipeline.stats()['bottleneck'], 'slow')
+
+if __name__ == '__main__':
+    unittest.main()
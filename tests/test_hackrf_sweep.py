@@ -0,0 +1,64 @@
+"""
+Sweep engine tests
+"""
+import unittest
+import numpy as np
+from hackrf_sweep import SweepEngine, SimulatedSweepSource
+
+class TestSweepEngine(unittest.TestCase):
+    """Test retune planning, stitching and calibration against a simulated source"""
+
+    def setUp(self):
+        # Carriers on exact bins: 20 MHz / 1024 = 19.53125 kHz
+        self.bin_width = 20e6 / 1024
+        self.carriers = [(100e6 + 1000 * self.bin_width, -40.0), (100e6 + 4321 * self.bin_width, -55.0)]
+        self.source = SimulatedSweepSource(self.carriers, noise_db=-90.0, seed=3)
+        self.engine = SweepEngine(self.source, sample_rate=20e6, fft_size=1024, usable_fraction=0.75)
+
+    def test_plan_tiles_range(self):
+        """Test retunes step by the kept width and cover the whole range"""
+        centers = self.engine.plan(100e6, 200e6)
+        step = 768 * self.bin_width
+        np.testing.assert_allclose(np.diff(centers), step)
+        self.assertLessEqual(centers[0] - step / 2, 100e6)
+        self.assertGreaterEqual(centers[-1] + step / 2, 200e6)
+        with self.assertRaises(ValueError):
+            self.engine.plan(200e6, 100e6)
+
+    def test_panorama_resolution_and_levels(self):
+        """Test the stitched panorama has FFT resolution and reads the simulated levels"""
+        panorama = self.engine.sweep(100e6, 200e6)
+        frequencies, power = panorama['frequencies'], panorama['power']
+        self.assertTrue(panorama['complete'])
+        self.assertEqual(panorama['retunes'], len(self.engine.plan(100e6, 200e6)))
+        self.assertEqual(frequencies[0], 100e6)
+        self.assertAlmostEqual(frequencies[-1], 200e6, delta=self.bin_width)
+        np.testing.assert_allclose(np.diff(frequencies), self.bin_width)
+
+        # Noise floor, including the bins at retune seams and DC
+        self.assertAlmostEqual(np.median(power), -90.0, delta=1.0)
+        self.assertLess(power.max(), -35.0)
+        for frequency, level in self.carriers:
+            index = int(round((frequency - 100e6) / self.bin_width))
+            self.assertAlmostEqual(power[index], level, delta=0.5)
+            self.assertEqual(np.argmax(power[index - 5:index + 6]), 5)
+
+    def test_dc_notch_width(self):
+        """Test exactly dc_bins bins around DC are interpolated, including even counts"""
+        for dc_bins in range(5):
+            engine = SweepEngine(self.source, sample_rate=20e6, fft_size=1024, dc_bins=dc_bins)
+            notch = range(768)[engine._dc] if engine._dc else range(0)
+            self.assertEqual(len(notch), dc_bins)
+            if dc_bins:
+                self.assertIn(384, notch)
+
+    def test_stops_early(self):
+        """Test a pass interrupted by keep_running covers only the retunes done"""
+        calls = []
+        panorama = self.engine.sweep(100e6, 200e6, keep_running=lambda: len(calls.append(1) or calls) <= 2)
+        self.assertFalse(panorama['complete'])
+        self.assertEqual(panorama['retunes'], 2)
+        self.assertEqual(len(panorama['power']), 2 * 768)
+
+if __name__ == '__main__':
+    unittest.main()
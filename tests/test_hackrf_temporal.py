@@ -0,0 +1,71 @@
+"""
+Temporal pattern engine tests
+"""
+import unittest
+import numpy as np
+from hackrf_temporal import TemporalPatternEngine
+
+class TestTemporalPatternEngine(unittest.TestCase):
+    """Test sliding autocorrelation, periodicity and hop detection"""
+
+    def setUp(self):
+        self.rng = np.random.default_rng(3)
+        self.frequencies = np.linspace(2.40e9, 2.42e9, 1024)
+
+    def frame(self, index, carriers=()):
+        power = -90 + 5 * self.rng.standard_normal(1024)
+        for bin_index in carriers:
+            power[bin_index:bin_index + 4] += 35
+        return {'frequencies': self.frequencies, 'power': power, 'timestamp': 0.1 * index}
+
+    def test_sliding_sums_match_direct_computation(self):
+        """Test the incremental lag products equal a recount over the window"""
+        engine = TemporalPatternEngine(window=20, max_lag=5, bands=16, min_band_bins=1)
+        history = []
+        for i in range(57):
+            carriers = [bin_index for bin_index in (0, 256, 512) if self.rng.random() < 0.4]
+            engine.update(self.frame(i, carriers))
+            history.append(engine._on[i % engine.capacity].copy())
+        on = np.array(history, dtype=np.int64)
+        window = on[-20:]
+        for lag in range(6):
+            expected = (window * on[-20 - lag:len(on) - lag]).sum(axis=0)
+            np.testing.assert_array_equal(engine._sums[lag], expected, err_msg=f"lag {lag}")
+
+    def test_periodic_burst(self):
+        """Test a burst every 7 frames is reported with its period, not a multiple"""
+        engine = TemporalPatternEngine()
+        for i in range(150):
+            engine.update(self.frame(i, [300] if i % 7 == 0 else []))
+        result = engine.periodicity()
+        self.assertIsNotNone(result)
+        self.assertEqual(result['period_frames'], 7)
+        self.assertAlmostEqual(result['period_seconds'], 0.7)
+        self.assertAlmostEqual(result['frequency'], self.frequencies[300], delta=200e3)
+        self.assertIsNone(engine.hopping())
+
+    def test_hopping_versus_fixed_carrier(self):
+        """Test a carrier hopping over channels is a hopper and a fixed one is not"""
+        hopper = TemporalPatternEngine()
+        fixed = TemporalPatternEngine()
+        channels = np.arange(40, 1000, 64)
+        for i in range(100):
+            hopper.update(self.frame(i, [channels[(i * 7) % len(channels)]]))
+            fixed.update(self.frame(i, [500]))
+        result = hopper.hopping()
+        self.assertIsNotNone(result)
+        self.assertGreaterEqual(result['channels'], len(channels) - 1)
+        self.assertGreater(result['hops_per_frame'], 0.9)
+        self.assertIsNone(fixed.hopping())
+        self.assertIsNone(fixed.periodicity())  # always on: not a burst pattern
+
+    def test_same_frame_counted_once(self):
+        """Test repeated updates with the same frame are ignored"""
+        engine = TemporalPatternEngine()
+        frame = self.frame(0)
+        self.assertTrue(engine.update(frame))
+        self.assertFalse(engine.update(frame))
+        self.assertEqual(engine.frames, 1)
+
+if __name__ == '__main__':
+    unittest.main()
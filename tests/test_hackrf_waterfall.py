@@ -0,0 +1,76 @@
+"""
+Waterfall pyramid tests
+"""
+import unittest
+import numpy as np
+from hackrf_waterfall import WaterfallPyramid
+
+class TestWaterfallPyramid(unittest.TestCase):
+    """Test incremental max-hold / mean decimation and sliced views"""
+
+    def setUp(self):
+        self.rows = np.random.default_rng(2).normal(-90, 5, size=(64, 37)).astype(np.float32)
+        self.pyramid = WaterfallPyramid(37, capacity=8, levels=4)
+        for row in self.rows:
+            self.pyramid.append(row)
+
+    def reference(self, level, reducer):
+        """Decimate the full history directly: 2**level rows x 2**level bins"""
+        factor = 2 ** level
+        blocks = self.rows[:len(self.rows) // factor * factor].reshape(-1, factor, 37)
+        starts = np.arange(0, 37, factor)
+        if reducer == 'max':
+            return np.maximum.reduceat(blocks.max(axis=1), starts, axis=1)
+        # Mean of means, as the pyramid combines pairs level by level
+        out = self.rows
+        for _ in range(level):
+            out = out[:len(out) // 2 * 2].reshape(-1, 2, out.shape[1]).mean(axis=1)
+            sizes = np.diff(np.append(np.arange(0, out.shape[1], 2), out.shape[1]))
+            out = np.add.reduceat(out, np.arange(0, out.shape[1], 2), axis=1) / sizes
+        return out
+
+    def test_levels_match_direct_decimation(self):
+        """Test every level equals decimating the whole history at once"""
+        for level in range(4):
+            for mode in ('max', 'mean'):
+                expected = self.reference(level, mode)[-8:]
+                np.testing.assert_allclose(self.pyramid.view(level, mode), expected, rtol=1e-5,
+                                           err_msg=f"level {level} {mode}")
+
+    def test_views_are_slices(self):
+        """Test views share the buffer and are capped at capacity"""
+        view = self.pyramid.view(0, rows=5)
+        self.assertIsNotNone(view.base)
+        np.testing.assert_array_equal(view, self.rows[-5:])
+        self.assertEqual(len(self.pyramid.view(0, rows=100)), 8)
+
+    def test_level_selection(self):
+        """Test the finest level that fits the span is chosen"""
+        self.assertEqual(self.pyramid.level_for(8, max_rows=8), 0)
+        self.assertEqual(self.pyramid.level_for(32, max_rows=8), 2)
+        self.assertEqual(self.pyramid.level_for(8, max_bins=10), 2)
+        level, rows = self.pyramid.view_span(64, max_rows=8)
+        self.assertEqual((level, len(rows)), (3, 8))
+        frequencies = self.pyramid.frequencies(np.arange(37.0), 2)
+        np.testing.assert_allclose(frequencies[:2], [1.5, 5.5])
+        self.assertEqual(len(self.pyramid.frequencies(np.arange(37.0), level)), rows.shape[1])
+
+    def test_width_change_resets(self):
+        """Test a row of a different size restarts the history"""
+        self.pyramid.append(np.zeros(16))
+        self.assertEqual(len(self.pyramid), 1)
+        self.assertEqual(self.pyramid.view(1).shape, (0, 8))
+
+    def test_single_level_is_a_row_buffer(self):
+        """Test levels=1 keeps only the full-resolution rows"""
+        buffer = WaterfallPyramid(16, capacity=4, levels=1)
+        for value in range(6):
+            buffer.append(np.full(16, value))
+        self.assertEqual(buffer.rows_appended, 6)
+        np.testing.assert_array_equal(buffer.view()[:, 0], [2, 3, 4, 5])
+        self.assertEqual(buffer.view_span(100, max_rows=4)[0], 0)
+        with self.assertRaises(IndexError):
+            buffer.view(1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Metrics instrumentation tests
+"""
+import unittest
+from app import create_app
+from app.core.config import Config
+import time
+from gateway_metrics import MetricsRegistry, process_stats, psutil
+
+class TestMetrics(unittest.TestCase):
+    """Test counters, histograms and the /metrics endpoint"""
+
+    def test_histogram_summary(self):
+        """Test histogram count, mean and bucket quantiles"""
+        histogram = MetricsRegistry().histogram('test_latency_seconds', 'Test', ['model'])
+        for value in (0.01, 0.02, 0.03, 0.04):
+            histogram.observe(value, model='a')
+        histogram.observe(2.0, model='b')
+        summary = histogram.summary(model='a')
+        self.assertEqual(summary['count'], 4)
+        self.assertAlmostEqual(summary['mean'], 0.025)
+        self.assertLessEqual(summary['p99'], 0.05)
+        self.assertEqual(histogram.summary()['count'], 5)
+
+    def test_exposition_format(self):
+        """Test Prometheus text output"""
+        registry = MetricsRegistry()
+        registry.counter('test_retries_total', 'Retries', ['model']).inc(model='x')
+        registry.histogram('test_wait_seconds', 'Wait').observe(0.2)
+        text = registry.render()
+        self.assertIn('# TYPE test_retries_total counter', text)
+        self.assertIn('test_retries_total{model="x"} 1.0', text)
+        self.assertIn('test_wait_seconds_bucket{le="+Inf"} 1', text)
+        self.assertIn('test_wait_seconds_count 1', text)
+
+    @unittest.skipIf(psutil is None, 'psutil not installed')
+    def test_process_stats_cpu(self):
+        """Test CPU usage is measured across calls rather than reset to zero"""
+        process_stats()
+        deadline = time.process_time() + 0.2
+        while time.process_time() < deadline:
+            pass
+        stats = process_stats()
+        self.assertGreater(stats['cpu_percent'], 0.0)
+        self.assertGreater(stats['memory_rss_mb'], 0.0)
+
+    def test_metrics_endpoint(self):
+        """Test /metrics reports request timings"""
+        client = create_app(Config).test_client()
+        client.get('/health')
+        response = client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'http_request_duration_seconds_count{endpoint="/health"', response.data)
+
+if __name__ == '__main__':
+    unittest.main()
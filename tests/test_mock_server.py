@@ -0,0 +1,52 @@
+"""
+OpenRouter mock server tests
+"""
+import unittest
+from openrouter_mock_server import create_mock_app, MockServerConfig, MockModelProfile
+
+class TestMockServer(unittest.TestCase):
+    """Test the offline OpenRouter stand-in"""
+
+    def _client(self, **profile):
+        config = MockServerConfig(
+            models={'mock/model': MockModelProfile(**profile)},
+            seed=7,
+            time_scale=0
+        )
+        return create_mock_app(config).test_client()
+
+    def _complete(self, client, **extra):
+        payload = {'model': 'mock/model', 'messages': [{'role': 'user', 'content': 'hello'}], 'max_tokens': 4}
+        payload.update(extra)
+        return client.post('/api/v1/chat/completions', json=payload)
+
+    def test_completion_shape(self):
+        """Test responses match the OpenRouter schema"""
+        response = self._complete(self._client())
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertIn('content', data['choices'][0]['message'])
+        self.assertEqual(data['usage']['completion_tokens'], 4)
+
+    def test_rate_limit_rate(self):
+        """Test a 100% rate limit profile always returns 429"""
+        response = self._complete(self._client(rate_limit_rate=1.0))
+        self.assertEqual(response.status_code, 429)
+
+    def test_streaming(self):
+        """Test token streaming ends with [DONE]"""
+        response = self._complete(self._client(), stream=True)
+        body = response.get_data(as_text=True)
+        self.assertEqual(body.count('"content": "tok'), 4)
+        self.assertTrue(body.rstrip().endswith('data: [DONE]'))
+
+    def test_seeded_runs_are_reproducible(self):
+        """Test the same seed yields the same status sequence"""
+        runs = []
+        for _ in range(2):
+            client = self._client(error_rate=0.3, rate_limit_rate=0.2)
+            runs.append([self._complete(client).status_code for _ in range(20)])
+        self.assertEqual(runs[0], runs[1])
+
+if __name__ == '__main__':
+    unittest.main()
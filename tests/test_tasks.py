@@ -0,0 +1,158 @@
+"""
+Task API tests
+"""
+import threading
+import time
+import unittest
+from app import create_app
+from app.core.config import Config
+from app.api.agents import agent_system
+from app.core.agents import MultiAgentSystem, AgentRole, AgentStatus
+
+class TestTaskDelivery(unittest.TestCase):
+    """Test task lookup, long-polling and event fan-out"""
+
+    def setUp(self):
+        """Set up test client"""
+        self.app = create_app(Config)
+        self.client = self.app.test_client()
+
+    def _create(self, task_id, **extra):
+        payload = {'task_id': task_id, 'description': 'Test task', 'task_type': 'research'}
+        payload.update(extra)
+        return self.client.post('/api/tasks', json=payload)
+
+    def test_get_task(self):
+        """Test single task lookup"""
+        self._create('delivery_get')
+        response = self.client.get('/api/tasks/delivery_get')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['task']['id'], 'delivery_get')
+
+    def test_get_missing_task(self):
+        """Test unknown task returns 404"""
+        response = self.client.get('/api/tasks/does_not_exist')
+        self.assertEqual(response.status_code, 404)
+
+    def test_long_poll_returns_on_transition(self):
+        """Test long-poll wakes up when the task changes state"""
+        task = agent_system.create_task('delivery_wait', 'Test task', 'research')
+
+        def finish():
+            time.sleep(0.2)
+            task.status = 'completed'
+            agent_system._on_task_update(task)
+
+        threading.Thread(target=finish).start()
+        started = time.monotonic()
+        response = self.client.get('/api/tasks/delivery_wait?wait=5&status=pending')
+        self.assertLess(time.monotonic() - started, 4)
+        self.assertEqual(response.get_json()['task']['status'], 'completed')
+
+    def test_event_subscription(self):
+        """Test subscribers receive task transitions"""
+        subscriber = agent_system.subscribe_task_events()
+        try:
+            agent_system.create_task('delivery_event', 'Test task', 'research')
+            event = subscriber.get(timeout=1)
+            self.assertEqual(event['task']['id'], 'delivery_event')
+        finally:
+            agent_system.unsubscribe_task_events(subscriber)
+
+    def test_invalid_callback_url(self):
+        """Test non-http callback URLs are rejected"""
+        response = self._create('delivery_bad_cb', callback_url='ftp://example.com/hook')
+        self.assertEqual(response.status_code, 400)
+
+    def test_non_string_callback_url(self):
+        """Test a callback_url that is not a string is rejected, not a server error"""
+        for index, callback_url in enumerate((5, [], {'url': 'http://example.com'})):
+            response = self._create(f'delivery_typed_cb_{index}', callback_url=callback_url)
+            self.assertEqual(response.status_code, 400)
+            self.assertIsNone(agent_system.get_task(f'delivery_typed_cb_{index}'))
+
+class TestBulkTasks(unittest.TestCase):
+    """Test bulk task submission"""
+
+    def setUp(self):
+        """Set up test client"""
+        self.app = create_app(Config)
+        self.client = self.app.test_client()
+
+    def test_bulk_is_idempotent(self):
+        """Test resubmitting a batch returns the original task ids"""
+        tasks = [{'idempotency_key': f'bulk-idem-{i}', 'description': 'Bulk task',
+                  'task_type': 'research', 'priority': i % 10 + 1} for i in range(50)]
+        first = self.client.post('/api/tasks/bulk', json={'tasks': tasks}).get_json()
+        second = self.client.post('/api/tasks/bulk', json={'tasks': tasks}).get_json()
+        self.assertEqual(first['created'], 50)
+        self.assertEqual(second['created'], 0)
+        self.assertEqual(second['duplicates'], 50)
+        self.assertEqual(first['task_ids'], second['task_ids'])
+
+    def test_bulk_rejects_whole_batch(self):
+        """Test one invalid entry prevents any insert"""
+        tasks = [
+            {'task_id': 'bulk_atomic_ok', 'description': 'Bulk task', 'task_type': 'research'},
+            {'task_id': 'bulk_atomic_bad', 'description': 'Bulk task', 'task_type': 'research',
+             'priority': 99}
+        ]
+        response = self.client.post('/api/tasks/bulk', json={'tasks': tasks})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['errors'][0]['index'], 1)
+        self.assertIsNone(agent_system.get_task('bulk_atomic_ok'))
+
+    def test_bulk_non_string_callback_url(self):
+        """Test a non-string callback_url is a per-entry validation error"""
+        for callback_url in (5, []):
+            tasks = [
+                {'task_id': 'bulk_typed_cb_ok', 'description': 'Bulk task', 'task_type': 'research'},
+                {'task_id': 'bulk_typed_cb_bad', 'description': 'Bulk task', 'task_type': 'research',
+                 'callback_url': callback_url}
+            ]
+            response = self.client.post('/api/tasks/bulk', json={'tasks': tasks})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.get_json()['errors'][0]['index'], 1)
+            self.assertIsNone(agent_system.get_task('bulk_typed_cb_ok'))
+
+        system = MultiAgentSystem()
+        result = system.create_tasks_bulk([{'description': 'Bulk task', 'task_type': 'research',
+                                            'callback_url': 5}])
+        self.assertEqual(result['errors'], [{'index': 0, 'error': 'callback_url must be a string'}])
+
+    def test_dispatch_priority_order(self):
+        """Test idle agents receive queued tasks highest priority first, single and bulk alike"""
+        system = MultiAgentSystem()
+        # No agent yet: the single task waits in the queue
+        system.create_task('prio_single', 'Single task', 'research', priority=5)
+        system.create_tasks_bulk([
+            {'task_id': 'prio_low', 'description': 'Bulk task', 'task_type': 'research', 'priority': 1},
+            {'task_id': 'prio_high', 'description': 'Bulk task', 'task_type': 'research', 'priority': 10},
+            {'task_id': 'prio_later', 'description': 'Bulk task', 'task_type': 'research', 'priority': 5}
+        ])
+        self.assertEqual(system.pending_task_count(), 4)
+
+        agents = [system.create_agent(f'prio_agent_{i}', AgentRole.RESEARCHER) for i in range(3)]
+        self.assertEqual(system.dispatch_pending(), 3)
+        self.assertEqual([agent.current_task.id for agent in agents], ['prio_high', 'prio_single', 'prio_later'])
+        self.assertEqual(system.get_task('prio_low')['status'], 'pending')
+        self.assertEqual(system.pending_task_count(), 1)
+
+    def test_assigned_tasks_leave_the_queue(self):
+        """Test tasks assigned or finished outside dispatch do not pile up in the pending queue"""
+        system = MultiAgentSystem()
+        agent = system.create_agent('churn_agent', AgentRole.RESEARCHER)
+        for i in range(500):
+            task = system.create_task(f'churn_{i}', 'Single task', 'research')
+            self.assertTrue(system.assign_task(task.id))
+            task.status = 'completed'
+            agent.current_task = None
+            agent.status = AgentStatus.IDLE
+            system._on_task_update(task)
+        self.assertEqual(system.pending_task_count(), 0)
+        self.assertLess(len(system._pending_heap), 100)
+        self.assertEqual(system.dispatch_pending(), 0)
+        self.assertEqual(system._pending_heap, [])
+
+if __name__ == '__main__':
+    unittest.main()